@@ -73,9 +73,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "tracker.instrumentation.RequestMetricsMiddleware",  # Per-view query/latency metrics
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "tracker.middleware.SessionRefreshMiddleware",  # Slide the session timeout without saving every request
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -203,7 +205,10 @@ HANDLER500 = 'tracker.views.custom_500'
 # Session Configuration - 10 minute timeout for security
 SESSION_COOKIE_AGE = 600  # 10 minutes in seconds
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True  # Session expires when browser closes
-SESSION_SAVE_EVERY_REQUEST = True  # Save session on every request to track activity
+# Instead of saving the session on every request, SessionRefreshMiddleware re-saves an
+# active session (pushing its expiry forward) at most once per SESSION_REFRESH_INTERVAL seconds
+SESSION_SAVE_EVERY_REQUEST = False
+SESSION_REFRESH_INTERVAL = 60
 
 
 # your_project/settings.py
@@ -420,7 +425,43 @@ CORS_ALLOW_HEADERS = [
     'accept',
     'authorization',
     'content-type',
+    'idempotency-key',
     'origin',
     'x-csrftoken',
     'x-org-slug',
-]
\ No newline at end of file
+]
+
+
+# ============================================================================
+# PERFORMANCE AND BACKGROUND PROCESSING
+# ============================================================================
+
+# Background member imports (tracker/jobs.py)
+# When IMPORT_JOBS_RUN_IN_THREADS is False, run `python manage.py run_import_jobs` as a worker.
+IMPORT_JOBS_RUN_IN_THREADS = os.getenv('IMPORT_JOBS_RUN_IN_THREADS', 'True') == 'True'
+IMPORT_JOB_WORKERS = int(os.getenv('IMPORT_JOB_WORKERS', '2'))
+
+# Generated PDF reports are cached here, keyed by organization data version (tracker/reports.py).
+# Prune old files with `python manage.py prune_report_cache`.
+REPORT_CACHE_DIR = os.getenv('REPORT_CACHE_DIR', str(BASE_DIR / 'report_cache'))
+
+# Request metrics (tracker/instrumentation.py), shown at /bossin-admin/metrics/
+# QUERY_BUDGETS overrides per-view query budgets, e.g. {'tracker:dashboard': 10}.
+REQUEST_METRICS_ENABLED = os.getenv('REQUEST_METRICS_ENABLED', 'True') == 'True'
+REQUEST_METRICS_SLOW_MS = int(os.getenv('REQUEST_METRICS_SLOW_MS', '1000'))
+# Each worker publishes its totals to the shared cache this often; the metrics page merges them
+REQUEST_METRICS_PUBLISH_SECONDS = 10
+REQUEST_METRICS_RAISE_ON_BUDGET = False
+
+# Member search (tracker/search.py). Trigram fuzzy matching for misspelled names;
+# run `python manage.py rebuild_member_search_index` after changing it.
+MEMBER_SEARCH_FUZZY = os.getenv('MEMBER_SEARCH_FUZZY', 'True') == 'True'
+
+# API cursor pagination (tracker/api/pagination.py): largest `page_size` a client may request with `?cursor=`.
+API_CURSOR_MAX_PAGE_SIZE = int(os.getenv('API_CURSOR_MAX_PAGE_SIZE', '200'))
+
+# Delta sync (tracker/sync.py). Sync tokens older than SYNC_TOMBSTONE_DAYS, or deltas larger than
+# SYNC_MAX_CHANGES rows, make the client reload. Prune tombstones with `python manage.py prune_sync_tombstones`.
+SYNC_TOMBSTONE_DAYS = int(os.getenv('SYNC_TOMBSTONE_DAYS', '90'))
+SYNC_MAX_CHANGES = int(os.getenv('SYNC_MAX_CHANGES', '2000'))
+SYNC_OVERLAP_SECONDS = 5
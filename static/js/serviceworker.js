@@ -1,5 +1,8 @@
 // Service Worker for BossIn PWA
-const CACHE_NAME = 'bossin-cache-v1';
+const CACHE_NAME = 'bossin-cache-v2';
+// Signed-in pages kept for offline use; base.html deletes it on logout and
+// whenever a signed-out page loads, so one user's members never reach another
+const PAGE_CACHE_NAME = 'bossin-pages-v1';
 const urlsToCache = [
     '/',
     '/login/',
@@ -22,6 +25,31 @@ self.addEventListener('install', event => {
 
 // Fetch event - serve from cache when offline
 self.addEventListener('fetch', event => {
+    // Payments and other writes always go to the network: the daily collection
+    // page queues them itself and replays them with their idempotency keys
+    if (event.request.method !== 'GET') {
+        return;
+    }
+
+    // Daily collection page: network first, so collectors see fresh totals,
+    // with the last copy as a fallback when the venue has no connection. One
+    // copy is kept per page, whatever its search or cursor parameters.
+    const url = new URL(event.request.url);
+    if (event.request.mode === 'navigate' && url.pathname.endsWith('/daily-collection/')) {
+        event.respondWith(
+            fetch(event.request)
+                .then(response => {
+                    if (response.ok && !response.redirected) {
+                        const copy = response.clone();
+                        caches.open(PAGE_CACHE_NAME).then(cache => cache.put(url.origin + url.pathname, copy));
+                    }
+                    return response;
+                })
+                .catch(() => caches.open(PAGE_CACHE_NAME).then(cache => cache.match(event.request, {ignoreSearch: true})))
+        );
+        return;
+    }
+
     event.respondWith(
         caches.match(event.request)
             .then(response => {
@@ -37,7 +65,7 @@ self.addEventListener('activate', event => {
         caches.keys().then(cacheNames => {
             return Promise.all(
                 cacheNames.map(cacheName => {
-                    if (cacheName !== CACHE_NAME) {
+                    if (cacheName !== CACHE_NAME && cacheName !== PAGE_CACHE_NAME) {
                         return caches.delete(cacheName);
                     }
                 })
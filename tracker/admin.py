@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils import timezone
 from django.utils.html import format_html
-from .models import Organization, OrganizationTheme, OrganizationUser, Member, Transaction, MemberEditLog, PaymentRequest
+from .models import Organization, OrganizationTheme, OrganizationUser, Member, Transaction, MemberEditLog, PaymentRequest, ImportJob
 
 
 @admin.register(PaymentRequest)
@@ -157,7 +157,18 @@ class PaymentRequestAdmin(admin.ModelAdmin):
     approve_requests.short_description = "Approve selected requests and extend subscription"
 
     def decline_requests(self, request, queryset):
-        updated = queryset.exclude(status='declined').update(status='declined')
+        from .platform_metrics import refresh_payment_metrics
+        from .versions import bump_data_version
+
+        declining = queryset.exclude(status='declined')
+        organization_ids = set(declining.values_list('organization_id', flat=True))
+        updated = declining.update(status='declined', updated_at=timezone.now())
+        # update() skips the post_save signals that keep the pending badge,
+        # the platform metrics and the organizations' data versions current
+        if updated:
+            for organization_id in organization_ids:
+                bump_data_version(organization_id)
+            refresh_payment_metrics()
         self.message_user(request, f"Declined {updated} payment request(s).")
     decline_requests.short_description = "Decline selected requests"
 
@@ -422,3 +433,11 @@ class TransactionAdmin(CustomAdminMixin, admin.ModelAdmin):
     def amount(self, obj):
         return f"TZS {obj.amount:,.2f}"
     amount.short_description = 'Amount'
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(CustomAdminMixin, admin.ModelAdmin):
+    list_display = ['id', 'organization', 'original_filename', 'status', 'rows_processed', 'created_count', 'updated_count', 'error_count', 'created_at']
+    list_filter = ['status', 'organization', 'created_at']
+    search_fields = ['organization__name', 'original_filename', 'created_by__username']
+    readonly_fields = ['rows_processed', 'created_count', 'updated_count', 'transaction_count', 'error_count', 'errors', 'failure_reason', 'created_at', 'started_at', 'heartbeat_at', 'finished_at']
@@ -1,11 +1,20 @@
-"""API view mixins for tenant resolution and response helpers."""
+"""API view mixins for tenant resolution, response helpers and conditional GET."""
 
-from django.http import Http404
+import hashlib
+from calendar import timegm
+from datetime import datetime, time
+
+from django.http import Http404, HttpResponseNotModified
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 
 from tracker.api.utils import get_organization_by_slug, success_response, error_response
 from tracker.api.exceptions import subscription_expired_response
 from tracker.api.utils import check_subscription_active
-from tracker.permissions import get_user_org_role
+from tracker.permissions import get_org_membership, get_user_org_role
+from tracker.subscriptions import subscription_state
+from tracker.versions import get_data_version
 
 
 class TenantMixin:
@@ -22,17 +31,7 @@ class TenantMixin:
             except Exception:
                 raise Http404('Organization not found or is inactive.')
 
-            request.org_membership = None
-            if request.user.is_authenticated:
-                from tracker.models import OrganizationUser
-                try:
-                    request.org_membership = OrganizationUser.objects.get(
-                        user=request.user,
-                        organization=request.tenant,
-                        is_active=True,
-                    )
-                except OrganizationUser.DoesNotExist:
-                    request.org_membership = None
+            request.org_membership = get_org_membership(request.user, request.tenant)
         else:
             request.tenant = None
             request.org_membership = None
@@ -72,3 +71,72 @@ class APIResponseMixin:
         if not is_active:
             return subscription_expired_response(status_info.get('error'))
         return None
+
+
+class NotModified(Exception):
+    """Raised by ConditionalGetMixin when the client's copy is current."""
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET for tenant resources.
+
+    The ETag and Last-Modified come from the organization's data version
+    (tracker/versions.py) plus the view, user and full path. A GET whose
+    If-None-Match or If-Modified-Since still matches is answered with 304
+    straight after the permission checks, before the view reads any member
+    data. Views whose payload also changes with the date, such as the
+    subscription state shown with an organization, set
+    `conditional_daily = True`. Views that read data outside the
+    organization version, such as global pricing, must not use it.
+
+    List after TenantMixin so request.tenant is set first.
+    """
+
+    conditional_daily = False
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.conditional_etag = None
+        self.conditional_last_modified = None
+        organization = getattr(request, 'tenant', None)
+        if request.method not in ('GET', 'HEAD') or organization is None:
+            return
+
+        version, updated_at = get_data_version(organization.pk)
+        now = timezone.now()
+        parts = [type(self).__name__, version, request.user.pk, request.get_full_path()]
+        changed_at = [updated_at] if updated_at else []
+        if self.conditional_daily:
+            is_active, _ = subscription_state(organization, now)
+            parts += [timezone.localdate(now).isoformat(), is_active]
+            changed_at.append(timezone.make_aware(datetime.combine(timezone.localdate(now), time.min)))
+            if organization.effective_until and organization.effective_until <= now:
+                changed_at.append(organization.effective_until)
+
+        digest = hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()[:32]
+        self.conditional_etag = quote_etag(digest)
+        last_modified = timegm(max(changed_at).utctimetuple()) if changed_at else None
+        # Only advertise a second that has passed: a later write within the
+        # same second would otherwise share its Last-Modified
+        if last_modified is not None and last_modified < int(now.timestamp()):
+            self.conditional_last_modified = last_modified
+
+        if get_conditional_response(request, etag=self.conditional_etag, last_modified=last_modified):
+            raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return HttpResponseNotModified()
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, 'conditional_etag', None)
+        if etag and response.status_code in (200, 304):
+            response['ETag'] = etag
+            if self.conditional_last_modified is not None:
+                response['Last-Modified'] = http_date(self.conditional_last_modified)
+            # Per-user payloads: clients may keep them but must revalidate
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
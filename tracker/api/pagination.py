@@ -0,0 +1,76 @@
+"""
+API pagination.
+
+List endpoints page with PageNumberPagination by default. Passing `cursor`
+(empty for the first page) switches to keyset pagination over the view's
+`cursor_ordering`: each page is one indexed range scan however deep the
+client scrolls, and the COUNT(*) is only run when asked for with
+`count=true`. `page_size` may be set in cursor mode, up to
+API_CURSOR_MAX_PAGE_SIZE. A malformed or tampered cursor is a 400.
+"""
+
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from tracker.pagination import InvalidCursor, paginate_cursor
+
+
+TRUE_VALUES = ('1', 'true', 'yes')
+
+
+class CursorOptionalPagination(PageNumberPagination):
+    """PageNumberPagination, or keyset pagination when `cursor` is present."""
+
+    cursor_query_param = 'cursor'
+    cursor_page_size_query_param = 'page_size'
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_page = None
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        ordering = getattr(view, 'cursor_ordering', None) or ('-pk',)
+        cursor = request.query_params.get(self.cursor_query_param) or None
+        try:
+            self.keyset_page = paginate_cursor(
+                queryset, ordering, cursor=cursor, limit=self.get_cursor_page_size(request),
+            )
+        except InvalidCursor:
+            raise ValidationError({self.cursor_query_param: 'Invalid cursor.'})
+
+        self.total_count = None
+        if request.query_params.get(self.count_query_param, '').lower() in TRUE_VALUES:
+            self.total_count = queryset.count()
+        return list(self.keyset_page)
+
+    def get_cursor_page_size(self, request):
+        max_page_size = getattr(settings, 'API_CURSOR_MAX_PAGE_SIZE', 200)
+        try:
+            page_size = int(request.query_params[self.cursor_page_size_query_param])
+        except (KeyError, ValueError):
+            return min(self.page_size, max_page_size)
+        return min(max(page_size, 1), max_page_size)
+
+    def get_cursor_link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.count_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        if self.keyset_page is None:
+            return super().get_paginated_response(data)
+
+        body = {}
+        if self.total_count is not None:
+            body['count'] = self.total_count
+        body['next'] = self.get_cursor_link(self.keyset_page.next_cursor)
+        body['previous'] = self.get_cursor_link(self.keyset_page.previous_cursor)
+        body['results'] = data
+        return Response(body)
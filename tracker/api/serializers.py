@@ -20,7 +20,9 @@ from tracker.models import (
     SystemSettings,
     apply_category_default_theme,
 )
+from tracker.payments import clean_idempotency_key
 from tracker.permissions import get_user_org_role
+from tracker.subscriptions import subscription_state
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -95,8 +97,7 @@ class OrganizationSerializer(serializers.ModelSerializer):
         ]
 
     def get_subscription_info(self, obj):
-        from tracker.api.utils import check_subscription_active
-        _, info = check_subscription_active(obj)
+        _, info = subscription_state(obj)
         return info
 
     def get_user_role(self, obj):
@@ -194,10 +195,27 @@ class TransactionSerializer(serializers.ModelSerializer):
         return value
 
 
+class IdempotencyKeyField(serializers.CharField):
+    """Optional client-generated key that makes a payment safe to retry."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('required', False)
+        kwargs.setdefault('allow_blank', True)
+        kwargs.setdefault('max_length', 64)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        try:
+            return clean_idempotency_key(super().to_internal_value(data))
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+
+
 class RecordPaymentSerializer(serializers.Serializer):
     amount = serializers.DecimalField(max_digits=10, decimal_places=2)
     date = serializers.DateField(required=False)
     note = serializers.CharField(required=False, allow_blank=True, max_length=500)
+    idempotency_key = IdempotencyKeyField()
 
     def validate_amount(self, value):
         if value <= 0:
@@ -209,6 +227,8 @@ class BulkPaymentItemSerializer(serializers.Serializer):
     member_id = serializers.IntegerField()
     payment_amount = serializers.DecimalField(max_digits=10, decimal_places=2)
     note = serializers.CharField(required=False, allow_blank=True, max_length=500)
+    date = serializers.DateField(required=False)
+    idempotency_key = IdempotencyKeyField()
 
 
 class BulkPaymentSerializer(serializers.Serializer):
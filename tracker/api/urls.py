@@ -100,6 +100,13 @@ urlpatterns = [
         name='member_edit_log',
     ),
 
+    # Delta sync
+    path(
+        'orgs/<slug:org_slug>/sync/',
+        views.SyncAPIView.as_view(),
+        name='sync',
+    ),
+
     # Subscription
     path(
         'orgs/<slug:org_slug>/subscription/',
@@ -133,4 +140,14 @@ urlpatterns = [
         views.ImportMembersExcelAPIView.as_view(),
         name='import_members_excel',
     ),
+    path(
+        'orgs/<slug:org_slug>/import/jobs/<int:job_id>/',
+        views.ImportJobDetailAPIView.as_view(),
+        name='import_job_detail',
+    ),
+    path(
+        'orgs/<slug:org_slug>/import/jobs/<int:job_id>/errors/',
+        views.ImportJobErrorsAPIView.as_view(),
+        name='import_job_errors',
+    ),
 ]
@@ -2,7 +2,6 @@
 
 from decimal import Decimal
 
-from django.utils import timezone
 from django.db.models import Sum, Q
 
 from tracker.models import (
@@ -12,11 +11,20 @@ from tracker.models import (
     OrganizationUser,
     SystemSettings,
 )
+from tracker.queries import filter_members
+from tracker.subscriptions import subscription_state
+from tracker.tenants import get_tenant
+from tracker.stats import (
+    aggregate_member_stats,
+    get_member_stats,
+    get_target_amount,
+    progress_percentage,
+)
 
 
 def get_organization_by_slug(slug):
-    """Resolve an active organization by slug."""
-    return Organization.objects.select_related('theme').get(slug=slug, is_active=True)
+    """Resolve an active organization by slug (cached, with theme)."""
+    return get_tenant(slug)
 
 
 def get_user_org_membership(user, organization):
@@ -31,138 +39,47 @@ def get_user_org_membership(user, organization):
 def check_subscription_active(organization):
     """
     Check if organization has active subscription or trial.
-    Returns (is_active, status_info dict).
-    Auto-updates expired statuses like the web middleware.
+    Returns (is_active, status_info dict). Read-only: lapsed statuses are
+    reported as NOT_SUBSCRIBED and flipped later by expire_subscriptions.
     """
-    now = timezone.now()
-    org = organization
-
-    if org.subscription_status == 'FREE_TRIAL' and org.trial_started_at:
-        trial_end = org.trial_started_at + timezone.timedelta(days=7)
-        if trial_end <= now:
-            org.subscription_status = 'NOT_SUBSCRIBED'
-            org.save(update_fields=['subscription_status'])
-
-    if org.subscription_status == 'SUBSCRIBED' and org.subscription_expires_at:
-        if org.subscription_expires_at <= now:
-            org.subscription_status = 'NOT_SUBSCRIBED'
-            org.save(update_fields=['subscription_status'])
-
-    active_sub = bool(
-        org.subscription_status == 'SUBSCRIBED'
-        and org.subscription_expires_at
-        and org.subscription_expires_at > now
-    )
-
-    trial_active = bool(
-        org.subscription_status == 'FREE_TRIAL'
-        and org.trial_started_at
-        and (org.trial_started_at + timezone.timedelta(days=7) > now)
-    )
-
-    days_remaining = None
-    if active_sub and org.subscription_expires_at:
-        days_remaining = (org.subscription_expires_at - now).days
-    elif trial_active and org.trial_started_at:
-        trial_end = org.trial_started_at + timezone.timedelta(days=7)
-        days_remaining = (trial_end - now).days
-
-    status_info = {
-        'subscription_status': org.subscription_status,
-        'is_active': active_sub or trial_active,
-        'trial_active': trial_active,
-        'subscription_active': active_sub,
-        'days_remaining': days_remaining,
-        'subscription_expires_at': (
-            org.subscription_expires_at.isoformat() if org.subscription_expires_at else None
-        ),
-        'trial_started_at': (
-            org.trial_started_at.isoformat() if org.trial_started_at else None
-        ),
-    }
-
-    is_active = active_sub or trial_active
-    if org.subscription_status == 'NOT_SUBSCRIBED':
-        is_active = False
-
-    return is_active, status_info
-
-
-def get_dashboard_stats(organization, members_qs=None):
-    """Calculate dashboard statistics for an organization."""
-    if members_qs is None:
-        members_qs = Member.objects.filter(organization=organization, is_active=True)
-
-    members = list(members_qs)
+    return subscription_state(organization)
 
-    try:
-        target_amount = Decimal(str(organization.theme.target_amount))
-    except Exception:
-        target_amount = Decimal('210000.00')
 
-    total_collected = Decimal('0.00')
-    total_pledged = Decimal('0.00')
-    not_paid_count = 0
-    incomplete_count = 0
-    complete_count = 0
-    exceeded_count = 0
-
-    for member in members:
-        pledge = member.pledge if member.pledge is not None else Decimal('70000.00')
-        paid_total = member.paid_total if member.paid_total is not None else Decimal('0.00')
-
-        total_pledged += pledge
-        total_collected += paid_total
+def get_dashboard_stats(organization, members_qs=None, search=None, status_filter=None):
+    """
+    Calculate dashboard statistics for an organization.
 
-        if paid_total == 0:
-            not_paid_count += 1
-        elif paid_total < pledge:
-            incomplete_count += 1
-        elif paid_total == pledge:
-            complete_count += 1
-        else:
-            exceeded_count += 1
+    Pass either an explicit members queryset or search/status filters over the
+    organization's active members; unfiltered stats come from the stats cache.
+    """
+    if members_qs is not None:
+        stats = aggregate_member_stats(members_qs)
+    else:
+        stats = get_member_stats(
+            organization, search=search, status_filter=status_filter, active_only=True,
+        )
 
-    progress_percentage = float(
-        (total_collected / target_amount * 100) if target_amount > 0 else 0
-    )
+    target_amount = get_target_amount(organization)
+    percentage = float(progress_percentage(stats['total_collected'], target_amount))
 
     return {
-        'total_collected': str(total_collected),
-        'total_pledged': str(total_pledged),
+        'total_collected': str(stats['total_collected']),
+        'total_pledged': str(stats['total_pledged']),
         'target_amount': str(target_amount),
-        'progress_percentage': round(progress_percentage, 2),
-        'member_count': len(members),
-        'not_paid_count': not_paid_count,
-        'incomplete_count': incomplete_count,
-        'complete_count': complete_count,
-        'exceeded_count': exceeded_count,
+        'progress_percentage': round(percentage, 2),
+        'member_count': stats['member_count'],
+        'not_paid_count': stats['not_paid_count'],
+        'incomplete_count': stats['incomplete_count'],
+        'complete_count': stats['complete_count'],
+        'exceeded_count': stats['exceeded_count'],
     }
 
 
-def filter_members_queryset(queryset, search=None, status_filter=None):
+def filter_members_queryset(queryset, search=None, status_filter=None, organization=None):
     """Apply search and status filters to member queryset."""
-    if search:
-        queryset = queryset.filter(
-            Q(name__icontains=search)
-            | Q(phone__icontains=search)
-            | Q(email__icontains=search)
-        )
-
-    if status_filter == 'not_started':
-        queryset = queryset.filter(paid_total=0)
-    elif status_filter == 'incomplete':
-        queryset = queryset.filter(paid_total__gt=0).extra(
-            where=['paid_total < pledge']
-        )
-    elif status_filter == 'complete':
-        queryset = queryset.extra(where=['paid_total >= pledge'])
-    elif status_filter == 'exceeded':
-        queryset = queryset.extra(where=['paid_total > pledge'])
-    elif status_filter == 'pledged':
-        queryset = queryset.filter(pledge__gt=Decimal('70000'))
-
-    return queryset
+    return filter_members(
+        queryset, search=search, status_filter=status_filter, organization=organization,
+    )
 
 
 def get_subscription_pricing(organization):
@@ -19,7 +19,7 @@ import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 
@@ -31,8 +31,10 @@ from tracker.models import (
     MemberEditLog,
     PaymentRequest,
     SystemSettings,
+    ImportJob,
 )
-from tracker.api.mixins import TenantMixin, APIResponseMixin
+from tracker.api.mixins import TenantMixin, APIResponseMixin, ConditionalGetMixin
+from tracker.api.pagination import CursorOptionalPagination
 from tracker.api.permissions import (
     IsOrgMember,
     IsOrgStaff,
@@ -72,6 +74,18 @@ from tracker.api.utils import (
     success_response,
     error_response,
 )
+from tracker.payments import IdempotencyConflict, record_bulk_payments, record_payment
+from tracker.permissions import is_org_admin, is_org_owner
+from tracker.sync import changes_since, issue_token, read_token
+from tracker.importer import import_members_from_excel
+from tracker.jobs import create_import_job, import_job_progress
+from tracker.reports import ReportArtifact
+from tracker.exports import (
+    build_members_workbook,
+    build_transactions_workbook,
+    save_to_tempfile,
+    xlsx_response,
+)
 
 
 def get_tokens_for_user(user):
@@ -229,8 +243,9 @@ class OrganizationListAPIView(APIView):
         })
 
 
-class OrganizationDetailAPIView(TenantMixin, APIResponseMixin, APIView):
+class OrganizationDetailAPIView(TenantMixin, ConditionalGetMixin, APIResponseMixin, APIView):
     permission_classes = [IsAuthenticated, IsOrgMember]
+    conditional_daily = True
 
     def get(self, request, org_slug):
         return self.api_success(
@@ -256,7 +271,7 @@ class OrganizationDetailAPIView(TenantMixin, APIResponseMixin, APIView):
         )
 
 
-class OrganizationThemeAPIView(TenantMixin, APIResponseMixin, APIView):
+class OrganizationThemeAPIView(TenantMixin, ConditionalGetMixin, APIResponseMixin, APIView):
     permission_classes = [IsAuthenticated, IsOrgMember]
 
     def get(self, request, org_slug):
@@ -288,18 +303,16 @@ class OrganizationThemeAPIView(TenantMixin, APIResponseMixin, APIView):
 # DASHBOARD
 # =============================================================================
 
-class DashboardStatsAPIView(TenantMixin, APIResponseMixin, APIView):
+class DashboardStatsAPIView(TenantMixin, ConditionalGetMixin, APIResponseMixin, APIView):
     permission_classes = [IsAuthenticated, IsOrgMember]
 
     def get(self, request, org_slug):
         search = request.query_params.get('search', '')
         status_filter = request.query_params.get('filter', '')
 
-        members_qs = Member.objects.filter(
-            organization=request.tenant, is_active=True,
+        stats = get_dashboard_stats(
+            request.tenant, search=search, status_filter=status_filter,
         )
-        members_qs = filter_members_queryset(members_qs, search, status_filter)
-        stats = get_dashboard_stats(request.tenant, members_qs)
 
         return self.api_success(stats)
 
@@ -308,8 +321,10 @@ class DashboardStatsAPIView(TenantMixin, APIResponseMixin, APIView):
 # MEMBERS
 # =============================================================================
 
-class MemberListCreateAPIView(TenantMixin, APIResponseMixin, generics.ListCreateAPIView):
+class MemberListCreateAPIView(TenantMixin, ConditionalGetMixin, APIResponseMixin, generics.ListCreateAPIView):
     serializer_class = MemberSerializer
+    pagination_class = CursorOptionalPagination
+    cursor_ordering = ('name', 'id')
     permission_classes = [
         IsAuthenticated, IsOrgMember, ReadOnlyForViewer,
         SubscriptionActive,
@@ -318,10 +333,10 @@ class MemberListCreateAPIView(TenantMixin, APIResponseMixin, generics.ListCreate
     def get_queryset(self):
         qs = Member.objects.filter(
             organization=self.request.tenant, is_active=True,
-        ).order_by('name')
+        ).order_by('name', 'id')
         search = self.request.query_params.get('search', '')
         status_filter = self.request.query_params.get('filter', '')
-        return filter_members_queryset(qs, search, status_filter)
+        return filter_members_queryset(qs, search, status_filter, organization=self.request.tenant)
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -418,7 +433,7 @@ class MemberDetailAPIView(TenantMixin, APIResponseMixin, generics.RetrieveUpdate
         return self.api_success({'message': 'Member deactivated successfully.'})
 
 
-class MemberTransactionsAPIView(TenantMixin, APIResponseMixin, APIView):
+class MemberTransactionsAPIView(TenantMixin, ConditionalGetMixin, APIResponseMixin, APIView):
     permission_classes = [IsAuthenticated, IsOrgMember]
 
     def get(self, request, org_slug, member_id):
@@ -440,25 +455,32 @@ class MemberTransactionsAPIView(TenantMixin, APIResponseMixin, APIView):
             return sub_check
 
         member = get_object_or_404(Member, id=member_id, organization=request.tenant)
-        serializer = RecordPaymentSerializer(data=request.data)
+        data = request.data.copy()
+        if request.headers.get('Idempotency-Key') and not data.get('idempotency_key'):
+            data['idempotency_key'] = request.headers['Idempotency-Key']
+        serializer = RecordPaymentSerializer(data=data)
         if not serializer.is_valid():
             return self.api_error(serializer.errors)
 
-        payment_date = serializer.validated_data.get('date') or timezone.now().date()
-        transaction = Transaction.objects.create(
-            organization=request.tenant,
-            member=member,
-            amount=serializer.validated_data['amount'],
-            date=payment_date,
-            added_by=request.user,
-            note=serializer.validated_data.get('note', ''),
-        )
+        try:
+            transaction, created = record_payment(
+                request.tenant, member, request.user,
+                serializer.validated_data['amount'],
+                date=serializer.validated_data.get('date'),
+                note=serializer.validated_data.get('note', ''),
+                idempotency_key=serializer.validated_data.get('idempotency_key'),
+            )
+        except IdempotencyConflict as e:
+            return self.api_error(str(e), status=status.HTTP_409_CONFLICT)
+        except ValueError as e:
+            return self.api_error(str(e))
         member.refresh_from_db()
 
         return self.api_success({
             'transaction': TransactionSerializer(transaction).data,
             'member': MemberSerializer(member).data,
-        }, status=status.HTTP_201_CREATED)
+            'duplicate': not created,
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
 
 # =============================================================================
@@ -467,6 +489,8 @@ class MemberTransactionsAPIView(TenantMixin, APIResponseMixin, APIView):
 
 class TransactionListAPIView(TenantMixin, APIResponseMixin, generics.ListAPIView):
     serializer_class = TransactionSerializer
+    pagination_class = CursorOptionalPagination
+    cursor_ordering = ('-date', '-id')
     permission_classes = [IsAuthenticated, IsOrgAdmin]
 
     def get_queryset(self):
@@ -532,7 +556,10 @@ class TransactionDetailAPIView(TenantMixin, APIResponseMixin, generics.RetrieveU
 
 
 class BulkPaymentAPIView(TenantMixin, APIResponseMixin, APIView):
-    """Record multiple daily collection payments at once."""
+    """
+    Record multiple daily collection payments at once. Payments sent with an
+    idempotency_key are recorded once, however often the batch is replayed.
+    """
 
     permission_classes = [IsAuthenticated, CanRecordTransactions, SubscriptionActive]
 
@@ -541,40 +568,18 @@ class BulkPaymentAPIView(TenantMixin, APIResponseMixin, APIView):
         if not serializer.is_valid():
             return self.api_error(serializer.errors)
 
-        results = []
-        errors = []
-        today = timezone.now().date()
-
-        for payment in serializer.validated_data['payments']:
-            try:
-                member = Member.objects.get(
-                    id=payment['member_id'],
-                    organization=request.tenant,
-                    is_active=True,
-                )
-                transaction = Transaction.objects.create(
-                    organization=request.tenant,
-                    member=member,
-                    amount=payment['payment_amount'],
-                    date=today,
-                    added_by=request.user,
-                    note=payment.get('note', ''),
-                )
-                member.refresh_from_db()
-                results.append({
-                    'transaction_id': transaction.id,
-                    'member': MemberSerializer(member).data,
-                })
-            except Member.DoesNotExist:
-                errors.append({
-                    'member_id': payment['member_id'],
-                    'error': 'Member not found.',
-                })
-            except Exception as e:
-                errors.append({
-                    'member_id': payment['member_id'],
-                    'error': str(e),
-                })
+        recorded, errors = record_bulk_payments(
+            request.tenant, request.user, serializer.validated_data['payments'],
+        )
+        results = [
+            {
+                'transaction_id': transaction.id,
+                'idempotency_key': transaction.idempotency_key,
+                'duplicate': not created,
+                'member': MemberSerializer(member).data,
+            }
+            for transaction, member, created in recorded
+        ]
 
         return self.api_success({
             'recorded': results,
@@ -670,6 +675,8 @@ class StaffDetailAPIView(TenantMixin, APIResponseMixin, APIView):
 
 class MemberEditLogAPIView(TenantMixin, APIResponseMixin, generics.ListAPIView):
     serializer_class = MemberEditLogSerializer
+    pagination_class = CursorOptionalPagination
+    cursor_ordering = ('-created_at', '-id')
     permission_classes = [IsAuthenticated, IsOrgOwner]
 
     def get_queryset(self):
@@ -691,11 +698,50 @@ class MemberEditLogAPIView(TenantMixin, APIResponseMixin, generics.ListAPIView):
         return self.api_success(serializer.data)
 
 
+class SyncAPIView(TenantMixin, APIResponseMixin, APIView):
+    """
+    Members, transactions and edit logs changed since `?since=<token>`
+    (see tracker/sync.py). Transactions are included for admins and edit
+    logs for owners, matching their list endpoints.
+    """
+
+    permission_classes = [IsAuthenticated, IsOrgMember]
+
+    def get(self, request, org_slug):
+        organization = request.tenant
+        token = issue_token(organization)
+        since = read_token(request.query_params.get('since', ''), organization)
+        include_transactions = is_org_admin(request.user, organization)
+        include_edit_logs = is_org_owner(request.user, organization)
+
+        changes = changes_since(
+            organization, since,
+            include_transactions=include_transactions,
+            include_edit_logs=include_edit_logs,
+        )
+        if changes is None:
+            return self.api_success({'token': token, 'reset': True})
+
+        data = {
+            'token': token,
+            'reset': False,
+            'members': MemberSerializer(changes['members'], many=True).data,
+            'deleted': changes['deleted'],
+        }
+        if include_transactions:
+            data['transactions'] = TransactionSerializer(changes['transactions'], many=True).data
+        if include_edit_logs:
+            data['member_edit_logs'] = MemberEditLogSerializer(changes['member_edit_logs'], many=True).data
+        return self.api_success(data)
+
+
 # =============================================================================
 # SUBSCRIPTION & BILLING
 # =============================================================================
 
 class SubscriptionStatusAPIView(TenantMixin, APIResponseMixin, APIView):
+    # Not conditional: pricing and payment request status change without a
+    # bump of the organization's data version
     permission_classes = [IsAuthenticated, IsOrgMember]
 
     def get(self, request, org_slug):
@@ -812,85 +858,13 @@ class ExportMembersExcelAPIView(TenantMixin, APIView):
         members_qs = Member.objects.filter(
             organization=request.tenant, is_active=True,
         ).order_by('name')
-        members_qs = filter_members_queryset(members_qs, search, filter_status)
-
-        # Create workbook
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Members Data"
-
-        # Add organization header
-        ws.merge_cells('A1:J1')
-        org_header = ws['A1']
-        org_header.value = f"{request.tenant.name} - Members Report"
-        org_header.font = Font(bold=True, size=14, color="FFFFFF")
-        org_header.fill = PatternFill(start_color="2c3e50", end_color="2c3e50", fill_type="solid")
-        org_header.alignment = Alignment(horizontal='center', vertical='center')
-        ws.row_dimensions[1].height = 25
-
-        # Add export date
-        ws.merge_cells('A2:J2')
-        date_cell = ws['A2']
-        date_cell.value = f"Exported on {date.today().strftime('%B %d, %Y')}"
-        date_cell.font = Font(italic=True, size=10, color="666666")
-        date_cell.alignment = Alignment(horizontal='center', vertical='center')
-        ws.row_dimensions[2].height = 15
-
-        # Define styles
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        center_alignment = Alignment(horizontal='center', vertical='center')
-
-        # Add headers
-        headers = ['Name', 'Pledge (TZS)', 'Paid (TZS)', 'Remaining (TZS)', 'Phone', 'Email', 'Course', 'Year', 'Status', 'Created Date']
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=4, column=col_num)
-            cell.value = header
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.border = border
-            cell.alignment = center_alignment
-
-        # Add data
-        for row_num, member in enumerate(members_qs, 5):
-            ws.cell(row=row_num, column=1, value=member.name)
-            ws.cell(row=row_num, column=2, value=float(member.pledge))
-            ws.cell(row=row_num, column=3, value=float(member.paid_total))
-            ws.cell(row=row_num, column=4, value=float(member.remaining))
-            ws.cell(row=row_num, column=5, value=member.phone or '')
-            ws.cell(row=row_num, column=6, value=member.email or '')
-            ws.cell(row=row_num, column=7, value=member.course or '')
-            ws.cell(row=row_num, column=8, value=member.year or '')
-            ws.cell(row=row_num, column=9, value=member.status_display)
-            ws.cell(row=row_num, column=10, value=member.created_at.strftime('%Y-%m-%d'))
-
-            # Add borders to data cells
-            for col_num in range(1, 11):
-                ws.cell(row=row_num, column=col_num).border = border
-
-        # Adjust column widths
-        column_widths = [30, 15, 15, 15, 15, 25, 20, 10, 15, 15]
-        for col_num, width in enumerate(column_widths, 1):
-            ws.column_dimensions[openpyxl.utils.get_column_letter(col_num)].width = width
-
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        # Create response
-        response = HttpResponse(
-            output.read(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        members_qs = filter_members_queryset(
+            members_qs, search, filter_status, organization=request.tenant,
         )
-        response['Content-Disposition'] = f'attachment; filename="{request.tenant.slug}_members_{date.today().strftime("%Y%m%d")}.xlsx"'
-        return response
+
+        workbook = build_members_workbook(request.tenant, members_qs)
+        filename = f"{request.tenant.slug}_members_{date.today().strftime('%Y%m%d')}.xlsx"
+        return xlsx_response(save_to_tempfile(workbook), filename)
 
 
 class ExportTransactionsExcelAPIView(TenantMixin, APIView):
@@ -911,79 +885,9 @@ class ExportTransactionsExcelAPIView(TenantMixin, APIView):
         if date_to:
             transactions_qs = transactions_qs.filter(date__lte=date_to)
 
-        # Create workbook
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Transactions Data"
-
-        # Add organization header
-        ws.merge_cells('A1:H1')
-        org_header = ws['A1']
-        org_header.value = f"{request.tenant.name} - Transactions Report"
-        org_header.font = Font(bold=True, size=14, color="FFFFFF")
-        org_header.fill = PatternFill(start_color="2c3e50", end_color="2c3e50", fill_type="solid")
-        org_header.alignment = Alignment(horizontal='center', vertical='center')
-        ws.row_dimensions[1].height = 25
-
-        # Add export date
-        ws.merge_cells('A2:H2')
-        date_cell = ws['A2']
-        date_cell.value = f"Exported on {date.today().strftime('%B %d, %Y')}"
-        date_cell.font = Font(italic=True, size=10, color="666666")
-        date_cell.alignment = Alignment(horizontal='center', vertical='center')
-        ws.row_dimensions[2].height = 15
-
-        # Define styles
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        center_alignment = Alignment(horizontal='center', vertical='center')
-
-        # Add headers
-        headers = ['Date', 'Member Name', 'Amount (TZS)', 'Note', 'Added By', 'Created Date']
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=4, column=col_num)
-            cell.value = header
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.border = border
-            cell.alignment = center_alignment
-
-        # Add data
-        for row_num, txn in enumerate(transactions_qs, 5):
-            ws.cell(row=row_num, column=1, value=txn.date.strftime('%Y-%m-%d'))
-            ws.cell(row=row_num, column=2, value=txn.member.name if txn.member else 'N/A')
-            ws.cell(row=row_num, column=3, value=float(txn.amount))
-            ws.cell(row=row_num, column=4, value=txn.note or '')
-            ws.cell(row=row_num, column=5, value=txn.added_by.username if txn.added_by else 'N/A')
-            ws.cell(row=row_num, column=6, value=txn.created_at.strftime('%Y-%m-%d %H:%M'))
-
-            # Add borders to data cells
-            for col_num in range(1, 7):
-                ws.cell(row=row_num, column=col_num).border = border
-
-        # Adjust column widths
-        column_widths = [15, 30, 15, 30, 20, 20]
-        for col_num, width in enumerate(column_widths, 1):
-            ws.column_dimensions[openpyxl.utils.get_column_letter(col_num)].width = width
-
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        # Create response
-        response = HttpResponse(
-            output.read(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="{request.tenant.slug}_transactions_{date.today().strftime("%Y%m%d")}.xlsx"'
-        return response
+        workbook = build_transactions_workbook(request.tenant, transactions_qs)
+        filename = f"{request.tenant.slug}_transactions_{date.today().strftime('%Y%m%d')}.xlsx"
+        return xlsx_response(save_to_tempfile(workbook), filename)
 
 
 class ExportReportPDFAPIView(TenantMixin, APIView):
@@ -994,158 +898,171 @@ class ExportReportPDFAPIView(TenantMixin, APIView):
         search = request.query_params.get('search', '')
         filter_status = request.query_params.get('filter', '')
 
-        # Get members with filtering
-        members_qs = Member.objects.filter(
-            organization=request.tenant, is_active=True,
-        ).order_by('name')
-        members_qs = filter_members_queryset(members_qs, search, filter_status)
-
-        # Get stats
-        stats = get_dashboard_stats(request.tenant, members_qs)
-
-        # Create PDF with proper margins
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="{request.tenant.slug}_report_{date.today().strftime("%Y%m%d")}.pdf"'
-
-        doc = SimpleDocTemplate(
-            response,
-            pagesize=letter,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=120,
-            bottomMargin=60
-        )
-        elements = []
-        styles = getSampleStyleSheet()
-
-        # Custom title style
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            alignment=1,  # Center alignment
-            textColor=colors.HexColor('#2c3e50')
+        # Serve the stored report while the organization's data is unchanged
+        artifact = ReportArtifact(
+            request.tenant, 'api-members-pdf', {'search': search, 'filter': filter_status}, 'pdf',
         )
 
-        # Filter style
-        filter_style = ParagraphStyle(
-            'FilterStyle',
-            parent=styles['Normal'],
-            fontSize=12,
-            spaceAfter=20,
-            alignment=1,  # Center alignment
-            textColor=colors.HexColor('#7f8c8d')
-        )
+        def build_pdf(output):
+            # Get members with filtering
+            members_qs = Member.objects.filter(
+                organization=request.tenant, is_active=True,
+            ).order_by('name')
+            members_qs = filter_members_queryset(
+                members_qs, search, filter_status, organization=request.tenant,
+            )
 
-        # Dynamic title based on filters
-        base_title = f"MEMBERS REPORT: {request.tenant.name.upper()}"
-
-        # Add filter information to title
-        filter_info = []
-        if filter_status:
-            filter_map = {
-                'incomplete': 'INCOMPLETE PAYMENTS',
-                'complete': 'COMPLETE PAYMENTS',
-                'pledged': 'PLEDGED ABOVE TSh 70,000',
-                'not_started': 'NOT STARTED',
-                'exceeded': 'EXCEEDED PLEDGES'
-            }
-            filter_info.append(filter_map.get(filter_status, filter_status.upper()))
-
-        if search:
-            filter_info.append(f'SEARCH: "{search.upper()}"')
-
-        if filter_info:
-            title_text = f"{base_title}<br/><font size='14' color='#e74c3c'>({' - '.join(filter_info)})</font>"
-        else:
-            title_text = base_title
-
-        # Title
-        title = Paragraph(title_text, title_style)
-        elements.append(title)
-
-        # Summary section (without report date)
-        summary_data = [
-            ['SUMMARY', ''],
-            ['Total Members:', f"{stats['member_count']:,}"],
-            ['Total Pledged:', f"TSh {float(stats['total_pledged']):,.2f}"],
-            ['Total Collected:', f"TSh {float(stats['total_collected']):,.2f}"],
-            ['Target Amount:', f"TSh {float(stats['target_amount']):,.2f}"],
-            ['% Collected:', f"{stats['progress_percentage']:.1f}%"],
-        ]
+            # Get stats
+            stats = get_dashboard_stats(request.tenant, members_qs)
+
+            # Create PDF with proper margins
+            doc = SimpleDocTemplate(
+                output,
+                pagesize=letter,
+                rightMargin=72,
+                leftMargin=72,
+                topMargin=120,
+                bottomMargin=60
+            )
+            elements = []
+            styles = getSampleStyleSheet()
+
+            # Custom title style
+            title_style = ParagraphStyle(
+                'CustomTitle',
+                parent=styles['Heading1'],
+                fontSize=18,
+                spaceAfter=30,
+                alignment=1,  # Center alignment
+                textColor=colors.HexColor('#2c3e50')
+            )
 
-        summary_table = Table(summary_data, colWidths=[2*inch, 2*inch])
-        summary_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
-
-        elements.append(summary_table)
-        elements.append(Spacer(1, 20))
-
-        # Members table with proper styling
-        if members_qs:
-            # Table headers with index number
-            headers = ['#', 'Name', 'Phone', 'Pledge', 'Paid', 'Exceed/Remain(-)', 'Status']
-
-            # Prepare data
-            table_data = [headers]
-
-            for index, member in enumerate(members_qs, 1):
-                pledge = member.pledge if member.pledge is not None else Decimal('70000.00')
-                paid = member.paid_total if member.paid_total is not None else Decimal('0.00')
-                balance = paid - pledge
-
-                if paid == 0:
-                    status = "Not Started"
-                elif paid < pledge:
-                    status = "Incomplete"
-                elif paid == pledge:
-                    status = "Complete"
-                else:
-                    status = "Exceeded"
-
-                row = [
-                    str(index),  # Index number
-                    member.name[:20] + "..." if len(member.name) > 20 else member.name,
-                    member.phone or '',
-                    f"TSh {float(pledge):,.0f}",
-                    f"TSh {float(paid):,.0f}",
-                    f"TSh {float(balance):,.0f}",
-                    status,
-                ]
-                table_data.append(row)
-
-            # Create table with proper column widths
-            members_table = Table(
-                table_data,
-                colWidths=[0.5*inch, 2*inch, 1.2*inch, 1*inch, 1*inch, 1.2*inch, 1.1*inch]
+            # Filter style
+            filter_style = ParagraphStyle(
+                'FilterStyle',
+                parent=styles['Normal'],
+                fontSize=12,
+                spaceAfter=20,
+                alignment=1,  # Center alignment
+                textColor=colors.HexColor('#7f8c8d')
             )
-            members_table.setStyle(TableStyle([
+
+            # Dynamic title based on filters
+            base_title = f"MEMBERS REPORT: {request.tenant.name.upper()}"
+
+            # Add filter information to title
+            filter_info = []
+            if filter_status:
+                filter_map = {
+                    'incomplete': 'INCOMPLETE PAYMENTS',
+                    'complete': 'COMPLETE PAYMENTS',
+                    'pledged': 'PLEDGED ABOVE TSh 70,000',
+                    'not_started': 'NOT STARTED',
+                    'exceeded': 'EXCEEDED PLEDGES'
+                }
+                filter_info.append(filter_map.get(filter_status, filter_status.upper()))
+
+            if search:
+                filter_info.append(f'SEARCH: "{search.upper()}"')
+
+            if filter_info:
+                title_text = f"{base_title}<br/><font size='14' color='#e74c3c'>({' - '.join(filter_info)})</font>"
+            else:
+                title_text = base_title
+
+            # Title
+            title = Paragraph(title_text, title_style)
+            elements.append(title)
+
+            # Summary section (without report date)
+            summary_data = [
+                ['SUMMARY', ''],
+                ['Total Members:', f"{stats['member_count']:,}"],
+                ['Total Pledged:', f"TSh {float(stats['total_pledged']):,.2f}"],
+                ['Total Collected:', f"TSh {float(stats['total_collected']):,.2f}"],
+                ['Target Amount:', f"TSh {float(stats['target_amount']):,.2f}"],
+                ['% Collected:', f"{stats['progress_percentage']:.1f}%"],
+            ]
+
+            summary_table = Table(summary_data, colWidths=[2*inch, 2*inch])
+            summary_table.setStyle(TableStyle([
                 ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
                 ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
                 ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
                 ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
                 ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
             ]))
-            elements.append(members_table)
 
-        doc.build(elements)
-        return response
+            elements.append(summary_table)
+            elements.append(Spacer(1, 20))
+
+            # Members table with proper styling
+            if members_qs:
+                # Table headers with index number
+                headers = ['#', 'Name', 'Phone', 'Pledge', 'Paid', 'Exceed/Remain(-)', 'Status']
+
+                # Prepare data
+                table_data = [headers]
+
+                for index, member in enumerate(members_qs, 1):
+                    pledge = member.pledge if member.pledge is not None else Decimal('70000.00')
+                    paid = member.paid_total if member.paid_total is not None else Decimal('0.00')
+                    balance = paid - pledge
+
+                    if paid == 0:
+                        status = "Not Started"
+                    elif paid < pledge:
+                        status = "Incomplete"
+                    elif paid == pledge:
+                        status = "Complete"
+                    else:
+                        status = "Exceeded"
+
+                    row = [
+                        str(index),  # Index number
+                        member.name[:20] + "..." if len(member.name) > 20 else member.name,
+                        member.phone or '',
+                        f"TSh {float(pledge):,.0f}",
+                        f"TSh {float(paid):,.0f}",
+                        f"TSh {float(balance):,.0f}",
+                        status,
+                    ]
+                    table_data.append(row)
+
+                # Create table with proper column widths
+                members_table = Table(
+                    table_data,
+                    colWidths=[0.5*inch, 2*inch, 1.2*inch, 1*inch, 1*inch, 1.2*inch, 1.1*inch]
+                )
+                members_table.setStyle(TableStyle([
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('FONTSIZE', (0, 0), (-1, 0), 10),
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
+                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                    ('FONTSIZE', (0, 1), (-1, -1), 9),
+                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+                ]))
+                elements.append(members_table)
+
+            doc.build(elements)
+
+        filename = f'{request.tenant.slug}_report_{date.today().strftime("%Y%m%d")}.pdf'
+        return artifact.response(request, build_pdf, filename, 'application/pdf')
 
 
 class ImportMembersExcelAPIView(TenantMixin, APIView):
-    """Import members from Excel file."""
+    """
+    Import members from Excel file.
+
+    By default the upload is queued as a background ImportJob and the job is
+    returned with HTTP 202; poll the import job endpoint for progress. Send
+    `async=false` to import within the request (small files only).
+    """
     permission_classes = [IsAuthenticated, IsOrgStaff, SubscriptionActive]
 
     def post(self, request, org_slug):
@@ -1153,7 +1070,8 @@ class ImportMembersExcelAPIView(TenantMixin, APIView):
             return error_response('No file uploaded', status=400)
 
         excel_file = request.FILES['excel_file']
-        update_existing = request.data.get('update_existing', 'false').lower() == 'true'
+        update_existing = str(request.data.get('update_existing', 'false')).lower() == 'true'
+        run_async = str(request.data.get('async', 'true')).lower() != 'false'
         default_pledge = request.data.get('default_pledge', '70000')
 
         try:
@@ -1161,108 +1079,27 @@ class ImportMembersExcelAPIView(TenantMixin, APIView):
         except (InvalidOperation, ValueError):
             default_pledge = Decimal('70000.00')
 
+        if run_async:
+            try:
+                job = create_import_job(
+                    request.tenant, request.user, excel_file,
+                    update_existing=update_existing,
+                    default_pledge=default_pledge,
+                )
+            except Exception as e:
+                return error_response(f'Excel upload error: {str(e)}', status=400)
+            return success_response(import_job_progress(job), status=status.HTTP_202_ACCEPTED)
+
         try:
-            workbook = openpyxl.load_workbook(BytesIO(excel_file.read()))
-            sheet = workbook.active
-
-            created_count = 0
-            updated_count = 0
-            transaction_count = 0
-            errors = []
-
-            for idx, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-                try:
-                    if not row[0]:
-                        continue  # Skip rows without a name
-
-                    name = str(row[0]).strip()
-                    pledge = row[1]
-                    paid = row[2] if len(row) > 2 else None
-                    phone = str(row[3]).strip() if len(row) > 3 and row[3] else ''
-                    email = str(row[4]).strip() if len(row) > 4 and row[4] else ''
-                    course = str(row[5]).strip() if len(row) > 5 and row[5] else ''
-                    year = str(row[6]).strip() if len(row) > 6 and row[6] else ''
-
-                    # Pledge
-                    try:
-                        pledge = Decimal(str(pledge)) if pledge else default_pledge
-                    except InvalidOperation:
-                        pledge = default_pledge
-                        errors.append(f"Row {idx}: Invalid pledge, using default for '{name}'")
-
-                    # Paid
-                    try:
-                        paid = Decimal(str(paid)) if paid else Decimal('0.00')
-                    except InvalidOperation:
-                        paid = Decimal('0.00')
-                        errors.append(f"Row {idx}: Invalid paid value for '{name}', using 0.00")
-
-                    member_created = False
-                    if update_existing:
-                        member, member_created = Member.objects.update_or_create(
-                            organization=request.tenant,
-                            name=name,
-                            defaults={
-                                'pledge': pledge,
-                                'phone': phone or None,
-                                'email': email or None,
-                                'course': course or None,
-                                'year': year or None,
-                            }
-                        )
-                    else:
-                        member = Member.objects.filter(organization=request.tenant, name=name).first()
-                        if not member:
-                            member = Member.objects.create(
-                                organization=request.tenant,
-                                name=name,
-                                pledge=pledge,
-                                phone=phone or None,
-                                email=email or None,
-                                course=course or None,
-                                year=year or None,
-                            )
-                            member_created = True
-                        else:
-                            errors.append(f"Row {idx}: Member '{name}' already exists and update is off.")
-                            continue
-
-                    if member_created:
-                        created_count += 1
-                    else:
-                        updated_count += 1
-
-                    # Transaction
-                    if paid > 0:
-                        existing_txn = Transaction.objects.filter(
-                            organization=request.tenant,
-                            member=member,
-                            date=date.today(),
-                            added_by=request.user,
-                            note__icontains="Imported via Excel"
-                        ).first()
-
-                        if existing_txn:
-                            # Update the amount if different
-                            if existing_txn.amount != paid:
-                                existing_txn.amount = paid
-                                existing_txn.note = f"Updated via Excel on {date.today().isoformat()}"
-                                existing_txn.save()
-                                transaction_count += 1
-                        else:
-                            # Create new transaction
-                            Transaction.objects.create(
-                                organization=request.tenant,
-                                member=member,
-                                amount=paid,
-                                date=date.today(),
-                                added_by=request.user,
-                                note=f"Imported via Excel on {date.today().isoformat()}"
-                            )
-                            transaction_count += 1
-
-                except Exception as e:
-                    errors.append(f"Row {idx}: Error processing member '{row[0]}' - {str(e)}")
+            result = import_members_from_excel(
+                excel_file, request.tenant, request.user,
+                update_existing=update_existing,
+                default_pledge=default_pledge,
+            )
+            created_count = result.created_count
+            updated_count = result.updated_count
+            transaction_count = result.transaction_count
+            errors = result.errors
 
             return success_response({
                 'created_count': created_count,
@@ -1274,3 +1111,28 @@ class ImportMembersExcelAPIView(TenantMixin, APIView):
 
         except Exception as e:
             return error_response(f'Excel processing error: {str(e)}', status=400)
+
+
+class ImportJobDetailAPIView(TenantMixin, APIView):
+    """Poll progress of a background member import."""
+    permission_classes = [IsAuthenticated, IsOrgStaff]
+
+    def get(self, request, org_slug, job_id):
+        job = get_object_or_404(ImportJob, id=job_id, organization=request.tenant)
+        data = import_job_progress(job)
+        data['errors'] = job.errors[:10]
+        return success_response(data)
+
+
+class ImportJobErrorsAPIView(TenantMixin, APIView):
+    """Full row error report of a background member import."""
+    permission_classes = [IsAuthenticated, IsOrgStaff]
+
+    def get(self, request, org_slug, job_id):
+        job = get_object_or_404(ImportJob, id=job_id, organization=request.tenant)
+        return success_response({
+            'id': job.id,
+            'status': job.status,
+            'errors': job.errors,
+            'total_errors': len(job.errors),
+        })
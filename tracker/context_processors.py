@@ -1,12 +1,139 @@
 """
 Context processors for multi-tenant theming and permissions.
 Injects organization, theme, and role data into all templates.
+
+Values are lazy: templates call them on first use, and each is computed once
+per request. Theme values are cached per organization and invalidated when
+the OrganizationTheme is saved; permission flags share the request's
+memoized membership (see tracker.permissions.get_org_membership).
 """
+from functools import partial
+
+from django.core.cache import cache
+
 from .permissions import (
     get_user_org_role, is_org_admin, is_org_staff, is_org_viewer, is_org_owner
 )
 
 
+THEME_CONTEXT_CACHE_TIMEOUT = 60 * 60  # seconds; theme signals invalidate on save
+
+DEFAULT_THEME_CONTEXT = {
+    'theme': None,
+    'org_logo': None,
+    'navbar_title': 'Mission Tracker',
+    'footer_text': '',
+    'watermark_text': 'Bossin',
+    'primary_color': '#7492B9',
+    'secondary_color': '#64748b',
+    'success_color': '#059669',
+    'warning_color': '#d97706',
+    'danger_color': '#dc2626',
+    # Financial Settings
+    'default_pledge_amount': 70000,
+    'target_amount': 210000,
+}
+
+PERMISSION_CONTEXT_KEYS = [
+    'user_role', 'is_org_owner', 'is_org_admin', 'is_org_staff', 'is_org_viewer',
+    'can_edit_org', 'can_manage_staff', 'can_edit_members', 'can_record_transactions',
+    'can_access_admin', 'can_view_admin_log', 'can_import_excel',
+]
+
+
+def _theme_cache_key(organization_id):
+    return f'tracker:theme-context:{organization_id}'
+
+
+def invalidate_theme_context(organization_id):
+    cache.delete(_theme_cache_key(organization_id))
+
+
+def get_theme_values(organization):
+    """
+    Plain theme values for an organization (logo URL, colors, amounts),
+    cached per organization so logo URLs are not rebuilt on every render.
+    """
+    key = _theme_cache_key(organization.pk)
+    values = cache.get(key)
+    if values is not None:
+        return values
+
+    values = {}
+    try:
+        theme = organization.theme
+        values = {
+            'org_logo': theme.logo.url if theme.logo else None,
+            'navbar_title': theme.navbar_title,
+            'footer_text': theme.footer_text,
+            'watermark_text': theme.watermark_text,
+            'primary_color': theme.primary_color,
+            'secondary_color': theme.secondary_color,
+            'success_color': theme.success_color,
+            'warning_color': theme.warning_color,
+            'danger_color': theme.danger_color,
+            'default_pledge_amount': float(theme.default_pledge_amount),
+            'target_amount': float(theme.target_amount),
+        }
+    except Exception:
+        # Theme doesn't exist yet, use defaults
+        pass
+    cache.set(key, values, THEME_CONTEXT_CACHE_TIMEOUT)
+    return values
+
+
+class _LazyThemeContext:
+    """Per-request memo of theme and permission values, computed on first access."""
+
+    def __init__(self, request):
+        self.request = request
+        self.tenant = getattr(request, 'tenant', None)
+        self._theme = None
+        self._permissions = None
+
+    def theme_value(self, key):
+        if self._theme is None:
+            self._theme = dict(DEFAULT_THEME_CONTEXT)
+            if self.tenant:
+                try:
+                    self._theme['theme'] = self.tenant.theme
+                except Exception:
+                    pass
+                values = get_theme_values(self.tenant)
+                self._theme.update(values)
+                self._theme['navbar_title'] = values.get('navbar_title') or self.tenant.name
+        return self._theme[key]
+
+    def permission_value(self, key):
+        if self._permissions is None:
+            self._permissions = self._build_permissions()
+        return self._permissions[key]
+
+    def _build_permissions(self):
+        permissions = dict.fromkeys(PERMISSION_CONTEXT_KEYS, False)
+        permissions['user_role'] = None
+        user = self.request.user
+        tenant = self.tenant
+        if not tenant or not user.is_authenticated:
+            return permissions
+
+        # All helpers read the same memoized membership
+        permissions['user_role'] = get_user_org_role(user, tenant)
+        permissions['is_org_owner'] = is_org_owner(user, tenant)
+        permissions['is_org_admin'] = is_org_admin(user, tenant)
+        permissions['is_org_staff'] = is_org_staff(user, tenant)
+        permissions['is_org_viewer'] = is_org_viewer(user, tenant)
+        # Permission flags for navbar and views
+        permissions['can_edit_org'] = permissions['is_org_owner']
+        permissions['can_manage_staff'] = permissions['is_org_admin']
+        permissions['can_edit_members'] = permissions['is_org_staff']
+        permissions['can_record_transactions'] = permissions['is_org_admin']  # Admin/Owner only
+        permissions['can_access_admin'] = permissions['is_org_admin']
+        permissions['can_view_admin_log'] = permissions['is_org_admin']
+        permissions['can_import_excel'] = permissions['is_org_admin']
+        return permissions
+
+
 def theme_context(request):
     """
     Inject theme, organization, and permission data into template context.
@@ -41,76 +168,19 @@ def theme_context(request):
     - {{ can_view_admin_log }} - True if user can view admin log (admin or owner)
     - {{ can_import_excel }} - True if user can import Excel (admin or owner)
     """
+    tenant = getattr(request, 'tenant', None)
+    lazy = getattr(request, '_lazy_theme_context', None)
+    if lazy is None or lazy.tenant is not tenant:
+        lazy = _LazyThemeContext(request)
+        request._lazy_theme_context = lazy
+
     context = {
-        'tenant': None,
-        'theme': None,
-        'org_name': 'Mission Tracker',
-        'org_logo': None,
-        'navbar_title': 'Mission Tracker',
-        'footer_text': '',
-        'watermark_text': 'Bossin',
-        'primary_color': '#7492B9',
-        'secondary_color': '#64748b',
-        'success_color': '#059669',
-        'warning_color': '#d97706',
-        'danger_color': '#dc2626',
-        # Financial Settings
-        'default_pledge_amount': 70000,
-        'target_amount': 210000,
-        # Permission variables
-        'user_role': None,
-        'is_org_owner': False,
-        'is_org_admin': False,
-        'is_org_staff': False,
-        'is_org_viewer': False,
-        'can_edit_org': False,
-        'can_manage_staff': False,
-        'can_edit_members': False,
-        'can_record_transactions': False,
-        'can_access_admin': False,
-        'can_view_admin_log': False,
-        'can_import_excel': False,
+        'tenant': tenant or None,
+        'org_name': tenant.name if tenant else 'Mission Tracker',
     }
-
-    # If tenant is set in request, inject theme data
-    if hasattr(request, 'tenant') and request.tenant:
-        context['tenant'] = request.tenant
-        context['org_name'] = request.tenant.name
-        
-        # Get or create theme
-        try:
-            theme = request.tenant.theme
-            context['theme'] = theme
-            context['org_logo'] = theme.logo.url if theme.logo else None
-            context['navbar_title'] = theme.navbar_title or request.tenant.name
-            context['footer_text'] = theme.footer_text
-            context['watermark_text'] = theme.watermark_text
-            context['primary_color'] = theme.primary_color
-            context['secondary_color'] = theme.secondary_color
-            context['success_color'] = theme.success_color
-            context['warning_color'] = theme.warning_color
-            context['danger_color'] = theme.danger_color
-            context['default_pledge_amount'] = float(theme.default_pledge_amount)
-            context['target_amount'] = float(theme.target_amount)
-        except Exception:
-            # Theme doesn't exist yet, use defaults
-            pass
-        
-        # Add permission data if user is authenticated
-        if request.user.is_authenticated:
-            user_role = get_user_org_role(request.user, request.tenant)
-            context['user_role'] = user_role
-            context['is_org_owner'] = is_org_owner(request.user, request.tenant)
-            context['is_org_admin'] = is_org_admin(request.user, request.tenant)
-            context['is_org_staff'] = is_org_staff(request.user, request.tenant)
-            context['is_org_viewer'] = is_org_viewer(request.user, request.tenant)
-            # Permission flags for navbar and views
-            context['can_edit_org'] = is_org_owner(request.user, request.tenant)
-            context['can_manage_staff'] = is_org_admin(request.user, request.tenant)
-            context['can_edit_members'] = is_org_staff(request.user, request.tenant)
-            context['can_record_transactions'] = is_org_admin(request.user, request.tenant)  # Admin/Owner only
-            context['can_access_admin'] = is_org_admin(request.user, request.tenant)
-            context['can_view_admin_log'] = is_org_admin(request.user, request.tenant)
-            context['can_import_excel'] = is_org_admin(request.user, request.tenant)
-
+    # Templates call these on first use; unused values are never computed
+    for key in DEFAULT_THEME_CONTEXT:
+        context[key] = partial(lazy.theme_value, key)
+    for key in PERMISSION_CONTEXT_KEYS:
+        context[key] = partial(lazy.permission_value, key)
     return context
@@ -2,7 +2,9 @@
 Context processor for Bossin Admin Portal.
 Provides common context variables to all admin portal templates.
 """
-from .models import PaymentRequest
+from django.utils.functional import SimpleLazyObject
+
+from .platform_metrics import pending_requests_count
 
 
 def bossin_admin_context(request):
@@ -13,8 +15,8 @@ def bossin_admin_context(request):
     
     # Only add context if user is superuser (for admin portal)
     if request.user.is_authenticated and request.user.is_superuser:
-        # Get pending requests count for navbar badge
-        context['pending_requests_count'] = PaymentRequest.objects.filter(status='pending').count()
+        # Pending requests count for navbar badge; read from the cache only
+        # when a template actually renders the badge
+        context['pending_requests_count'] = SimpleLazyObject(pending_requests_count)
     
     return context
-
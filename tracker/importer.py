@@ -0,0 +1,341 @@
+"""
+Member import engine.
+
+Reads an Excel workbook in openpyxl read-only mode and imports members and
+their paid amounts in chunks. Each chunk resolves existing members and
+imported transactions with one query each and writes with bulk_create /
+bulk_update; the paid totals of the chunk's members are recomputed in the
+same transaction, so a job that fails part-way leaves every committed
+member consistent with its ledger.
+
+Expected columns (first row is a header):
+    Name | Pledge | Paid | Phone | Email | Course | Year
+"""
+
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+import openpyxl
+from django.db import connection, transaction as db_transaction
+from django.db.models import DecimalField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Member, Transaction
+from .search import index_members
+from .stats import invalidate_organization_stats
+from .versions import bump_data_version
+
+
+IMPORT_CHUNK_SIZE = 500
+IMPORT_NOTE_MARKER = 'Imported via Excel'
+MEMBER_IMPORT_FIELDS = ['pledge', 'phone', 'email', 'course', 'year']
+
+
+class ImportResult:
+    """Counters and row errors collected while importing a workbook."""
+
+    def __init__(self):
+        self.rows_processed = 0
+        self.created_count = 0
+        self.updated_count = 0
+        self.transaction_count = 0
+        self.errors = []
+
+    def as_dict(self):
+        return {
+            'rows_processed': self.rows_processed,
+            'created_count': self.created_count,
+            'updated_count': self.updated_count,
+            'transaction_count': self.transaction_count,
+            'errors': list(self.errors),
+            'total_errors': len(self.errors),
+        }
+
+
+def _cell_text(row, index):
+    return str(row[index]).strip() if len(row) > index and row[index] else ''
+
+
+def parse_member_row(idx, row, default_pledge, errors):
+    """
+    Turn a worksheet row into member values, or None for rows without a name.
+    Invalid amounts fall back to defaults and are reported in `errors`.
+    """
+    if not row or not row[0]:
+        return None
+
+    name = str(row[0]).strip()
+    pledge = row[1] if len(row) > 1 else None
+    paid = row[2] if len(row) > 2 else None
+
+    # Pledge
+    try:
+        pledge = Decimal(str(pledge)) if pledge else default_pledge
+    except InvalidOperation:
+        pledge = default_pledge
+        errors.append(f"Row {idx}: Invalid pledge, using default for '{name}'")
+
+    # Paid
+    try:
+        paid = Decimal(str(paid)) if paid else Decimal('0.00')
+    except InvalidOperation:
+        paid = Decimal('0.00')
+        errors.append(f"Row {idx}: Invalid paid value for '{name}', using 0.00")
+
+    return {
+        'idx': idx,
+        'name': name,
+        'paid': paid,
+        'values': {
+            'pledge': pledge,
+            'phone': _cell_text(row, 3) or None,
+            'email': _cell_text(row, 4) or None,
+            'course': _cell_text(row, 5) or None,
+            'year': _cell_text(row, 6) or None,
+        },
+    }
+
+
+def iter_workbook_rows(excel_file):
+    """Yield (row_number, values) for data rows of the active sheet, streaming."""
+    workbook = openpyxl.load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        for idx, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
+            yield idx, row
+    finally:
+        workbook.close()
+
+
+def recalculate_paid_totals(member_ids, batch_size=IMPORT_CHUNK_SIZE):
+    """Set paid_total from the transaction sum for the given members, in batches."""
+    member_ids = list(member_ids)
+    transaction_sum = (
+        Transaction.objects.filter(member=OuterRef('pk'))
+        .order_by()
+        .values('member')
+        .annotate(total=Sum('amount'))
+        .values('total')
+    )
+    paid_total = Coalesce(
+        Subquery(transaction_sum),
+        Value(Decimal('0.00')),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+    now = timezone.now()
+    for start in range(0, len(member_ids), batch_size):
+        Member.objects.filter(pk__in=member_ids[start:start + batch_size]).update(
+            paid_total=paid_total,
+            status=Member.status_expression(paid_total),
+            updated_at=now,
+        )
+
+
+class MemberImporter:
+    """
+    Imports members for one organization.
+
+    Rows are read lazily and processed `chunk_size` at a time so memory use
+    and query count stay flat regardless of sheet size. A name repeated on a
+    later row is reported as a duplicate and the row skipped.
+    """
+
+    def __init__(self, organization, user, update_existing=False,
+                 default_pledge=Decimal('70000.00'), chunk_size=IMPORT_CHUNK_SIZE,
+                 progress_callback=None):
+        self.organization = organization
+        self.user = user
+        self.update_existing = update_existing
+        self.default_pledge = default_pledge if default_pledge is not None else Decimal('70000.00')
+        self.chunk_size = chunk_size
+        self.progress_callback = progress_callback
+        self.result = ImportResult()
+        self.today = date.today()
+        self._seen_names = set()
+
+    def run(self, excel_file):
+        """Import every row of the workbook and return the ImportResult."""
+        chunk = []
+        try:
+            for idx, row in iter_workbook_rows(excel_file):
+                chunk.append((idx, row))
+                if len(chunk) >= self.chunk_size:
+                    self.process_chunk(chunk)
+                    self._report_progress()
+                    chunk = []
+            if chunk:
+                self.process_chunk(chunk)
+        finally:
+            # Chunks committed before a failure are visible too
+            self.finish()
+        self._report_progress()
+        return self.result
+
+    def process_chunk(self, rows):
+        """Parse and persist one chunk of (row_number, values) pairs."""
+        result = self.result
+        parsed = []
+        for idx, row in rows:
+            result.rows_processed += 1
+            try:
+                item = parse_member_row(idx, row, self.default_pledge, result.errors)
+            except Exception as e:
+                result.errors.append(f"Row {idx}: Error processing member '{row[0]}' - {str(e)}")
+                continue
+            if item is not None:
+                parsed.append(item)
+
+        if not parsed:
+            return
+
+        counts = (result.created_count, result.updated_count, result.transaction_count)
+        seen = set(self._seen_names)
+        try:
+            with db_transaction.atomic():
+                self._save_chunk(parsed)
+        except Exception as e:
+            # The chunk was rolled back; drop its counts so totals stay truthful
+            result.created_count, result.updated_count, result.transaction_count = counts
+            self._seen_names = seen
+            result.errors.append(
+                f"Rows {parsed[0]['idx']}-{parsed[-1]['idx']}: Error saving members - {str(e)}"
+            )
+
+    def _report_progress(self):
+        if self.progress_callback is not None:
+            self.progress_callback(self.result)
+
+    def _save_chunk(self, parsed):
+        result = self.result
+        existing = {
+            member.name: member
+            for member in Member.objects.filter(
+                organization=self.organization,
+                name__in={item['name'] for item in parsed},
+            )
+        }
+
+        # Resolve each row to a member, creating or updating in memory first
+        new_members = {}
+        updated_members = {}
+        row_members = []
+        for item in parsed:
+            name = item['name']
+            if name in self._seen_names:
+                result.errors.append(
+                    f"Row {item['idx']}: Member '{name}' appears on an earlier row; row skipped."
+                )
+                continue
+            self._seen_names.add(name)
+            member = existing.get(name)
+            if member is None:
+                member = Member(organization=self.organization, name=name, **item['values'])
+                new_members[name] = member
+                result.created_count += 1
+            elif not self.update_existing:
+                result.errors.append(
+                    f"Row {item['idx']}: Member '{name}' already exists and update is off."
+                )
+                continue
+            else:
+                for field, value in item['values'].items():
+                    setattr(member, field, value)
+                updated_members[name] = member
+                result.updated_count += 1
+            row_members.append((member, item['paid']))
+
+        Member.objects.bulk_create(new_members.values())
+        self._assign_member_pks(new_members)
+        if updated_members:
+            now = timezone.now()
+            for member in updated_members.values():
+                member.status = member.compute_status()
+                member.updated_at = now
+            Member.objects.bulk_update(
+                updated_members.values(), MEMBER_IMPORT_FIELDS + ['status', 'updated_at'],
+            )
+
+        index_members(list(new_members.values()) + list(updated_members.values()))
+        recalculate_paid_totals(self._save_transactions(row_members))
+
+    def _assign_member_pks(self, new_members):
+        """
+        Read back the ids of bulk-created members by name (unique per
+        organization) on databases where bulk_create does not return them.
+        """
+        if not connection.features.can_return_rows_from_bulk_insert and new_members:
+            for pk, name in Member.objects.filter(
+                organization=self.organization, name__in=new_members.keys(),
+            ).values_list('pk', 'name'):
+                new_members[name].pk = pk
+
+    def _save_transactions(self, row_members):
+        """
+        Create or update today's imported payment for each member row.
+        Returns the ids of the members whose payments changed.
+        """
+        paying = [(member, paid) for member, paid in row_members if paid > 0]
+        touched = set()
+        if not paying:
+            return touched
+
+        imported = {}
+        for txn in Transaction.objects.filter(
+            organization=self.organization,
+            member_id__in={member.pk for member, _ in paying},
+            date=self.today,
+            added_by=self.user,
+            note__icontains=IMPORT_NOTE_MARKER,
+        ):
+            # Keep the latest matching transaction per member (default ordering)
+            imported.setdefault(txn.member_id, txn)
+
+        new_transactions = []
+        changed_transactions = {}
+        now = timezone.now()
+        for member, paid in paying:
+            txn = imported.get(member.pk)
+            if txn is None:
+                txn = Transaction(
+                    organization=self.organization,
+                    member=member,
+                    amount=paid,
+                    date=self.today,
+                    added_by=self.user,
+                    note=f"{IMPORT_NOTE_MARKER} on {self.today.isoformat()}",
+                )
+                new_transactions.append(txn)
+                imported[member.pk] = txn
+                self.result.transaction_count += 1
+            elif txn.amount != paid:
+                txn.amount = paid
+                txn.note = f"Updated via Excel on {self.today.isoformat()}"
+                txn.updated_at = now
+                if txn.pk:
+                    changed_transactions[txn.pk] = txn
+                self.result.transaction_count += 1
+            touched.add(member.pk)
+
+        Transaction.objects.bulk_create(new_transactions)
+        if changed_transactions:
+            Transaction.objects.bulk_update(
+                changed_transactions.values(), ['amount', 'note', 'updated_at'],
+            )
+        return touched
+
+    def finish(self):
+        """Drop cached stats and responses; bulk writes bypass the signals."""
+        invalidate_organization_stats(self.organization.pk)
+        bump_data_version(self.organization.pk)
+
+
+def import_members_from_excel(excel_file, organization, user, update_existing=False,
+                              default_pledge=Decimal('70000.00')):
+    """Import a members workbook for an organization and return the ImportResult."""
+    importer = MemberImporter(
+        organization, user,
+        update_existing=update_existing,
+        default_pledge=default_pledge,
+    )
+    return importer.run(excel_file)
@@ -0,0 +1,356 @@
+"""
+Request instrumentation.
+
+RequestMetricsMiddleware counts the SQL queries and database time of every
+request (via connection.execute_wrapper, so it works with DEBUG off) along
+with total time and response size. The numbers are aggregated per resolved
+view name and tenant slug in an in-process registry. Each process publishes
+its totals to the shared Django cache every REQUEST_METRICS_PUBLISH_SECONDS,
+and the Bossin admin metrics page and its JSON endpoint merge what every
+worker published. With a process-local cache (the LocMemCache default) only
+the serving process can be seen, and the page says so.
+
+Per-view query budgets (QUERY_BUDGETS) are checked on every request.
+Requests over budget are logged, and raise QueryBudgetExceeded when
+REQUEST_METRICS_RAISE_ON_BUDGET is set. Tests can also wrap code in
+`query_budget(n)` directly.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+logger = logging.getLogger('tracker')
+
+
+DEFAULT_QUERY_BUDGETS = {
+    'tracker:dashboard': 12,
+    'tracker:daily_collection': 12,
+    'tracker:daily_collection_rows': 8,
+    'tracker:replay_daily_payments': 14,
+    'tracker:admin_log': 15,
+    'tracker:export_excel': 12,
+    'tracker:export_pdf': 12,
+    'api:dashboard_stats': 6,
+    'api:member_list': 6,
+    'api:transaction_list': 6,
+    'api:member_edit_log': 6,
+    'api:bulk_payment': 12,
+    'api:sync': 8,
+    'bossin_admin:users': 10,
+}
+SLOW_REQUEST_LIMIT = 50
+METRICS_CACHE_TIMEOUT = 24 * 60 * 60
+MAX_PUBLISHING_PROCESSES = 64
+PROCESS_LOCAL_CACHES = ('LocMemCache', 'DummyCache')
+
+
+def _metrics_cache_key(name):
+    return f'tracker:request-metrics:{name}'
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def get_query_budget(view_name):
+    """Query budget for a view name such as 'tracker:dashboard', or None."""
+    budgets = dict(DEFAULT_QUERY_BUDGETS)
+    budgets.update(_setting('QUERY_BUDGETS', {}))
+    return budgets.get(view_name)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request or block issued more queries than its budget allows."""
+
+
+class QueryCounter:
+    """connection.execute_wrapper hook that counts queries and their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+@contextmanager
+def query_budget(max_queries, label='block'):
+    """
+    Fail when the wrapped code issues more than `max_queries` queries:
+
+        with query_budget(5, 'dashboard'):
+            client.get('/org/')
+    """
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        yield counter
+    if counter.count > max_queries:
+        raise QueryBudgetExceeded(
+            f'{label} issued {counter.count} queries (budget {max_queries})'
+        )
+
+
+class _ViewStats:
+    __slots__ = (
+        'view', 'tenant', 'requests', 'total_ms', 'max_ms', 'db_ms',
+        'queries', 'max_queries', 'bytes', 'over_budget', 'errors', 'last_seen',
+    )
+
+    def __init__(self, view, tenant):
+        self.view = view
+        self.tenant = tenant
+        self.requests = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.db_ms = 0.0
+        self.queries = 0
+        self.max_queries = 0
+        self.bytes = 0
+        self.over_budget = 0
+        self.errors = 0
+        self.last_seen = None
+
+    def raw(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def merge(self, raw):
+        for name in ('requests', 'total_ms', 'db_ms', 'queries', 'bytes', 'over_budget', 'errors'):
+            setattr(self, name, getattr(self, name) + raw[name])
+        self.max_ms = max(self.max_ms, raw['max_ms'])
+        self.max_queries = max(self.max_queries, raw['max_queries'])
+        self.last_seen = max(self.last_seen or 0, raw['last_seen'] or 0) or None
+
+    def as_dict(self):
+        requests = self.requests or 1
+        return {
+            'view': self.view,
+            'tenant': self.tenant,
+            'requests': self.requests,
+            'avg_ms': round(self.total_ms / requests, 2),
+            'max_ms': round(self.max_ms, 2),
+            'avg_db_ms': round(self.db_ms / requests, 2),
+            'avg_queries': round(self.queries / requests, 2),
+            'max_queries': self.max_queries,
+            'query_budget': get_query_budget(self.view),
+            'over_budget': self.over_budget,
+            'avg_bytes': int(self.bytes / requests),
+            'errors': self.errors,
+            'last_seen': self.last_seen,
+        }
+
+
+def shared_cache_enabled():
+    """False when the default cache lives in each process, so workers cannot see each other."""
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    return not backend.endswith(PROCESS_LOCAL_CACHES)
+
+
+class RequestMetricsRegistry:
+    """
+    Thread-safe per-process aggregates keyed by (view name, tenant slug),
+    published to the shared cache so all workers can be reported together.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._slow = deque(maxlen=SLOW_REQUEST_LIMIT)
+        self.started_at = time.time()
+        self.process = f'{socket.gethostname()}:{os.getpid()}'
+        self._published_at = 0.0
+
+    def record(self, sample):
+        max_keys = _setting('REQUEST_METRICS_MAX_KEYS', 1000)
+        key = (sample['view'], sample['tenant'])
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= max_keys:
+                    key = (sample['view'], None)
+                    stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = _ViewStats(*key)
+            stats.requests += 1
+            stats.total_ms += sample['total_ms']
+            stats.max_ms = max(stats.max_ms, sample['total_ms'])
+            stats.db_ms += sample['db_ms']
+            stats.queries += sample['queries']
+            stats.max_queries = max(stats.max_queries, sample['queries'])
+            stats.bytes += sample['bytes'] or 0
+            stats.over_budget += sample['over_budget']
+            stats.errors += sample['status'] >= 500
+            stats.last_seen = sample['timestamp']
+
+            if sample['total_ms'] >= _setting('REQUEST_METRICS_SLOW_MS', 1000) or sample['over_budget']:
+                self._slow.appendleft(sample)
+
+        if time.time() - self._published_at >= _setting('REQUEST_METRICS_PUBLISH_SECONDS', 10):
+            self.publish()
+
+    def _raw(self):
+        with self._lock:
+            return {
+                'process': self.process,
+                'since': self.started_at,
+                'stats': [stats.raw() for stats in self._stats.values()],
+                'slow_requests': list(self._slow),
+            }
+
+    def publish(self):
+        """Store this process's totals in the shared cache. Never fails a request."""
+        self._published_at = time.time()
+        try:
+            reset_at = cache.get(_metrics_cache_key('reset-at'))
+            if reset_at and reset_at > self.started_at:
+                # Another process cleared the metrics
+                self.reset()
+            cache.set(_metrics_cache_key(f'process:{self.process}'), self._raw(), METRICS_CACHE_TIMEOUT)
+            processes = cache.get(_metrics_cache_key('processes')) or []
+            if self.process not in processes:
+                processes = (processes + [self.process])[-MAX_PUBLISHING_PROCESSES:]
+                cache.set(_metrics_cache_key('processes'), processes, METRICS_CACHE_TIMEOUT)
+        except Exception:
+            logger.exception('Could not publish request metrics')
+
+    def snapshot(self, order_by='total_ms'):
+        """Totals of every process that published to the cache, this one included."""
+        self.publish()
+        local = self._raw()
+        published = [local]
+        try:
+            processes = cache.get(_metrics_cache_key('processes')) or []
+            keys = [_metrics_cache_key(f'process:{process}') for process in processes if process != self.process]
+            published += [raw for raw in cache.get_many(keys).values() if raw]
+        except Exception:
+            logger.exception('Could not read published request metrics')
+
+        merged = {}
+        slow = []
+        for raw in published:
+            for item in raw['stats']:
+                key = (item['view'], item['tenant'])
+                if key not in merged:
+                    merged[key] = _ViewStats(*key)
+                merged[key].merge(item)
+            slow.extend(raw['slow_requests'])
+
+        stats = sorted(merged.values(), key=lambda item: getattr(item, order_by), reverse=True)
+        slow.sort(key=lambda sample: sample['timestamp'], reverse=True)
+        return {
+            'process_id': os.getpid(),
+            'processes': sorted(raw['process'] for raw in published),
+            'shared_cache': shared_cache_enabled(),
+            'since': min(raw['since'] for raw in published),
+            'views': [item.as_dict() for item in stats],
+            'slow_requests': slow[:SLOW_REQUEST_LIMIT],
+        }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+            self.started_at = time.time()
+
+    def reset_all(self):
+        """Clear the metrics of every process; the others drop theirs when they next publish."""
+        self.reset()
+        try:
+            processes = cache.get(_metrics_cache_key('processes')) or []
+            cache.delete_many([_metrics_cache_key(f'process:{process}') for process in processes])
+            cache.set(_metrics_cache_key('reset-at'), self.started_at, None)
+        except Exception:
+            logger.exception('Could not reset published request metrics')
+        self.publish()
+
+
+registry = RequestMetricsRegistry()
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.view_name or match._func_path
+
+
+def _tenant_slug(request):
+    tenant = getattr(request, 'tenant', None)
+    if tenant is not None:
+        return tenant.slug
+    match = getattr(request, 'resolver_match', None)
+    if match is not None:
+        return match.kwargs.get('org_slug')
+    return None
+
+
+def _response_size(response):
+    if response.streaming:
+        length = response.get('Content-Length')
+        return int(length) if length and length.isdigit() else None
+    return len(response.content)
+
+
+class RequestMetricsMiddleware:
+    """
+    Record query count, DB time, total time and response size per request.
+    Adds a Server-Timing header when DEBUG is on.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not _setting('REQUEST_METRICS_ENABLED', True):
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        view = _view_name(request)
+        budget = get_query_budget(view)
+        over_budget = budget is not None and counter.count > budget
+        sample = {
+            'view': view,
+            'tenant': _tenant_slug(request),
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': counter.count,
+            'db_ms': round(counter.duration * 1000, 2),
+            'total_ms': round(total_ms, 2),
+            'bytes': _response_size(response),
+            'over_budget': over_budget,
+            'timestamp': time.time(),
+        }
+        registry.record(sample)
+
+        if settings.DEBUG:
+            response['Server-Timing'] = (
+                f'db;dur={sample["db_ms"]};desc="{counter.count} queries", '
+                f'total;dur={sample["total_ms"]}'
+            )
+
+        if over_budget:
+            message = f'{view} issued {counter.count} queries (budget {budget}) for {request.path}'
+            if _setting('REQUEST_METRICS_RAISE_ON_BUDGET', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
@@ -0,0 +1,191 @@
+"""
+Background member import jobs.
+
+Uploads are stored as ImportJob rows and processed off the request path,
+either by a small in-process thread pool (IMPORT_JOBS_RUN_IN_THREADS) or by
+the `run_import_jobs` management command acting as a worker.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import close_old_connections, transaction as db_transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .importer import MemberImporter
+from .models import ImportJob
+
+logger = logging.getLogger('tracker')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'IMPORT_JOB_WORKERS', 2),
+                thread_name_prefix='import-job',
+            )
+        return _executor
+
+
+def create_import_job(organization, user, excel_file, update_existing=False, default_pledge=None):
+    """Store an uploaded workbook as a pending ImportJob and schedule it."""
+    job = ImportJob.objects.create(
+        organization=organization,
+        created_by=user,
+        file=excel_file,
+        original_filename=getattr(excel_file, 'name', '')[:255],
+        update_existing=update_existing,
+        default_pledge=default_pledge if default_pledge is not None else Decimal('70000.00'),
+    )
+    if getattr(settings, 'IMPORT_JOBS_RUN_IN_THREADS', True):
+        db_transaction.on_commit(lambda: _get_executor().submit(_run_in_thread, job.pk))
+    return job
+
+
+def _run_in_thread(job_id):
+    close_old_connections()
+    try:
+        run_import_job(job_id)
+    except Exception:
+        logger.exception('Import job %s crashed', job_id)
+    finally:
+        close_old_connections()
+
+
+def claim_import_job(job_id):
+    """Mark a pending job as running; returns False if another worker took it."""
+    now = timezone.now()
+    return ImportJob.objects.filter(
+        pk=job_id, status=ImportJob.STATUS_PENDING,
+    ).update(status=ImportJob.STATUS_RUNNING, started_at=now, heartbeat_at=now) == 1
+
+
+def run_import_job(job_id):
+    """Process one pending import job. Returns the job, or None if it was not claimable."""
+    if not claim_import_job(job_id):
+        return None
+
+    job = ImportJob.objects.select_related('organization', 'created_by').get(pk=job_id)
+
+    def save_progress(result):
+        ImportJob.objects.filter(pk=job.pk).update(
+            rows_processed=result.rows_processed,
+            created_count=result.created_count,
+            updated_count=result.updated_count,
+            transaction_count=result.transaction_count,
+            error_count=len(result.errors),
+            heartbeat_at=timezone.now(),
+        )
+
+    importer = MemberImporter(
+        job.organization,
+        job.created_by,
+        update_existing=job.update_existing,
+        default_pledge=job.default_pledge,
+        progress_callback=save_progress,
+    )
+    try:
+        with job.file.open('rb') as excel_file:
+            importer.run(excel_file)
+        job.status = ImportJob.STATUS_COMPLETED
+    except Exception as e:
+        logger.exception('Import job %s failed', job.pk)
+        job.status = ImportJob.STATUS_FAILED
+        job.failure_reason = str(e)
+    finally:
+        # The workbook holds member names, phones and emails; keep it no longer than the job
+        delete_import_file(job)
+
+    result = importer.result
+    job.rows_processed = result.rows_processed
+    job.created_count = result.created_count
+    job.updated_count = result.updated_count
+    job.transaction_count = result.transaction_count
+    job.errors = result.errors
+    job.error_count = len(result.errors)
+    job.finished_at = timezone.now()
+    job.save()
+    return job
+
+
+def delete_import_file(job):
+    """Remove a job's uploaded workbook from storage and clear the file field."""
+    if not job.file:
+        return
+    try:
+        job.file.delete(save=False)
+    except OSError:
+        logger.exception('Could not delete the upload of import job %s', job.pk)
+
+
+def run_pending_import_jobs(limit=None):
+    """Process pending jobs oldest first. Returns the number of jobs run."""
+    job_ids = ImportJob.objects.filter(
+        status=ImportJob.STATUS_PENDING,
+    ).order_by('created_at').values_list('pk', flat=True)
+    if limit:
+        job_ids = job_ids[:limit]
+
+    processed = 0
+    for job_id in list(job_ids):
+        if run_import_job(job_id) is not None:
+            processed += 1
+    return processed
+
+
+def requeue_stale_import_jobs(older_than):
+    """
+    Return running jobs whose heartbeat is older than `older_than` (e.g.
+    after a worker restart) to pending. Long imports that are still saving
+    progress are left alone. A stale job whose upload is already gone cannot
+    be run again and is marked failed. Returns the number of jobs requeued.
+    """
+    now = timezone.now()
+    cutoff = now - older_than
+    stale = ImportJob.objects.filter(status=ImportJob.STATUS_RUNNING).filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff),
+    )
+    requeued = 0
+    for job in stale:
+        # Re-check in the UPDATE: the job may have beaten since it was read
+        still_stale = stale.filter(pk=job.pk)
+        if job.file and job.file.storage.exists(job.file.name):
+            requeued += still_stale.update(
+                status=ImportJob.STATUS_PENDING, started_at=None, heartbeat_at=None,
+            )
+        else:
+            still_stale.update(
+                status=ImportJob.STATUS_FAILED,
+                failure_reason='The import stopped and its upload is no longer available; upload the file again.',
+                finished_at=now,
+            )
+    return requeued
+
+
+def import_job_progress(job):
+    """Serializable progress snapshot for polling endpoints."""
+    return {
+        'id': job.pk,
+        'status': job.status,
+        'is_finished': job.is_finished,
+        'original_filename': job.original_filename,
+        'update_existing': job.update_existing,
+        'rows_processed': job.rows_processed,
+        'created_count': job.created_count,
+        'updated_count': job.updated_count,
+        'transaction_count': job.transaction_count,
+        'error_count': job.error_count,
+        'failure_reason': job.failure_reason,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    }
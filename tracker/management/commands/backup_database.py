@@ -56,6 +56,11 @@ class Command(BaseCommand):
             self.stdout.write(
                 self.style.ERROR(f'Unsupported database engine: {db_engine}')
             )
+            return
+
+        # Keep the Bossin dashboard's backup health current
+        from tracker.platform_metrics import refresh_backup_metrics
+        refresh_backup_metrics()
 
     def backup_sqlite(self, db_config, output_dir, options):
         """Backup SQLite database."""
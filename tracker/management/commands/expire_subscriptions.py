@@ -0,0 +1,36 @@
+"""
+Mark organizations whose trial or subscription has ended as NOT_SUBSCRIBED.
+
+Request handling never writes subscription state; run this on a schedule
+(e.g. every few minutes from cron) so the stored status catches up:
+
+    python manage.py expire_subscriptions
+    python manage.py expire_subscriptions --dry-run
+"""
+from django.core.management.base import BaseCommand
+
+from tracker.subscriptions import expire_subscriptions, expired_organizations
+
+
+class Command(BaseCommand):
+    help = 'Flip organizations with a lapsed trial or subscription to NOT_SUBSCRIBED'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List the organizations that would be expired without changing them',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            slugs = list(expired_organizations().values_list('slug', flat=True))
+            for slug in slugs:
+                self.stdout.write(f'  {slug}')
+            self.stdout.write(f'{len(slugs)} organizations would be expired')
+            return
+
+        expired = expire_subscriptions()
+        for _, slug in expired:
+            self.stdout.write(f'  {slug}')
+        self.stdout.write(self.style.SUCCESS(f'Expired {len(expired)} organizations'))
@@ -64,7 +64,7 @@ class Command(BaseCommand):
                             except:
                                 member.paid_total = Decimal('0.00')
                         
-                        member.save()
+                        member.save(update_fields=['pledge', 'paid_total', 'updated_at'])
                         fixed_count += 1
                         self.stdout.write(f'Fixed member: {name}')
                         
@@ -1,7 +1,22 @@
-from django.core.management.base import BaseCommand
-from django.db.models import Sum
+"""
+Verify and reconcile member paid_total values against their transactions.
+
+Transactions maintain paid_total (and the stored status) incrementally, so
+this command is the safety net that finds and repairs any drift (e.g. after
+raw SQL edits or bulk deletes that bypass Transaction.delete()).
+
+Usage: python manage.py fix_member_totals [--dry-run] [--organization slug]
+"""
 from decimal import Decimal
-from tracker.models import Member, Transaction
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import DecimalField, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+from tracker.importer import recalculate_paid_totals
+from tracker.models import Member, Organization
+from tracker.stats import invalidate_organization_stats
+from tracker.versions import bump_data_version
 
 
 class Command(BaseCommand):
@@ -13,58 +28,89 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what would be changed without making changes',
         )
+        parser.add_argument(
+            '--organization',
+            type=str,
+            help='Only check members of the organization with this slug',
+        )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
-        
+
         if dry_run:
             self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be made'))
-        
+
         self.stdout.write('Starting member totals fix...')
-        
+
+        members = Member.objects.all()
+        if options['organization']:
+            try:
+                organization = Organization.objects.get(slug=options['organization'])
+            except Organization.DoesNotExist:
+                raise CommandError(f'Organization "{options["organization"]}" does not exist')
+            members = members.filter(organization=organization)
+
+        self.stdout.write(f'Processing {members.count()} members...')
+
+        # One grouped query finds every member whose stored total has drifted
+        drifted = (
+            members.annotate(
+                transaction_total=Coalesce(
+                    Sum('transaction__amount'),
+                    Value(Decimal('0.00'), output_field=DecimalField(max_digits=12, decimal_places=2)),
+                )
+            )
+            .exclude(paid_total=F('transaction_total'))
+            .values_list('id', 'name', 'organization_id', 'paid_total', 'transaction_total')
+            .order_by('organization_id', 'name')
+        )
+
         fixed_count = 0
         error_count = 0
-        
-        # Get all members
-        members = Member.objects.all()
-        total_members = members.count()
-        
-        self.stdout.write(f'Processing {total_members} members...')
-        
-        for member in members:
+        touched_organizations = set()
+
+        for member_id, name, organization_id, current_paid, transaction_total in drifted:
+            transaction_total = Decimal(transaction_total).quantize(Decimal('0.01'))
             try:
-                # Calculate total from transactions
-                transaction_total = member.transaction_set.aggregate(
-                    total=Sum('amount')
-                )['total'] or Decimal('0.00')
-                
-                # Check if current paid_total matches transaction total
-                current_paid = member.paid_total or Decimal('0.00')
-                
-                if current_paid != transaction_total:
-                    if dry_run:
-                        self.stdout.write(
-                            f'Would fix {member.name}: {current_paid} → {transaction_total}'
-                        )
-                    else:
-                        member.paid_total = transaction_total
-                        member.save()
-                        self.stdout.write(
-                            self.style.SUCCESS(
-                                f'Fixed {member.name}: {current_paid} → {transaction_total}'
-                            )
-                        )
-                    fixed_count += 1
+                if dry_run:
+                    self.stdout.write(
+                        f'Would fix {name}: {current_paid} → {transaction_total}'
+                    )
                 else:
-                    if not dry_run:
-                        self.stdout.write(f'✓ {member.name}: {current_paid} (correct)')
-                        
+                    # Sum inside the UPDATE so a payment recorded since the
+                    # scan above is not overwritten by a stale total
+                    recalculate_paid_totals([member_id])
+                    touched_organizations.add(organization_id)
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f'Fixed {name}: {current_paid} → {transaction_total}'
+                        )
+                    )
+                fixed_count += 1
             except Exception as e:
                 error_count += 1
                 self.stdout.write(
-                    self.style.ERROR(f'Error processing {member.name}: {str(e)}')
+                    self.style.ERROR(f'Error processing {name}: {str(e)}')
+                )
+
+        # Stored statuses that no longer match paid_total/pledge
+        stale_status = members.exclude(status=Member.status_expression())
+        stale_count = stale_status.count()
+        if stale_count:
+            if dry_run:
+                self.stdout.write(f'Would fix the status of {stale_count} members')
+            else:
+                touched_organizations.update(
+                    stale_status.values_list('organization_id', flat=True).distinct()
                 )
-        
+                stale_status.update(status=Member.status_expression())
+                self.stdout.write(self.style.SUCCESS(f'Fixed the status of {stale_count} members'))
+
+        # Queryset updates bypass signals, so drop cached stats explicitly
+        for organization_id in touched_organizations:
+            invalidate_organization_stats(organization_id)
+            bump_data_version(organization_id)
+
         # Summary
         self.stdout.write('\n' + '='*50)
         if dry_run:
@@ -75,10 +121,10 @@ class Command(BaseCommand):
             self.stdout.write(
                 self.style.SUCCESS(f'FIXED: {fixed_count} members')
             )
-        
+
         if error_count > 0:
             self.stdout.write(
                 self.style.ERROR(f'ERRORS: {error_count} members could not be processed')
             )
-        
-        self.stdout.write('Member totals fix completed!') 
\ No newline at end of file
+
+        self.stdout.write('Member totals fix completed!')
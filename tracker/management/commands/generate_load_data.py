@@ -0,0 +1,215 @@
+"""
+Generate large synthetic tenants for load testing and benchmarks.
+
+Usage:
+    python manage.py generate_load_data --organizations 2 --members 50000
+    python manage.py generate_load_data --members 5000 --transactions 4 --prefix bench --clear
+
+Rows are written with bulk inserts in batches, and member paid totals are
+computed in memory so they match the generated transactions exactly.
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction as db_transaction
+from django.utils import timezone
+
+from tracker.models import (
+    Member,
+    MemberEditLog,
+    Organization,
+    OrganizationTheme,
+    OrganizationUser,
+    Transaction,
+)
+from tracker.search import index_members
+from tracker.stats import invalidate_organization_stats
+from tracker.versions import bump_data_version
+
+
+FIRST_NAMES = [
+    'John', 'Sarah', 'Michael', 'Grace', 'David', 'Elizabeth', 'Peter', 'Mary',
+    'James', 'Anna', 'Robert', 'Helen', 'Thomas', 'Catherine', 'Daniel', 'Ruth',
+    'Joseph', 'Esther', 'Andrew', 'Dorothy', 'Neema', 'Baraka', 'Upendo', 'Imani',
+]
+LAST_NAMES = [
+    'Mwambene', 'Kimambo', 'Mwakasege', 'Mwakatobe', 'Massawe', 'Mushi',
+    'Shayo', 'Lyimo', 'Minja', 'Mrema', 'Temba', 'Kweka', 'Swai', 'Urio',
+]
+COURSES = [
+    'Computer Science', 'Business Administration', 'Engineering', 'Medicine',
+    'Law', 'Education', 'Agriculture', 'Economics', 'Psychology', 'Sociology',
+]
+YEARS = ['1st Year', '2nd Year', '3rd Year', '4th Year', 'Graduate']
+PLEDGES = [Decimal(amount) for amount in (50000, 70000, 80000, 100000, 120000, 150000)]
+NOTES = ['Monthly contribution', 'Special offering', 'Mission pledge payment', 'Second installment']
+EDITED_FIELDS = ['phone', 'course', 'year', 'pledge']
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic organizations with members, transactions, staff and edit logs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--organizations', type=int, default=1, help='Number of organizations (default: 1)')
+        parser.add_argument('--members', type=int, default=1000, help='Members per organization (default: 1000)')
+        parser.add_argument(
+            '--transactions',
+            type=int,
+            default=3,
+            help='Maximum transactions per member; each member gets 0..N (default: 3)',
+        )
+        parser.add_argument('--staff', type=int, default=3, help='Staff users per organization (default: 3)')
+        parser.add_argument(
+            '--edit-logs',
+            type=float,
+            default=0.5,
+            help='Average member edit log entries per member (default: 0.5)',
+        )
+        parser.add_argument('--days', type=int, default=180, help='Spread transactions over this many days (default: 180)')
+        parser.add_argument('--prefix', type=str, default='loadtest', help='Slug/username prefix (default: loadtest)')
+        parser.add_argument('--password', type=str, default='loadtest123', help='Password for generated users')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Members per insert batch (default: 2000)')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for repeatable data')
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete organizations and users created earlier with the same prefix first',
+        )
+
+    def handle(self, *args, **options):
+        if options['organizations'] < 1 or options['members'] < 0:
+            raise CommandError('--organizations must be at least 1 and --members cannot be negative.')
+
+        self.rng = random.Random(options['seed'])
+        prefix = options['prefix']
+
+        if options['clear']:
+            self.clear(prefix)
+
+        for index in range(1, options['organizations'] + 1):
+            slug = f'{prefix}-{index}'
+            if Organization.objects.filter(slug=slug).exists():
+                raise CommandError(f'Organization "{slug}" already exists. Use --clear or another --prefix.')
+
+            started = timezone.now()
+            organization, users = self.create_organization(slug, options)
+            counts = self.create_members(organization, users, options)
+            invalidate_organization_stats(organization.pk)
+            bump_data_version(organization.pk)
+
+            elapsed = (timezone.now() - started).total_seconds()
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ {slug}: {counts["members"]:,} members, {counts["transactions"]:,} transactions, '
+                f'{counts["edit_logs"]:,} edit logs, {len(users)} users ({elapsed:.1f}s)'
+            ))
+
+        self.stdout.write(f'Log in as {prefix}-1-owner / {options["password"]}')
+
+    def clear(self, prefix):
+        organizations = Organization.objects.filter(slug__startswith=f'{prefix}-')
+        count = organizations.count()
+        organizations.delete()
+        User.objects.filter(username__startswith=f'{prefix}-').delete()
+        self.stdout.write(self.style.WARNING(f'Removed {count} existing {prefix} organizations'))
+
+    def create_organization(self, slug, options):
+        organization = Organization.objects.create(
+            name=f'Load Test {slug}',
+            slug=slug,
+            subscription_status='SUBSCRIBED',
+            subscription_expires_at=timezone.now() + timedelta(days=365),
+        )
+        OrganizationTheme.objects.create(organization=organization, watermark_text='Bossin')
+
+        roles = ['owner'] + ['staff'] * options['staff']
+        if options['staff']:
+            roles[1] = 'admin'
+
+        users = []
+        for number, role in enumerate(roles):
+            username = f'{slug}-owner' if role == 'owner' else f'{slug}-{role}-{number}'
+            user = User.objects.create_user(username=username, password=options['password'])
+            OrganizationUser.objects.create(organization=organization, user=user, role=role, is_active=True)
+            users.append(user)
+        return organization, users
+
+    def create_members(self, organization, users, options):
+        counts = {'members': 0, 'transactions': 0, 'edit_logs': 0}
+        total = options['members']
+        batch_size = max(options['batch_size'], 1)
+        today = date.today()
+
+        for start in range(0, total, batch_size):
+            stop = min(start + batch_size, total)
+            with db_transaction.atomic():
+                payments = []
+                members = []
+                for number in range(start, stop):
+                    pledge = self.rng.choice(PLEDGES)
+                    amounts = self.payment_amounts(pledge, options['transactions'])
+                    payments.append(amounts)
+                    members.append(Member(
+                        organization=organization,
+                        name=f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)} {number:06d}',
+                        pledge=pledge,
+                        paid_total=sum(amounts, Decimal('0.00')),
+                        phone=f'07{self.rng.randint(10000000, 99999999)}',
+                        email=f'member{number}@{organization.slug}.example.com' if number % 3 else None,
+                        course=self.rng.choice(COURSES),
+                        year=self.rng.choice(YEARS),
+                        is_active=number % 50 != 0,
+                    ))
+                    members[-1].status = members[-1].compute_status()
+                members = Member.objects.bulk_create(members)
+                if not connection.features.can_return_rows_from_bulk_insert:
+                    # bulk_create returns no ids on MySQL; read them back by name (unique per organization)
+                    ids = dict(Member.objects.filter(
+                        organization=organization, name__in=[member.name for member in members],
+                    ).values_list('name', 'pk'))
+                    for member in members:
+                        member.pk = ids[member.name]
+                index_members(members)
+
+                transactions = []
+                edit_logs = []
+                for member, amounts in zip(members, payments):
+                    for amount in amounts:
+                        transactions.append(Transaction(
+                            organization=organization,
+                            member=member,
+                            amount=amount,
+                            date=today - timedelta(days=self.rng.randint(0, options['days'])),
+                            added_by=self.rng.choice(users),
+                            note=self.rng.choice(NOTES),
+                        ))
+                    edits = int(options['edit_logs']) + (self.rng.random() < options['edit_logs'] % 1)
+                    for _ in range(edits):
+                        field = self.rng.choice(EDITED_FIELDS)
+                        edit_logs.append(MemberEditLog(
+                            organization=organization,
+                            member=member,
+                            field_changed=field,
+                            before_value='',
+                            after_value=str(getattr(member, field) or ''),
+                            edited_by=self.rng.choice(users),
+                        ))
+                Transaction.objects.bulk_create(transactions, batch_size=5000)
+                MemberEditLog.objects.bulk_create(edit_logs, batch_size=5000)
+
+            counts['members'] += len(members)
+            counts['transactions'] += len(transactions)
+            counts['edit_logs'] += len(edit_logs)
+            self.stdout.write(f'  {organization.slug}: {stop:,}/{total:,} members')
+        return counts
+
+    def payment_amounts(self, pledge, max_transactions):
+        """0..N partial payments; roughly one member in ten overpays."""
+        count = self.rng.randint(0, max_transactions)
+        if not count:
+            return []
+        ceiling = pledge * Decimal('1.2') if self.rng.random() < 0.1 else pledge
+        share = int(ceiling / count)
+        return [Decimal(self.rng.randint(share // 4, share) // 500 * 500 or 500) for _ in range(count)]
@@ -0,0 +1,28 @@
+"""
+Remove old cached report files.
+
+Usage:
+    python manage.py prune_report_cache              # older than 7 days
+    python manage.py prune_report_cache --days 1
+"""
+from django.core.management.base import BaseCommand
+
+from tracker.reports import prune_report_cache, report_cache_dir
+
+
+class Command(BaseCommand):
+    help = 'Delete cached PDF reports that have not been regenerated recently'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=7,
+            help='Delete cached reports older than this many days (default: 7)',
+        )
+
+    def handle(self, *args, **options):
+        removed = prune_report_cache(options['days'] * 24 * 60 * 60)
+        self.stdout.write(self.style.SUCCESS(
+            f'Removed {removed} cached reports from {report_cache_dir()}'
+        ))
@@ -0,0 +1,22 @@
+"""
+Remove old sync tombstones.
+
+Usage:
+    python manage.py prune_sync_tombstones
+
+Clients whose sync token is older than SYNC_TOMBSTONE_DAYS are told to
+reload, so tombstones past that window are no longer needed.
+"""
+from django.core.management.base import BaseCommand
+
+from tracker.sync import prune_tombstones, tombstone_retention
+
+
+class Command(BaseCommand):
+    help = 'Delete member/transaction tombstones older than the sync retention window'
+
+    def handle(self, *args, **options):
+        removed = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(
+            f'Removed {removed} tombstones older than {tombstone_retention().days} days'
+        ))
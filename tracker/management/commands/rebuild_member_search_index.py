@@ -0,0 +1,36 @@
+"""
+Rebuild the member search index (tracker/search.py).
+
+Members are re-indexed on save and by the importer, so this is only needed
+after raw SQL edits or after changing MEMBER_SEARCH_FUZZY.
+
+Usage:
+    python manage.py rebuild_member_search_index
+    python manage.py rebuild_member_search_index --organization my-org
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.models import Organization
+from tracker.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the member search tokens for one or all organizations'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization',
+            type=str,
+            help='Only rebuild the index of the organization with this slug',
+        )
+
+    def handle(self, *args, **options):
+        organization = None
+        if options['organization']:
+            try:
+                organization = Organization.objects.get(slug=options['organization'])
+            except Organization.DoesNotExist:
+                raise CommandError(f'Organization "{options["organization"]}" does not exist')
+
+        count = rebuild_search_index(organization)
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} members'))
@@ -0,0 +1,25 @@
+"""
+Rebuild the Bossin Admin dashboard metrics snapshot.
+
+Signals keep the organization and payment figures current; run this
+periodically (e.g. from cron) to pick up backups made outside the app and
+to repair the snapshot after bulk data changes.
+
+Usage:
+    python manage.py rebuild_platform_metrics
+"""
+from django.core.management.base import BaseCommand
+
+from tracker.platform_metrics import rebuild_platform_metrics
+
+
+class Command(BaseCommand):
+    help = 'Recompute the platform metrics snapshot shown on the Bossin Admin dashboard'
+
+    def handle(self, *args, **options):
+        snapshot = rebuild_platform_metrics()
+        self.stdout.write(self.style.SUCCESS(
+            f'Platform metrics rebuilt: {snapshot.total_orgs} organizations, '
+            f'{snapshot.pending_requests} pending requests, '
+            f'TZS {snapshot.total_revenue:,.2f} revenue'
+        ))
@@ -0,0 +1,304 @@
+"""
+Repeatable load benchmarks for the main pages and API endpoints.
+
+Usage:
+    python manage.py generate_load_data --members 50000 --seed 1
+    python manage.py run_benchmarks --organization loadtest-1 --output bench.json
+    python manage.py run_benchmarks --organization loadtest-1 --baseline bench.json
+
+Each scenario is requested --repeat times through the Django test client and
+records wall time, query count, query time and response size. Write
+scenarios (import, bulk payment) run inside a transaction that is rolled
+back, so the data set is the same on every run. With --baseline, scenarios
+that got slower or issue more queries than the baseline are reported.
+"""
+import io
+import json
+import statistics
+import time
+from datetime import datetime
+
+import openpyxl
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction as db_transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from tracker.models import Member, MemberEditLog, Organization, OrganizationUser, Transaction
+from tracker.stats import invalidate_organization_stats
+
+
+class Scenario:
+    """One benchmarked request."""
+
+    def __init__(self, name, client, method, path, data=None, writes=False, **extra):
+        self.name = name
+        self.client = client
+        self.method = method
+        self.path = path
+        self.data = data
+        self.writes = writes
+        self.extra = extra
+
+
+class Command(BaseCommand):
+    help = 'Time and count queries for dashboard, daily collection, logs, exports, imports and API endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization',
+            type=str,
+            default=None,
+            help='Organization slug (default: the organization with the most members)',
+        )
+        parser.add_argument('--user', type=str, default=None, help='Username to run as (default: the owner)')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per scenario (default: 3)')
+        parser.add_argument(
+            '--only',
+            type=str,
+            default='',
+            help='Comma-separated scenario names to run (default: all)',
+        )
+        parser.add_argument('--import-rows', type=int, default=1000, help='Rows in the import workbook (default: 1000)')
+        parser.add_argument('--bulk-payments', type=int, default=200, help='Payments per bulk request (default: 200)')
+        parser.add_argument(
+            '--cold',
+            action='store_true',
+            help='Clear the cache before every run instead of only before the first',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default='benchmark_results.json',
+            help='Where to write the JSON results (default: benchmark_results.json)',
+        )
+        parser.add_argument('--baseline', type=str, default=None, help='Earlier results file to compare against')
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=20.0,
+            help='Allowed median time increase over the baseline, in percent (default: 20)',
+        )
+
+    def handle(self, *args, **options):
+        organization = self.get_organization(options['organization'])
+        user = self.get_user(organization, options['user'])
+
+        web = Client()
+        web.force_login(user)
+        api = APIClient()
+        api.force_authenticate(user)
+
+        scenarios = self.build_scenarios(organization, web, api, options)
+        only = {name.strip() for name in options['only'].split(',') if name.strip()}
+        if only:
+            unknown = only - {scenario.name for scenario in scenarios}
+            if unknown:
+                raise CommandError(f'Unknown scenarios: {", ".join(sorted(unknown))}')
+            scenarios = [scenario for scenario in scenarios if scenario.name in only]
+
+        results = []
+        for scenario in scenarios:
+            result = self.run_scenario(scenario, organization, options)
+            results.append(result)
+            self.stdout.write(
+                f'{scenario.name:<28} {result["status"]:>3}  '
+                f'median {result["median_ms"]:>9.1f} ms  '
+                f'queries {result["queries_first"]:>4}/{result["queries_warm"]:<4}  '
+                f'{result["bytes"]:>10,} bytes'
+            )
+
+        report = {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'database': connection.vendor,
+            'organization': organization.slug,
+            'members': Member.objects.filter(organization=organization).count(),
+            'transactions': Transaction.objects.filter(organization=organization).count(),
+            'edit_logs': MemberEditLog.objects.filter(organization=organization).count(),
+            'repeat': options['repeat'],
+            'results': results,
+        }
+        with open(options['output'], 'w') as handle:
+            json.dump(report, handle, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+
+        if options['baseline']:
+            self.compare(results, options['baseline'], options['tolerance'])
+
+    def get_organization(self, slug):
+        if slug:
+            try:
+                return Organization.objects.get(slug=slug)
+            except Organization.DoesNotExist:
+                raise CommandError(f'Organization "{slug}" not found.')
+
+        organization = Organization.objects.annotate(
+            member_count=Count('members'),
+        ).order_by('-member_count').first()
+        if organization is None:
+            raise CommandError('No organizations found; run generate_load_data first.')
+        return organization
+
+    def get_user(self, organization, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f'User "{username}" not found.')
+
+        owner = OrganizationUser.objects.filter(
+            organization=organization, role='owner', is_active=True,
+        ).select_related('user').first()
+        if owner is None:
+            raise CommandError(f'Organization "{organization.slug}" has no owner; pass --user.')
+        return owner.user
+
+    def build_scenarios(self, organization, web, api, options):
+        slug = organization.slug
+        api_root = f'/api/v1/orgs/{slug}'
+        sample_member = Member.objects.filter(organization=organization).order_by('id').first()
+        search_term = sample_member.name.split()[0] if sample_member else 'a'
+
+        payment_ids = list(
+            Member.objects.filter(organization=organization, is_active=True)
+            .order_by('id').values_list('id', flat=True)[:options['bulk_payments']]
+        )
+        bulk_payload = {'payments': [{'member_id': member_id, 'payment_amount': '1000'} for member_id in payment_ids]}
+        import_workbook = self.import_workbook(options['import_rows'])
+
+        return [
+            Scenario('dashboard', web, 'get', f'/{slug}/'),
+            Scenario('dashboard_search', web, 'get', f'/{slug}/', {'search': search_term}),
+            Scenario('dashboard_filter', web, 'get', f'/{slug}/', {'filter': 'incomplete'}),
+            Scenario('daily_collection', web, 'get', f'/{slug}/daily-collection/'),
+            Scenario('admin_log', web, 'get', f'/{slug}/admin-log/'),
+            Scenario('export_excel', web, 'get', f'/{slug}/export/excel/'),
+            Scenario('export_pdf', web, 'get', f'/{slug}/export/pdf/'),
+            Scenario('api_dashboard_stats', api, 'get', f'{api_root}/dashboard/stats/'),
+            Scenario('api_org_detail', api, 'get', f'{api_root}/'),
+            Scenario('api_subscription', api, 'get', f'{api_root}/subscription/'),
+            Scenario('api_members', api, 'get', f'{api_root}/members/'),
+            Scenario('api_members_search', api, 'get', f'{api_root}/members/', {'search': search_term}),
+            Scenario('api_members_cursor', api, 'get', f'{api_root}/members/', {'cursor': '', 'page_size': 100}),
+            Scenario('api_transactions', api, 'get', f'{api_root}/transactions/'),
+            Scenario('api_transactions_cursor', api, 'get', f'{api_root}/transactions/', {'cursor': '', 'page_size': 100}),
+            Scenario('api_member_edit_log', api, 'get', f'{api_root}/audit/member-edits/'),
+            Scenario('api_export_members', api, 'get', f'{api_root}/export/members/excel/'),
+            Scenario('api_export_transactions', api, 'get', f'{api_root}/export/transactions/excel/'),
+            Scenario('api_export_pdf', api, 'get', f'{api_root}/export/report/pdf/'),
+            Scenario(
+                'api_bulk_payment', api, 'post', f'{api_root}/transactions/bulk/', bulk_payload,
+                writes=True, format='json',
+            ),
+            Scenario(
+                'api_import_excel', api, 'post', f'{api_root}/import/members/excel/',
+                lambda: {
+                    'excel_file': SimpleUploadedFile('benchmark.xlsx', import_workbook),
+                    'update_existing': 'true',
+                    'async': 'false',
+                },
+                writes=True, format='multipart',
+            ),
+        ]
+
+    def import_workbook(self, rows):
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet('Members')
+        ws.append(['Name', 'Pledge', 'Paid', 'Phone', 'Email', 'Course', 'Year'])
+        for number in range(rows):
+            ws.append([f'Benchmark Import {number:06d}', 70000, 5000 if number % 2 else None,
+                       f'0755{number:06d}', None, 'Benchmarking', '1st Year'])
+        output = io.BytesIO()
+        wb.save(output)
+        return output.getvalue()
+
+    def run_scenario(self, scenario, organization, options):
+        timings = []
+        query_counts = []
+        query_times = []
+        status = None
+        size = 0
+
+        for run in range(max(options['repeat'], 1)):
+            if options['cold'] or run == 0:
+                cache.clear()
+            data = scenario.data() if callable(scenario.data) else scenario.data
+
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                if scenario.writes:
+                    with db_transaction.atomic():
+                        response = self.request(scenario, data)
+                        size = self.consume(response)
+                        db_transaction.set_rollback(True)
+                else:
+                    response = self.request(scenario, data)
+                    size = self.consume(response)
+                elapsed = time.perf_counter() - started
+
+            if scenario.writes:
+                # Writes were rolled back, but they invalidated caches on the way
+                invalidate_organization_stats(organization.pk)
+
+            status = response.status_code
+            timings.append(elapsed * 1000)
+            query_counts.append(len(queries))
+            query_times.append(sum(float(query.get('time') or 0) for query in queries.captured_queries) * 1000)
+
+        return {
+            'name': scenario.name,
+            'method': scenario.method.upper(),
+            'path': scenario.path,
+            'status': status,
+            'bytes': size,
+            'runs': len(timings),
+            'median_ms': round(statistics.median(timings), 2),
+            'min_ms': round(min(timings), 2),
+            'max_ms': round(max(timings), 2),
+            'queries_first': query_counts[0],
+            'queries_warm': query_counts[-1],
+            'query_ms_median': round(statistics.median(query_times), 2),
+        }
+
+    def request(self, scenario, data):
+        method = getattr(scenario.client, scenario.method)
+        return method(scenario.path, data, **scenario.extra)
+
+    def consume(self, response):
+        if response.streaming:
+            return sum(len(chunk) for chunk in response.streaming_content)
+        return len(response.content)
+
+    def compare(self, results, baseline_path, tolerance):
+        try:
+            with open(baseline_path) as handle:
+                baseline = {result['name']: result for result in json.load(handle)['results']}
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f'Could not read baseline {baseline_path}: {e}')
+
+        regressions = []
+        for result in results:
+            previous = baseline.get(result['name'])
+            if not previous:
+                continue
+            if result['queries_warm'] > previous['queries_warm']:
+                regressions.append(
+                    f'{result["name"]}: queries {previous["queries_warm"]} -> {result["queries_warm"]}'
+                )
+            limit = previous['median_ms'] * (1 + tolerance / 100)
+            if result['median_ms'] > limit:
+                regressions.append(
+                    f'{result["name"]}: median {previous["median_ms"]:.1f} -> {result["median_ms"]:.1f} ms'
+                )
+
+        if regressions:
+            self.stdout.write(self.style.ERROR(f'{len(regressions)} regressions against {baseline_path}:'))
+            for line in regressions:
+                self.stdout.write(f'  {line}')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'No regressions against {baseline_path}'))
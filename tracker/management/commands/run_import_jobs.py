@@ -0,0 +1,62 @@
+"""
+Worker for background member imports.
+
+Usage:
+    python manage.py run_import_jobs            # poll for jobs until stopped
+    python manage.py run_import_jobs --once     # process pending jobs and exit
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from tracker.jobs import requeue_stale_import_jobs, run_pending_import_jobs
+
+
+class Command(BaseCommand):
+    help = 'Process pending Excel member import jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process the pending jobs once and exit instead of polling',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=5,
+            help='Seconds to wait between polls (default: 5)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Maximum number of jobs to process per poll',
+        )
+        parser.add_argument(
+            '--requeue-stale',
+            type=int,
+            default=30,
+            metavar='MINUTES',
+            help='Requeue running jobs that saved no progress for this long (default: 30, 0 disables)',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Starting import job worker...')
+
+        while True:
+            if options['requeue_stale']:
+                requeued = requeue_stale_import_jobs(timedelta(minutes=options['requeue_stale']))
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale jobs'))
+
+            processed = run_pending_import_jobs(limit=options['limit'])
+            if processed:
+                self.stdout.write(self.style.SUCCESS(f'Processed {processed} import jobs'))
+
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write('Import job worker finished!')
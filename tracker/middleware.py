@@ -2,12 +2,17 @@
 Tenant middleware for multi-tenant support.
 Resolves organization from URL slug and sets request.tenant.
 """
+import time
+
+from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
-from django.utils import timezone
 from django.http import Http404
 from django.shortcuts import redirect
 from django.urls import reverse
 from .models import Organization, OrganizationUser
+from .permissions import get_org_membership
+from .subscriptions import subscription_state
+from .tenants import get_tenant
 
 
 class TenantMiddleware(MiddlewareMixin):
@@ -54,13 +59,16 @@ class TenantMiddleware(MiddlewareMixin):
             org_slug = path_parts[0]
 
             try:
-                # Resolve org_slug to Organization
-                organization = Organization.objects.get(slug=org_slug, is_active=True)
+                # Resolve org_slug to Organization (cached, see tracker.tenants)
+                organization = get_tenant(org_slug)
                 request.tenant = organization
 
-                # Store in session for later use
-                request.session['tenant_id'] = organization.id
-                request.session['tenant_slug'] = organization.slug
+                # Store in session for later use; only write when it changed
+                # so unchanged sessions are not saved on every request
+                if request.session.get('tenant_id') != organization.id:
+                    request.session['tenant_id'] = organization.id
+                if request.session.get('tenant_slug') != organization.slug:
+                    request.session['tenant_slug'] = organization.slug
 
             except Organization.DoesNotExist:
                 # Organization not found or inactive
@@ -78,6 +86,25 @@ class TenantMiddleware(MiddlewareMixin):
         return response
 
 
+class SessionRefreshMiddleware(MiddlewareMixin):
+    """
+    Keep the idle session timeout sliding without saving the session on every
+    request: an active session is marked modified, and so saved with a new
+    expiry, at most once per SESSION_REFRESH_INTERVAL seconds.
+    """
+
+    REFRESHED_AT_KEY = '_refreshed_at'
+
+    def process_request(self, request):
+        session = getattr(request, 'session', None)
+        if session is None or not session.session_key:
+            return
+        now = int(time.time())
+        interval = getattr(settings, 'SESSION_REFRESH_INTERVAL', 60)
+        if now - session.get(self.REFRESHED_AT_KEY, 0) >= interval:
+            session[self.REFRESHED_AT_KEY] = now
+
+
 class StaffOnboardingMiddleware(MiddlewareMixin):
     """
     Middleware to redirect staff users to complete onboarding on first login.
@@ -139,52 +166,22 @@ class SubscriptionEnforcementMiddleware(MiddlewareMixin):
         ]):
             return
 
-        # Check role
-        try:
-            org_user = OrganizationUser.objects.get(user=request.user, organization=request.tenant)
-        except OrganizationUser.DoesNotExist:
+        # Check role (memoized for the rest of the request)
+        org_user = get_org_membership(request.user, request.tenant)
+        if org_user is None:
             return
 
         if org_user.role not in ['owner', 'admin', 'staff']:
             return
 
-        now = timezone.now()
         org = request.tenant
-        
-        # Auto-update subscription status if trial expired
-        if org.subscription_status == 'FREE_TRIAL' and org.trial_started_at:
-            trial_end = org.trial_started_at + timezone.timedelta(days=7)
-            if trial_end <= now:
-                # Trial expired - update status to NOT_SUBSCRIBED
-                org.subscription_status = 'NOT_SUBSCRIBED'
-                org.save(update_fields=['subscription_status'])
-        
-        # Auto-update subscription status if subscription expired
-        if org.subscription_status == 'SUBSCRIBED' and org.subscription_expires_at:
-            if org.subscription_expires_at <= now:
-                # Subscription expired - update status to NOT_SUBSCRIBED
-                org.subscription_status = 'NOT_SUBSCRIBED'
-                org.save(update_fields=['subscription_status'])
-        
-        # Check if subscription is active (not expired)
-        active_sub = bool(
-            org.subscription_status == 'SUBSCRIBED' and 
-            org.subscription_expires_at and 
-            org.subscription_expires_at > now
-        )
-        
-        # Check if trial is still active
-        trial_active = bool(
-            org.subscription_status == 'FREE_TRIAL' and
-            org.trial_started_at and 
-            (org.trial_started_at + timezone.timedelta(days=7) > now)
-        )
-
-        # Redirect to subscription renewal page if:
-        # 1. Status is NOT_SUBSCRIBED, OR
-        # 2. No active subscription and no active trial
+        is_active, _ = subscription_state(org)
+
+        # Redirect to subscription renewal page when there is no active
+        # subscription or trial. Nothing is saved here; the
+        # expire_subscriptions command flips lapsed organizations.
         # Use subscription_renewal (not onboarding_subscription) for expired subscriptions
-        if org.subscription_status == 'NOT_SUBSCRIBED' or (not active_sub and not trial_active):
+        if not is_active:
             sub_url = reverse('tracker:subscription_renewal', kwargs={'org_slug': org.slug})
             if path != sub_url:
                 return redirect(sub_url)
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-18 00:51
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0013_import_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformMetricsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_orgs', models.PositiveIntegerField(default=0)),
+                ('active_orgs', models.PositiveIntegerField(default=0)),
+                ('trial_orgs', models.PositiveIntegerField(default=0)),
+                ('subscribed_orgs', models.PositiveIntegerField(default=0)),
+                ('expired_orgs', models.PositiveIntegerField(default=0)),
+                ('category_counts', models.JSONField(blank=True, default=dict, help_text='Organization count per category')),
+                ('pending_requests', models.PositiveIntegerField(default=0)),
+                ('total_revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('revenue_by_month', models.JSONField(blank=True, default=dict, help_text='Approved amount per YYYY-MM (request month)')),
+                ('approved_by_day', models.JSONField(blank=True, default=dict, help_text='Approvals per YYYY-MM-DD for recent days')),
+                ('latest_backup_at', models.DateTimeField(blank=True, null=True)),
+                ('latest_backup_size', models.BigIntegerField(blank=True, null=True)),
+                ('organizations_refreshed_at', models.DateTimeField(blank=True, null=True)),
+                ('payments_refreshed_at', models.DateTimeField(blank=True, null=True)),
+                ('backups_refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Platform Metrics Snapshot',
+                'verbose_name_plural': 'Platform Metrics Snapshot',
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-18 00:54
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def backfill_effective_until(apps, schema_editor):
+    Organization = apps.get_model('tracker', 'Organization')
+    for org in Organization.objects.exclude(subscription_status='NOT_SUBSCRIBED').iterator():
+        if org.subscription_status == 'SUBSCRIBED':
+            effective_until = org.subscription_expires_at
+        elif org.trial_started_at:
+            effective_until = org.trial_started_at + timedelta(days=7)
+        else:
+            continue
+        Organization.objects.filter(pk=org.pk).update(effective_until=effective_until)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0014_platform_metrics_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='effective_until',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(backfill_effective_until, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.3 on 2026-10-18 00:58
+
+from django.db import migrations, models
+from django.db.models import Case, F, Q, Value, When
+
+
+def backfill_member_status(apps, schema_editor):
+    Member = apps.get_model('tracker', 'Member')
+    Member.objects.update(status=Case(
+        When(paid_total=0, then=Value('not_started')),
+        When(paid_total__lt=F('pledge'), then=Value('incomplete')),
+        When(paid_total=F('pledge'), then=Value('complete')),
+        default=Value('exceeded'),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0015_organization_effective_until'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='status',
+            field=models.CharField(choices=[('not_started', 'Not Started'), ('incomplete', 'Incomplete'), ('complete', 'Complete'), ('exceeded', 'Exceeded')], default='not_started', editable=False, max_length=12),
+        ),
+        migrations.RunPython(backfill_member_status, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(fields=['organization', 'status', 'name'], name='tracker_mem_organiz_b0d0ff_idx'),
+        ),
+    ]
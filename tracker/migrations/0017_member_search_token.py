@@ -0,0 +1,90 @@
+# Generated by Django 5.2.3 on 2026-10-18 01:00
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# The tokenizer as it was when this migration was written (tracker/search.py
+# has since changed); migrations must not depend on live application code.
+WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def words(value):
+    value = unicodedata.normalize('NFKD', str(value or ''))
+    value = ''.join(char for char in value if not unicodedata.combining(char)).lower()
+    return WORD_RE.findall(value)
+
+
+def local_phone(digits):
+    if digits.startswith('255') and len(digits) > 9:
+        return digits[3:]
+    if digits.startswith('0'):
+        return digits[1:]
+    return digits
+
+
+def trigrams(word):
+    padded = f'  {word} '
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def member_tokens(name, phone, email):
+    tokens = set()
+    for word in words(name):
+        tokens.add(('n', word))
+        if getattr(settings, 'MEMBER_SEARCH_FUZZY', True):
+            tokens.update(('t', gram) for gram in trigrams(word))
+
+    digits = ''.join(char for char in str(phone or '') if char.isdigit())
+    if digits:
+        tokens.add(('p', digits))
+        if local_phone(digits):
+            tokens.add(('p', local_phone(digits)))
+
+    email = (email or '').strip().lower()
+    if email:
+        tokens.add(('e', email))
+    return {(kind, token[:100]) for kind, token in tokens}
+
+
+def build_search_index(apps, schema_editor):
+    Member = apps.get_model('tracker', 'Member')
+    MemberSearchToken = apps.get_model('tracker', 'MemberSearchToken')
+    rows = []
+    for member in Member.objects.exclude(organization=None).iterator(chunk_size=2000):
+        for kind, token in member_tokens(member.name, member.phone, member.email):
+            rows.append(MemberSearchToken(
+                organization_id=member.organization_id, member_id=member.pk, kind=kind, token=token,
+            ))
+        if len(rows) >= 5000:
+            MemberSearchToken.objects.bulk_create(rows)
+            rows = []
+    MemberSearchToken.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0016_member_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('n', 'Name word'), ('p', 'Phone digits'), ('e', 'Email'), ('t', 'Name trigram')], max_length=1)),
+                ('token', models.CharField(max_length=100)),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='tracker.member')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='member_search_tokens', to='tracker.organization')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['organization', 'kind', 'token'], name='tracker_mem_organiz_e72190_idx')],
+            },
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-18 01:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0017_member_search_token'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(fields=['organization', 'is_active', 'name'], name='tracker_mem_organiz_0e3a20_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-18 01:28
+
+from django.db import migrations, models
+
+
+def expire_payment_metrics(apps, schema_editor):
+    # The dashboard recomputes the payment section, filling the new field, on its next load
+    PlatformMetricsSnapshot = apps.get_model('tracker', 'PlatformMetricsSnapshot')
+    PlatformMetricsSnapshot.objects.update(payments_refreshed_at=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0021_organization_data_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='platformmetricssnapshot',
+            name='approved_revenue_by_month',
+            field=models.JSONField(blank=True, default=dict, help_text='Approved amount per YYYY-MM (approval month)'),
+        ),
+        migrations.RunPython(expire_payment_metrics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.3 on 2026-10-18 01:29
+
+import re
+import unicodedata
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# The tokenizer as it was when this migration was written; migrations must
+# not depend on live application code (tracker/search.py).
+WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def words(value):
+    value = unicodedata.normalize('NFKD', str(value or ''))
+    value = ''.join(char for char in value if not unicodedata.combining(char)).lower()
+    return WORD_RE.findall(value)
+
+
+def trigrams(word):
+    padded = f'  {word} '
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def member_tokens(name, phone, email, course):
+    tokens = set()
+    for word in words(name):
+        tokens.add(('n', word))
+        if getattr(settings, 'MEMBER_SEARCH_FUZZY', True):
+            tokens.update(('t', gram) for gram in trigrams(word))
+
+    # Every suffix, so a prefix lookup finds digits anywhere in the number
+    digits = ''.join(char for char in str(phone or '') if char.isdigit())
+    tokens.update(('p', digits[start:]) for start in range(len(digits)))
+
+    email = (email or '').strip().lower()
+    if email:
+        tokens.add(('e', email))
+        tokens.update(('e', word) for word in words(email))
+
+    tokens.update(('c', word) for word in words(course))
+    return {(kind, token[:100]) for kind, token in tokens}
+
+
+def rebuild_search_index(apps, schema_editor):
+    Member = apps.get_model('tracker', 'Member')
+    MemberSearchToken = apps.get_model('tracker', 'MemberSearchToken')
+    MemberSearchToken.objects.all().delete()
+    rows = []
+    for member in Member.objects.exclude(organization=None).iterator(chunk_size=2000):
+        for kind, token in member_tokens(member.name, member.phone, member.email, member.course):
+            rows.append(MemberSearchToken(
+                organization_id=member.organization_id, member_id=member.pk, kind=kind, token=token,
+            ))
+        if len(rows) >= 5000:
+            MemberSearchToken.objects.bulk_create(rows)
+            rows = []
+    MemberSearchToken.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0022_platform_metrics_approved_revenue'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='membersearchtoken',
+            name='kind',
+            field=models.CharField(choices=[('n', 'Name word'), ('p', 'Phone digits'), ('e', 'Email'), ('t', 'Name trigram'), ('c', 'Course word')], max_length=1),
+        ),
+        migrations.RunPython(rebuild_search_index, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,11 @@
-from django.db import models
+from django.db import models, transaction as db_transaction
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 from django.utils import timezone
 from django.utils.text import slugify
-from django.db.models.signals import post_save
+from django.db.models.lookups import Exact, LessThan
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 # ============================================================================
@@ -38,6 +39,8 @@ class Organization(models.Model):
         ('SUBSCRIBED', 'Subscribed'),
     ]
     subscription_status = models.CharField(max_length=20, choices=SUBSCRIPTION_STATUS_CHOICES, default='FREE_TRIAL')
+    # When the current trial/subscription runs out; kept in sync by save()
+    effective_until = models.DateTimeField(blank=True, null=True, db_index=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -52,9 +55,24 @@ class Organization(models.Model):
     def __str__(self):
         return self.name
 
+    TRIAL_DAYS = 7
+    SUBSCRIPTION_FIELDS = ('trial_started_at', 'subscription_expires_at', 'subscription_status')
+
+    def compute_effective_until(self):
+        """End of the current trial or subscription, or None when there is none"""
+        if self.subscription_status == 'SUBSCRIBED':
+            return self.subscription_expires_at
+        if self.subscription_status == 'FREE_TRIAL' and self.trial_started_at:
+            return self.trial_started_at + timezone.timedelta(days=self.TRIAL_DAYS)
+        return None
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
+        self.effective_until = self.compute_effective_until()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & set(self.SUBSCRIPTION_FIELDS):
+            kwargs['update_fields'] = set(update_fields) | {'effective_until'}
         super().save(*args, **kwargs)
 
 
@@ -171,6 +189,23 @@ class OrganizationUser(models.Model):
     def is_staff_or_higher(self):
         return self.role in ['owner', 'admin', 'staff']
 
+
+class OrganizationDataVersion(models.Model):
+    """
+    Counter bumped after every committed write to an organization's data
+    (see tracker/versions.py). API ETags are derived from it, so unchanged
+    resources can be answered with 304 after one primary-key lookup.
+    Kept out of Organization so saving a cached tenant never rewinds it.
+    """
+    organization = models.OneToOneField(
+        Organization, on_delete=models.CASCADE, primary_key=True, related_name='data_version',
+    )
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.organization_id} v{self.version}"
+
 # ============================================================================
 # EXISTING MODELS (UPDATED WITH ORGANIZATION FK)
 # ============================================================================
@@ -200,6 +235,20 @@ class Member(models.Model):
 
     is_active = models.BooleanField(default=True)
 
+    # Payment status derived from paid_total and pledge, stored so status
+    # filters and counts can use the (organization, status, name) index
+    STATUS_NOT_STARTED = 'not_started'
+    STATUS_INCOMPLETE = 'incomplete'
+    STATUS_COMPLETE = 'complete'
+    STATUS_EXCEEDED = 'exceeded'
+    STATUS_CHOICES = [
+        (STATUS_NOT_STARTED, 'Not Started'),
+        (STATUS_INCOMPLETE, 'Incomplete'),
+        (STATUS_COMPLETE, 'Complete'),
+        (STATUS_EXCEEDED, 'Exceeded'),
+    ]
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default=STATUS_NOT_STARTED, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -209,6 +258,9 @@ class Member(models.Model):
         indexes = [
             models.Index(fields=['organization', 'is_active']),
             models.Index(fields=['organization', 'created_at']),
+            models.Index(fields=['organization', 'status', 'name']),
+            models.Index(fields=['organization', 'is_active', 'name']),
+            models.Index(fields=['organization', 'updated_at']),
         ]
 
     def __str__(self):
@@ -245,13 +297,88 @@ class Member(models.Model):
         else:
             return "Not Started"
 
+    def compute_status(self):
+        """Status for the current paid_total and pledge"""
+        if self.paid_total == 0:
+            return self.STATUS_NOT_STARTED
+        if self.paid_total < self.pledge:
+            return self.STATUS_INCOMPLETE
+        if self.paid_total == self.pledge:
+            return self.STATUS_COMPLETE
+        return self.STATUS_EXCEEDED
+
+    @classmethod
+    def status_expression(cls, paid_total=None, pledge=None):
+        """
+        SQL equivalent of compute_status() for queryset updates. Pass the new
+        paid_total/pledge expressions when they change in the same UPDATE,
+        since the right-hand side sees the old column values.
+        """
+        paid_total = paid_total if paid_total is not None else models.F('paid_total')
+        pledge = pledge if pledge is not None else models.F('pledge')
+        return models.Case(
+            models.When(Exact(paid_total, Decimal('0.00')), then=models.Value(cls.STATUS_NOT_STARTED)),
+            models.When(LessThan(paid_total, pledge), then=models.Value(cls.STATUS_INCOMPLETE)),
+            models.When(Exact(paid_total, pledge), then=models.Value(cls.STATUS_COMPLETE)),
+            default=models.Value(cls.STATUS_EXCEEDED),
+            output_field=models.CharField(max_length=12),
+        )
+
+    def save(self, *args, **kwargs):
+        """
+        paid_total belongs to the ledger: transactions move it with atomic
+        deltas, so a full save of an existing member re-reads it under a row
+        lock instead of writing back the copy loaded with the instance. Pass
+        'paid_total' in update_fields to overwrite it deliberately.
+        """
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and self.pk and not self._state.adding:
+            with db_transaction.atomic():
+                paid_total = Member.objects.select_for_update().filter(
+                    pk=self.pk,
+                ).values_list('paid_total', flat=True).first()
+                if paid_total is not None:
+                    self.paid_total = paid_total
+                self.status = self.compute_status()
+                super().save(*args, **kwargs)
+            return
+
+        self.status = self.compute_status()
+        if update_fields is not None and {'paid_total', 'pledge'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'status'}
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """Delete and leave a tombstone for syncing clients (its transactions go with it)"""
+        pk, organization_id = self.pk, self.organization_id
+        with db_transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            DeletedRecord.record(organization_id, DeletedRecord.KIND_MEMBER, pk)
+        return result
+
     def update_paid_total(self):
+        """Recalculate paid_total from all transactions (full re-aggregation)"""
         total = self.transaction_set.aggregate(
             total=models.Sum('amount')
         )['total'] or 0
         self.paid_total = total
         self.save(update_fields=['paid_total', 'updated_at'])
 
+    @staticmethod
+    def apply_paid_delta(member_id, delta):
+        """
+        Atomically add delta to a member's paid_total with a single UPDATE.
+        Used by Transaction.save()/delete() instead of re-summing every transaction.
+        """
+        if not delta:
+            return
+        paid_total = models.F('paid_total') + delta
+        Member.objects.filter(pk=member_id).update(
+            paid_total=paid_total,
+            status=Member.status_expression(paid_total),
+            updated_at=timezone.now(),
+        )
+
 
 class Transaction(models.Model):
     organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='transactions', null=True, blank=True)
@@ -264,28 +391,90 @@ class Transaction(models.Model):
     date = models.DateField()
     added_by = models.ForeignKey(User, on_delete=models.CASCADE)
     note = models.TextField(blank=True, null=True)
+    # Client-generated key so a retried or replayed payment is recorded once
+    idempotency_key = models.CharField(max_length=64, blank=True, null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-date', '-created_at']
+        unique_together = ('organization', 'idempotency_key')
         indexes = [
             models.Index(fields=['organization', 'date']),
             models.Index(fields=['organization', 'member']),
+            models.Index(fields=['organization', 'updated_at']),
         ]
 
     def __str__(self):
         return f"{self.member.name} - {self.amount} on {self.date}"
 
     def save(self, *args, **kwargs):
-        """Override save to update member's paid_total"""
-        super().save(*args, **kwargs)
-        self.member.update_paid_total()
+        """Override save to apply the amount change to member's paid_total"""
+        with db_transaction.atomic():
+            previous = None
+            if self.pk:
+                previous = Transaction.objects.select_for_update().filter(
+                    pk=self.pk
+                ).values('member_id', 'amount').first()
+
+            super().save(*args, **kwargs)
+
+            amount = Decimal(str(self.amount))
+            if previous is None:
+                Member.apply_paid_delta(self.member_id, amount)
+            elif previous['member_id'] != self.member_id:
+                Member.apply_paid_delta(previous['member_id'], -previous['amount'])
+                Member.apply_paid_delta(self.member_id, amount)
+            else:
+                Member.apply_paid_delta(self.member_id, amount - previous['amount'])
+        self.member.refresh_from_db(fields=['paid_total', 'status', 'updated_at'])
 
     def delete(self, *args, **kwargs):
-        """Override delete to update member's paid_total"""
-        super().delete(*args, **kwargs)
-        self.member.update_paid_total()
+        """Override delete to subtract the amount from member's paid_total"""
+        pk = self.pk
+        with db_transaction.atomic():
+            amount = Transaction.objects.select_for_update().filter(
+                pk=pk
+            ).values_list('amount', flat=True).first()
+            result = super().delete(*args, **kwargs)
+            if amount is not None:
+                Member.apply_paid_delta(self.member_id, -amount)
+            DeletedRecord.record(self.organization_id, DeletedRecord.KIND_TRANSACTION, pk)
+        self.member.refresh_from_db(fields=['paid_total', 'status', 'updated_at'])
+        return result
+
+
+class MemberSearchToken(models.Model):
+    """
+    Per-organization search index for members (see tracker/search.py).
+    One row per normalized name or course word, phone suffix, email (word) or
+    name trigram, kept up to date by the Member post_save signal and the bulk importer.
+    """
+    KIND_NAME = 'n'
+    KIND_PHONE = 'p'
+    KIND_EMAIL = 'e'
+    KIND_TRIGRAM = 't'
+    KIND_COURSE = 'c'
+    KIND_CHOICES = [
+        (KIND_NAME, 'Name word'),
+        (KIND_PHONE, 'Phone digits'),
+        (KIND_EMAIL, 'Email'),
+        (KIND_TRIGRAM, 'Name trigram'),
+        (KIND_COURSE, 'Course word'),
+    ]
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='member_search_tokens')
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='search_tokens')
+    kind = models.CharField(max_length=1, choices=KIND_CHOICES)
+    token = models.CharField(max_length=100)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['organization', 'kind', 'token']),
+        ]
+
+    def __str__(self):
+        return f"{self.member_id}:{self.kind}:{self.token}"
 
 
 class MemberEditLog(models.Model):
@@ -312,6 +501,91 @@ class MemberEditLog(models.Model):
         return f"{self.member.name} - {self.field_changed} changed by {self.edited_by.username} on {self.created_at}"
 
 
+class DeletedRecord(models.Model):
+    """
+    Tombstone for a hard-deleted member or transaction, so API clients
+    syncing deltas (see tracker/sync.py) can drop their local copy.
+    Written by Member.delete() and Transaction.delete(); pruned by the
+    prune_sync_tombstones command.
+    """
+    KIND_MEMBER = 'member'
+    KIND_TRANSACTION = 'transaction'
+    KIND_CHOICES = [
+        (KIND_MEMBER, 'Member'),
+        (KIND_TRANSACTION, 'Transaction'),
+    ]
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='deleted_records')
+    kind = models.CharField(max_length=12, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['organization', 'deleted_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} deleted at {self.deleted_at}"
+
+    @classmethod
+    def record(cls, organization_id, kind, object_id):
+        if organization_id is None or object_id is None:
+            return None
+        return cls.objects.create(organization_id=organization_id, kind=kind, object_id=object_id)
+
+
+class ImportJob(models.Model):
+    """
+    Background member import from an uploaded Excel file.
+    Created by the upload views and processed by the import worker (see tracker/jobs.py).
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='import_jobs')
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='import_jobs')
+    file = models.FileField(upload_to='imports/%Y/%m/')
+    original_filename = models.CharField(max_length=255, blank=True)
+    update_existing = models.BooleanField(default=False)
+    default_pledge = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('70000.00'))
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    rows_processed = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    transaction_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    failure_reason = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Saved with every chunk while running; a job that stops beating is stale
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['organization', 'created_at']),
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"ImportJob({self.organization.name}, {self.original_filename}, {self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_COMPLETED, self.STATUS_FAILED)
+
+
 class PaymentRequest(models.Model):
     """Manual subscription payment request submitted by org; admin confirms manually."""
     STATUS_CHOICES = [
@@ -466,6 +740,97 @@ def update_organization_subscription_on_payment_approval(sender, instance, creat
             org.save()
 
 
+@receiver(post_save, sender=Member)
+@receiver(post_delete, sender=Member)
+def invalidate_stats_on_member_change(sender, instance, **kwargs):
+    """Drop the organization's cached member statistics"""
+    from .stats import invalidate_organization_stats
+    invalidate_organization_stats(instance.organization_id)
+
+
+@receiver(post_save, sender=Member)
+def update_member_search_index(sender, instance, created, update_fields=None, **kwargs):
+    """Re-index a member whose name, phone, email or course may have changed"""
+    from .search import INDEXED_FIELDS, index_member
+    if update_fields is not None and not set(update_fields) & set(INDEXED_FIELDS):
+        return
+    index_member(instance, created=created)
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def invalidate_stats_on_transaction_change(sender, instance, **kwargs):
+    """Drop cached statistics for the transaction's organization"""
+    from .stats import invalidate_organization_stats
+    organization_id = instance.organization_id
+    if organization_id is None:
+        organization_id = Member.objects.filter(pk=instance.member_id).values_list(
+            'organization_id', flat=True
+        ).first()
+    invalidate_organization_stats(organization_id)
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+def invalidate_tenant_on_organization_change(sender, instance, **kwargs):
+    """Drop the cached tenant so the next request sees the saved organization"""
+    from .tenants import invalidate_tenant
+    invalidate_tenant(instance.pk, instance.slug)
+    # A request reading inside the saving transaction may re-cache old values
+    db_transaction.on_commit(lambda: invalidate_tenant(instance.pk, instance.slug))
+
+
+@receiver(post_save, sender=OrganizationTheme)
+@receiver(post_delete, sender=OrganizationTheme)
+def invalidate_tenant_on_theme_change(sender, instance, **kwargs):
+    """The cached tenant and theme context carry the theme, so theme edits invalidate them"""
+    from .context_processors import invalidate_theme_context
+    from .tenants import invalidate_tenant
+    invalidate_tenant(instance.organization_id)
+    invalidate_theme_context(instance.organization_id)
+    db_transaction.on_commit(lambda: invalidate_tenant(instance.organization_id))
+    db_transaction.on_commit(lambda: invalidate_theme_context(instance.organization_id))
+
+
+@receiver(post_save, sender=Organization)
+def bump_data_version_on_organization_change(sender, instance, **kwargs):
+    """Organization details and subscription responses change with the organization"""
+    from .versions import bump_data_version
+    bump_data_version(instance.pk)
+
+
+@receiver(post_save, sender=OrganizationTheme)
+@receiver(post_delete, sender=OrganizationTheme)
+@receiver(post_save, sender=OrganizationUser)
+@receiver(post_delete, sender=OrganizationUser)
+@receiver(post_save, sender=Member)
+@receiver(post_delete, sender=Member)
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_save, sender=PaymentRequest)
+@receiver(post_delete, sender=PaymentRequest)
+def bump_data_version_on_change(sender, instance, **kwargs):
+    """Responses derived from the organization's data are stale once this commits"""
+    from .versions import bump_data_version
+    bump_data_version(instance.organization_id)
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+def refresh_platform_metrics_on_organization_change(sender, instance, **kwargs):
+    """Recount organizations for the Bossin dashboard once the change is committed"""
+    from .platform_metrics import refresh_organization_metrics
+    db_transaction.on_commit(refresh_organization_metrics)
+
+
+@receiver(post_save, sender=PaymentRequest)
+@receiver(post_delete, sender=PaymentRequest)
+def refresh_platform_metrics_on_payment_request_change(sender, instance, **kwargs):
+    """Recompute pending/revenue figures for the Bossin dashboard"""
+    from .platform_metrics import refresh_payment_metrics
+    db_transaction.on_commit(refresh_payment_metrics)
+
+
 # ============================================================================
 # BOSSIN ADMIN PORTAL MODELS
 # ============================================================================
@@ -559,3 +924,39 @@ class SystemSettings(models.Model):
     def get_category_discount(self, category):
         """Get discount percentage for a category."""
         return self.category_discounts.get(category, 35)  # Default 35%
+
+
+class PlatformMetricsSnapshot(models.Model):
+    """
+    Precomputed platform-wide counters for the Bossin Admin dashboard (singleton).
+    Sections are recomputed by Organization/PaymentRequest signals; see tracker/platform_metrics.py.
+    """
+    # Organizations
+    total_orgs = models.PositiveIntegerField(default=0)
+    active_orgs = models.PositiveIntegerField(default=0)
+    trial_orgs = models.PositiveIntegerField(default=0)
+    subscribed_orgs = models.PositiveIntegerField(default=0)
+    expired_orgs = models.PositiveIntegerField(default=0)
+    category_counts = models.JSONField(default=dict, blank=True, help_text='Organization count per category')
+
+    # Payment requests
+    pending_requests = models.PositiveIntegerField(default=0)
+    total_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    revenue_by_month = models.JSONField(default=dict, blank=True, help_text='Approved amount per YYYY-MM (request month)')
+    approved_revenue_by_month = models.JSONField(default=dict, blank=True, help_text='Approved amount per YYYY-MM (approval month)')
+    approved_by_day = models.JSONField(default=dict, blank=True, help_text='Approvals per YYYY-MM-DD for recent days')
+
+    # Backups
+    latest_backup_at = models.DateTimeField(blank=True, null=True)
+    latest_backup_size = models.BigIntegerField(blank=True, null=True)
+
+    organizations_refreshed_at = models.DateTimeField(blank=True, null=True)
+    payments_refreshed_at = models.DateTimeField(blank=True, null=True)
+    backups_refreshed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = 'Platform Metrics Snapshot'
+        verbose_name_plural = 'Platform Metrics Snapshot'
+
+    def __str__(self):
+        return 'Bossin Platform Metrics'
@@ -0,0 +1,174 @@
+"""
+Keyset (cursor) pagination.
+
+Instead of OFFSET/LIMIT plus a COUNT(*), a page is fetched with a WHERE
+clause on the ordering key of the last row seen, so every page costs one
+indexed range scan of `limit + 1` rows no matter how deep the reader is.
+Cursors are opaque url-safe tokens holding the key values of the boundary
+row, its position in the list (for row numbering) and, for cursors that
+page backwards, a direction flag so one `cursor` parameter can serve both
+directions (see paginate_cursor).
+
+The ordering must be unique (end it with the primary key) and its fields
+must not be nullable. Decoded key values are converted and validated by
+their model fields, so a tampered cursor is rejected as InvalidCursor
+rather than failing when the query runs.
+"""
+
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+DEFAULT_PAGE_SIZE = 20
+
+
+class InvalidCursor(ValueError):
+    """A cursor token that could not be decoded."""
+
+
+def encode_cursor(values, position=0, backwards=False):
+    payload = {'k': list(values), 'n': position}
+    if backwards:
+        payload['b'] = 1
+    payload = json.dumps(payload, default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _field_name(field):
+    return field.lstrip('-')
+
+
+def _key_field(model, field):
+    name = _field_name(field)
+    return model._meta.pk if name == 'pk' else model._meta.get_field(name)
+
+
+def _decode(token, ordering, model):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        values, position = payload['k'], int(payload.get('n', 0))
+        backwards = bool(payload.get('b'))
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError, UnicodeError):
+        raise InvalidCursor('Invalid cursor')
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise InvalidCursor('Invalid cursor')
+    typed = []
+    try:
+        for field, value in zip(ordering, values):
+            model_field = _key_field(model, field)
+            value = model_field.to_python(value)
+            if value is None:
+                raise InvalidCursor('Invalid cursor')
+            # Range checks, e.g. an id too large for the column
+            model_field.run_validators(value)
+            typed.append(value)
+    except (ValidationError, ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+    return typed, max(position, 0), backwards
+
+
+def decode_cursor(token, ordering, model):
+    """Return (key values, position) from a cursor token for `ordering` on `model`."""
+    values, position, _ = _decode(token, ordering, model)
+    return values, position
+
+
+def _reverse(ordering):
+    return [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+
+def keyset_q(ordering, values):
+    """
+    Q object for rows strictly after `values` in `ordering`, e.g. for
+    ('name', 'id'): name > v0 OR (name = v0 AND id > v1).
+    """
+    condition = Q()
+    for index, field in enumerate(ordering):
+        name = _field_name(field)
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        step = Q(**{f'{name}__{lookup}': values[index]})
+        for previous_field, previous_value in zip(ordering[:index], values[:index]):
+            step &= Q(**{_field_name(previous_field): previous_value})
+        condition |= step
+    return condition
+
+
+class KeysetPage:
+    """One page of a keyset-paginated queryset."""
+
+    def __init__(self, object_list, ordering, offset, has_next, has_previous):
+        self.object_list = object_list
+        self.ordering = ordering
+        self.offset = offset
+        self.has_next = has_next
+        self.has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def _cursor(self, row, position, backwards=False):
+        return encode_cursor(
+            [getattr(row, _field_name(field)) for field in self.ordering], position, backwards,
+        )
+
+    @property
+    def next_cursor(self):
+        if not self.has_next or not self.object_list:
+            return None
+        return self._cursor(self.object_list[-1], self.offset + len(self.object_list))
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous or not self.object_list:
+            return None
+        return self._cursor(self.object_list[0], self.offset, backwards=True)
+
+
+def keyset_paginate(queryset, ordering, after=None, before=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Return the KeysetPage following the `after` cursor, or preceding the
+    `before` cursor, or the first page when neither is given.
+    Raises InvalidCursor for a malformed or tampered token.
+    """
+    ordering = list(ordering)
+    limit = max(int(limit), 1)
+
+    if before:
+        values, position = decode_cursor(before, ordering, queryset.model)
+        rows = list(
+            queryset.filter(keyset_q(_reverse(ordering), values))
+            .order_by(*_reverse(ordering))[:limit + 1]
+        )
+        has_previous = len(rows) > limit
+        rows = rows[:limit]
+        rows.reverse()
+        return KeysetPage(rows, ordering, max(position - len(rows), 0), True, has_previous)
+
+    position = 0
+    if after:
+        values, position = decode_cursor(after, ordering, queryset.model)
+        queryset = queryset.filter(keyset_q(ordering, values))
+    rows = list(queryset.order_by(*ordering)[:limit + 1])
+    has_next = len(rows) > limit
+    return KeysetPage(rows[:limit], ordering, position, has_next, bool(after))
+
+
+def paginate_cursor(queryset, ordering, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Like keyset_paginate, but with a single cursor: next_cursor tokens page
+    forwards and previous_cursor tokens page backwards.
+    """
+    if not cursor:
+        return keyset_paginate(queryset, ordering, limit=limit)
+    _, _, backwards = _decode(cursor, ordering, queryset.model)
+    if backwards:
+        return keyset_paginate(queryset, ordering, before=cursor, limit=limit)
+    return keyset_paginate(queryset, ordering, after=cursor, limit=limit)
@@ -0,0 +1,267 @@
+"""
+Batch payment recording.
+
+Records many payments with a constant number of queries: one locked member
+prefetch, one bulk insert and one grouped paid_total update. Used by the bulk
+payment API where collectors submit a whole session's offerings at once.
+
+Payments may carry a client-generated idempotency key (stored on
+Transaction, unique per organization). Retrying or replaying a payment with
+a key that was already recorded returns the original transaction instead of
+counting the money twice, so clients can resend queued offline payments
+until they get an answer. Bulk payments sent without a key get a generated
+one, which is how their ids are read back on databases where bulk_create
+does not return primary keys (MySQL).
+"""
+
+import re
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction as db_transaction
+from django.db.models import Case, DecimalField, F, Value, When
+from django.utils import timezone
+
+from .models import Member, Transaction
+from .stats import invalidate_organization_stats
+from .versions import bump_data_version
+
+
+IDEMPOTENCY_KEY_RE = re.compile(r'^[A-Za-z0-9_.:-]{8,64}$')
+
+
+class IdempotencyConflict(ValueError):
+    """An idempotency key that was already used for a different payment."""
+
+
+def clean_idempotency_key(value):
+    """The idempotency key, or None when blank. Raises ValueError if malformed."""
+    value = str(value or '').strip()
+    if not value:
+        return None
+    if not IDEMPOTENCY_KEY_RE.match(value):
+        raise ValueError('Invalid idempotency key.')
+    return value
+
+
+def generate_idempotency_key():
+    """A server-side key for a bulk payment sent without one."""
+    return f'bulk:{uuid.uuid4().hex}'
+
+
+def check_payable(member):
+    """Raise ValueError when payments cannot be recorded for the member."""
+    if not member.is_active:
+        raise ValueError('Member is inactive.')
+
+
+def _replayed(transaction, member_id, amount):
+    """Check that a replayed payment is the one recorded under its key."""
+    if transaction.member_id != member_id or transaction.amount != amount:
+        raise IdempotencyConflict('This idempotency key was already used for a different payment.')
+    return transaction
+
+
+def record_payment(organization, member, user, amount, date=None, note='', idempotency_key=None):
+    """
+    Record one payment and return `(transaction, created)`. When the
+    idempotency key was recorded before, the original transaction is returned
+    with created=False; IdempotencyConflict is raised if it belongs to a
+    different member or amount. ValueError is raised for inactive members.
+    """
+    date = date or timezone.now().date()
+    if idempotency_key:
+        existing = Transaction.objects.filter(
+            organization=organization, idempotency_key=idempotency_key,
+        ).first()
+        if existing is not None:
+            return _replayed(existing, member.pk, amount), False
+
+    check_payable(member)
+    try:
+        with db_transaction.atomic():
+            transaction = Transaction.objects.create(
+                organization=organization,
+                member=member,
+                amount=amount,
+                date=date,
+                added_by=user,
+                note=note,
+                idempotency_key=idempotency_key or None,
+            )
+    except IntegrityError:
+        # A concurrent retry of the same payment got there first
+        existing = idempotency_key and Transaction.objects.filter(
+            organization=organization, idempotency_key=idempotency_key,
+        ).first()
+        if not existing:
+            raise
+        return _replayed(existing, member.pk, amount), False
+    return transaction, True
+
+
+def apply_paid_deltas(deltas, updated_at=None):
+    """
+    Add per-member amounts to paid_total with one UPDATE.
+
+    `deltas` maps member id to the Decimal amount to add.
+    """
+    deltas = {member_id: delta for member_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    increment = Case(
+        *[When(pk=member_id, then=Value(delta)) for member_id, delta in deltas.items()],
+        default=Value(Decimal('0.00')),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+    paid_total = F('paid_total') + increment
+    Member.objects.filter(pk__in=deltas.keys()).update(
+        paid_total=paid_total,
+        status=Member.status_expression(paid_total),
+        updated_at=updated_at or timezone.now(),
+    )
+
+
+def _payment_error(payment, message):
+    error = {'member_id': payment['member_id'], 'error': message}
+    if payment.get('idempotency_key'):
+        error['idempotency_key'] = payment['idempotency_key']
+    return error
+
+
+def record_bulk_payments(organization, user, payments, date=None):
+    """
+    Record a batch of payments for members of an organization.
+
+    `payments` is a list of dicts with `member_id`, `payment_amount` and
+    optional `note`, `date` and `idempotency_key`. Returns `(recorded, errors)`
+    where `recorded` is a list of `(transaction, member, created)` in input
+    order, with members carrying their updated paid_total and created=False
+    for payments whose key was already recorded, and `errors` lists the
+    payments that were skipped, such as those for unknown or inactive members.
+    """
+    keys = {payment['idempotency_key'] for payment in payments if payment.get('idempotency_key')}
+    conflicting = set()
+    while True:
+        try:
+            return _record_bulk_payments(organization, user, payments, date)
+        except IntegrityError:
+            # A concurrent replay recorded some of the keys first. Go again only
+            # when the re-read finds keys this attempt did not know about, so
+            # they come back as duplicates; any other error is raised.
+            recorded = set(Transaction.objects.filter(
+                organization=organization, idempotency_key__in=keys,
+            ).values_list('idempotency_key', flat=True)) if keys else set()
+            if recorded <= conflicting:
+                raise
+            conflicting = recorded
+
+
+def _assign_inserted_pks(organization, transactions):
+    """
+    Read back the ids of bulk-inserted transactions on databases where
+    bulk_create does not return them, by their (unique) idempotency keys.
+    """
+    missing = {transaction.idempotency_key: transaction for transaction in transactions if transaction.pk is None}
+    if not missing:
+        return
+    for pk, key in Transaction.objects.filter(
+        organization=organization, idempotency_key__in=missing.keys(),
+    ).values_list('pk', 'idempotency_key'):
+        missing[key].pk = pk
+
+
+def _record_bulk_payments(organization, user, payments, date=None):
+    today = timezone.now().date()
+    date = date or today
+    entries = []
+    errors = []
+
+    with db_transaction.atomic():
+        member_ids = {payment['member_id'] for payment in payments}
+        members = Member.objects.select_for_update().filter(
+            organization=organization,
+        ).in_bulk(member_ids)
+
+        keys = {payment['idempotency_key'] for payment in payments if payment.get('idempotency_key')}
+        recorded_keys = {}
+        if keys:
+            recorded_keys = {
+                transaction.idempotency_key: transaction
+                for transaction in Transaction.objects.filter(
+                    organization=organization, idempotency_key__in=keys,
+                ).select_related('member')
+            }
+
+        new_transactions = []
+        deltas = {}
+        for payment in payments:
+            key = payment.get('idempotency_key') or None
+            amount = Decimal(str(payment['payment_amount']))
+            if key in recorded_keys:
+                try:
+                    entries.append((_replayed(recorded_keys[key], payment['member_id'], amount), False))
+                except IdempotencyConflict as e:
+                    errors.append(_payment_error(payment, str(e)))
+                continue
+
+            member = members.get(payment['member_id'])
+            if member is None:
+                errors.append(_payment_error(payment, 'Member not found.'))
+                continue
+            try:
+                check_payable(member)
+            except ValueError as e:
+                errors.append(_payment_error(payment, str(e)))
+                continue
+
+            if amount <= 0:
+                errors.append(_payment_error(payment, 'Amount must be greater than zero.'))
+                continue
+
+            payment_date = payment.get('date') or date
+            # Queued payments carry the collector's local date, up to a day ahead of UTC
+            if payment_date > today + timedelta(days=1):
+                errors.append(_payment_error(payment, 'Payment date cannot be in the future.'))
+                continue
+
+            transaction = Transaction(
+                organization=organization,
+                member=member,
+                amount=amount,
+                date=payment_date,
+                added_by=user,
+                note=payment.get('note', ''),
+                idempotency_key=key or generate_idempotency_key(),
+            )
+            new_transactions.append(transaction)
+            entries.append((transaction, True))
+            if key:
+                # The same payment queued twice in one batch is recorded once
+                recorded_keys[key] = transaction
+            deltas[member.pk] = deltas.get(member.pk, Decimal('0.00')) + amount
+
+        if new_transactions:
+            now = timezone.now()
+            Transaction.objects.bulk_create(new_transactions)
+            _assign_inserted_pks(organization, new_transactions)
+            apply_paid_deltas(deltas, updated_at=now)
+
+    if new_transactions:
+        # Rows were locked for the update, so in-memory totals match the database
+        for member_id, delta in deltas.items():
+            member = members[member_id]
+            member.paid_total = member.paid_total + delta
+            member.status = member.compute_status()
+            member.updated_at = now
+
+        # bulk_create and queryset updates bypass the model signals
+        invalidate_organization_stats(organization.pk)
+        bump_data_version(organization.pk)
+
+    recorded = [
+        (transaction, members.get(transaction.member_id) or transaction.member, created)
+        for transaction, created in entries
+    ]
+    return recorded, errors
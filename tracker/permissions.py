@@ -8,20 +8,44 @@ from django.shortcuts import redirect
 from .models import OrganizationUser
 
 
-def get_user_org_role(user, organization):
+_MEMBERSHIP_CACHE_ATTR = '_org_membership_cache'
+
+
+def get_org_membership(user, organization):
     """
-    Get the role of a user in an organization.
-    Returns: 'owner', 'admin', 'staff', 'viewer', or None if not a member.
+    Get the user's active OrganizationUser record for an organization, or None.
+
+    The result is memoized on the user object, which lives for a single
+    request, so the permission helpers, decorators, DRF permission classes
+    and context processors share one query per request and organization.
     """
-    try:
-        org_user = OrganizationUser.objects.get(
+    if organization is None or not getattr(user, 'is_authenticated', False):
+        return None
+
+    memberships = getattr(user, _MEMBERSHIP_CACHE_ATTR, None)
+    if memberships is None:
+        memberships = {}
+        setattr(user, _MEMBERSHIP_CACHE_ATTR, memberships)
+
+    if organization.pk not in memberships:
+        org_user = OrganizationUser.objects.filter(
             user=user,
             organization=organization,
             is_active=True
-        )
-        return org_user.role
-    except OrganizationUser.DoesNotExist:
-        return None
+        ).first()
+        if org_user is not None:
+            org_user.organization = organization
+        memberships[organization.pk] = org_user
+    return memberships[organization.pk]
+
+
+def get_user_org_role(user, organization):
+    """
+    Get the role of a user in an organization.
+    Returns: 'owner', 'admin', 'staff', 'viewer', or None if not a member.
+    """
+    org_user = get_org_membership(user, organization)
+    return org_user.role if org_user else None
 
 
 def is_org_owner(user, organization):
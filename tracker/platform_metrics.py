@@ -0,0 +1,186 @@
+"""
+Platform metrics snapshot for the Bossin Admin dashboard.
+
+The dashboard reads a single PlatformMetricsSnapshot row instead of running
+a dozen counts, sums and a backup directory scan on every load. The
+snapshot is not updated by deltas: whenever a source row changes, its whole
+section is recomputed from scratch with grouped queries, organization
+counters on Organization save/delete and payment counters on PaymentRequest
+save/delete (see the signals in models.py). Bulk updates that skip those
+signals, such as the admin's decline action, refresh the section
+themselves. That keeps it exact at the cost
+of a grouped scan per write, which is cheap at the number of organizations
+and payment requests the platform has. Sections are written with queryset
+updates so concurrent refreshes of different sections never overwrite each
+other. `rebuild_platform_metrics` rebuilds everything and also rescans the
+backup directory.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from django.core.cache import cache
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+from .models import Organization, PaymentRequest, PlatformMetricsSnapshot
+
+
+SNAPSHOT_PK = 1
+BACKUP_DIR = Path('backups')
+APPROVED_DAYS_KEPT = 3
+PENDING_REQUESTS_CACHE_KEY = 'tracker:pending-requests-count'
+PENDING_REQUESTS_CACHE_TIMEOUT = 24 * 60 * 60  # seconds; signals keep it current
+CENTS = Decimal('0.01')
+
+
+def _update_snapshot(**fields):
+    if not PlatformMetricsSnapshot.objects.filter(pk=SNAPSHOT_PK).update(**fields):
+        PlatformMetricsSnapshot.objects.update_or_create(pk=SNAPSHOT_PK, defaults=fields)
+
+
+def refresh_organization_metrics():
+    """Organization totals, subscription states and categories in one grouped query."""
+    totals = {
+        'total_orgs': 0, 'active_orgs': 0, 'trial_orgs': 0,
+        'subscribed_orgs': 0, 'expired_orgs': 0,
+    }
+    status_fields = {
+        'FREE_TRIAL': 'trial_orgs',
+        'SUBSCRIBED': 'subscribed_orgs',
+        'NOT_SUBSCRIBED': 'expired_orgs',
+    }
+    categories = {}
+
+    rows = Organization.objects.order_by().values(
+        'category', 'subscription_status', 'is_active',
+    ).annotate(count=Count('id'))
+    for row in rows:
+        count = row['count']
+        totals['total_orgs'] += count
+        if row['is_active']:
+            totals['active_orgs'] += count
+        status_field = status_fields.get(row['subscription_status'])
+        if status_field:
+            totals[status_field] += count
+        categories[row['category']] = categories.get(row['category'], 0) + count
+
+    _update_snapshot(
+        category_counts=categories,
+        organizations_refreshed_at=timezone.now(),
+        **totals,
+    )
+
+
+def _month_totals(rows):
+    return {row['month'].strftime('%Y-%m'): str((row['total'] or Decimal('0.00')).quantize(CENTS)) for row in rows}
+
+
+def refresh_payment_metrics():
+    """
+    Pending count, revenue total and revenue per month from grouped queries.
+    Revenue is kept per request month (the chart) and per approval month
+    (the "this month" figure, as approvals were always counted).
+    """
+    pending = 0
+    total_revenue = Decimal('0.00')
+    revenue_by_month = {}
+
+    rows = PaymentRequest.objects.order_by().values(
+        'status', month=TruncMonth('created_at'),
+    ).annotate(count=Count('id'), total=Sum('amount_tzs'))
+    for row in rows:
+        if row['status'] == 'pending':
+            pending += row['count']
+        elif row['status'] == 'approved':
+            amount = (row['total'] or Decimal('0.00')).quantize(CENTS)
+            total_revenue += amount
+            key = row['month'].strftime('%Y-%m')
+            revenue_by_month[key] = str(Decimal(revenue_by_month.get(key, '0')) + amount)
+
+    approved_revenue_by_month = _month_totals(
+        PaymentRequest.objects.filter(status='approved').order_by().values(
+            month=TruncMonth('updated_at'),
+        ).annotate(total=Sum('amount_tzs'))
+    )
+
+    since = timezone.now() - timedelta(days=APPROVED_DAYS_KEPT)
+    approved_by_day = {
+        row['day'].isoformat(): row['count']
+        for row in PaymentRequest.objects.filter(
+            status='approved', updated_at__gte=since,
+        ).order_by().values(day=TruncDate('updated_at')).annotate(count=Count('id'))
+    }
+
+    cache.set(PENDING_REQUESTS_CACHE_KEY, pending, PENDING_REQUESTS_CACHE_TIMEOUT)
+    _update_snapshot(
+        pending_requests=pending,
+        total_revenue=total_revenue,
+        revenue_by_month=revenue_by_month,
+        approved_revenue_by_month=approved_revenue_by_month,
+        approved_by_day=approved_by_day,
+        payments_refreshed_at=timezone.now(),
+    )
+
+
+def pending_requests_count():
+    """Pending payment request count for the navbar badge, shared via the cache."""
+    count = cache.get(PENDING_REQUESTS_CACHE_KEY)
+    if count is None:
+        count = PaymentRequest.objects.filter(status='pending').count()
+        cache.set(PENDING_REQUESTS_CACHE_KEY, count, PENDING_REQUESTS_CACHE_TIMEOUT)
+    return count
+
+
+def latest_backup_file(backup_dir=BACKUP_DIR):
+    backup_files = list(backup_dir.glob('db_backup_*.gz')) if backup_dir.exists() else []
+    return max(backup_files, key=lambda p: p.stat().st_mtime) if backup_files else None
+
+
+def refresh_backup_metrics(backup_dir=BACKUP_DIR):
+    """Record the newest backup file; called after backups, not per page load."""
+    latest = latest_backup_file(backup_dir)
+    latest_at = latest_size = None
+    if latest:
+        stat = latest.stat()
+        latest_at = timezone.datetime.fromtimestamp(stat.st_mtime, tz=timezone.get_current_timezone())
+        latest_size = stat.st_size
+    _update_snapshot(
+        latest_backup_at=latest_at,
+        latest_backup_size=latest_size,
+        backups_refreshed_at=timezone.now(),
+    )
+
+
+def rebuild_platform_metrics():
+    refresh_organization_metrics()
+    refresh_payment_metrics()
+    refresh_backup_metrics()
+    return PlatformMetricsSnapshot.objects.get(pk=SNAPSHOT_PK)
+
+
+def get_platform_metrics():
+    """The current snapshot, built on first use."""
+    snapshot = PlatformMetricsSnapshot.objects.filter(pk=SNAPSHOT_PK).first()
+    if snapshot is None or snapshot.organizations_refreshed_at is None or snapshot.payments_refreshed_at is None:
+        snapshot = rebuild_platform_metrics()
+    return snapshot
+
+
+def revenue_series(snapshot, months=6):
+    """Labels and integer totals for the last `months` months, oldest first."""
+    month_start = timezone.localdate().replace(day=1)
+    month_starts = []
+    for _ in range(months):
+        month_starts.append(month_start)
+        month_start = (month_start - timedelta(days=1)).replace(day=1)
+    month_starts.reverse()
+
+    labels = [start.strftime('%b') for start in month_starts]
+    values = [
+        int(Decimal(snapshot.revenue_by_month.get(start.strftime('%Y-%m'), '0')))
+        for start in month_starts
+    ]
+    return labels, values
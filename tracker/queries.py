@@ -0,0 +1,98 @@
+"""
+Shared member query helpers.
+
+Search, status filtering and ordering for member lists are expressed here as
+queryset operations so they run in the database instead of in Python loops.
+Used by the web views, the exports and the REST API.
+"""
+
+from decimal import Decimal
+
+from django.db.models import Q
+
+from .models import Member
+from .search import member_search_q
+
+
+# Pledge above which a member counts as "pledged" (the default pledge amount)
+PLEDGED_THRESHOLD = Decimal('70000')
+
+MEMBER_STATUS_FILTERS = ('not_started', 'incomplete', 'complete', 'exceeded', 'pledged')
+
+# Whitelisted orderings accepted from request parameters
+MEMBER_ORDERINGS = {
+    'name': ('name', 'id'),
+    '-name': ('-name', '-id'),
+    'paid': ('paid_total', 'name', 'id'),
+    '-paid': ('-paid_total', 'name', 'id'),
+    'pledge': ('pledge', 'name', 'id'),
+    '-pledge': ('-pledge', 'name', 'id'),
+    'created': ('created_at', 'id'),
+    '-created': ('-created_at', '-id'),
+}
+DEFAULT_MEMBER_ORDERING = 'name'
+
+
+def status_q(status_filter):
+    """
+    Return a Q object matching members in the given payment status, or None.
+    Uses the stored Member.status so the (organization, status, name) index
+    applies; "complete" includes members who exceeded their pledge.
+    """
+    if status_filter == 'not_started':
+        return Q(status=Member.STATUS_NOT_STARTED)
+    if status_filter == 'incomplete':
+        return Q(status=Member.STATUS_INCOMPLETE)
+    if status_filter == 'complete':
+        return Q(status__in=[Member.STATUS_COMPLETE, Member.STATUS_EXCEEDED])
+    if status_filter == 'exceeded':
+        return Q(status=Member.STATUS_EXCEEDED)
+    if status_filter == 'pledged':
+        return Q(pledge__gt=PLEDGED_THRESHOLD)
+    return None
+
+
+def search_q(search, organization=None, include_course=False):
+    """
+    Return a Q object matching name, phone or email (and course when asked)
+    through the member search index (tracker/search.py), or None for blank input.
+    """
+    return member_search_q(search, organization=organization, include_course=include_course)
+
+
+def filter_members(queryset, search=None, status_filter=None, organization=None, include_course=False):
+    """Apply search and status filters to a member queryset."""
+    condition = search_q(search, organization=organization, include_course=include_course)
+    if condition is not None:
+        queryset = queryset.filter(condition)
+
+    condition = status_q(status_filter)
+    if condition is not None:
+        queryset = queryset.filter(condition)
+
+    return queryset
+
+
+def order_members(queryset, ordering=None):
+    """Order a member queryset by a whitelisted ordering key."""
+    fields = MEMBER_ORDERINGS.get(ordering or DEFAULT_MEMBER_ORDERING)
+    if fields is None:
+        fields = MEMBER_ORDERINGS[DEFAULT_MEMBER_ORDERING]
+    return queryset.order_by(*fields)
+
+
+def member_queryset(organization, search=None, status_filter=None,
+                    active_only=False, ordering=None):
+    """
+    Members of an organization, filtered and ordered in SQL.
+
+    Returns an unevaluated queryset so callers can paginate, aggregate or
+    stream it without loading every row.
+    """
+    queryset = Member.objects.filter(organization=organization)
+    if active_only:
+        queryset = queryset.filter(is_active=True)
+    queryset = filter_members(
+        queryset, search=search, status_filter=status_filter, organization=organization,
+    )
+    return order_members(queryset, ordering)
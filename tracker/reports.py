@@ -0,0 +1,147 @@
+"""
+Report artifact store.
+
+Generated report files (PDF/XLSX) are kept on disk, keyed by organization,
+report kind, filter parameters and the organization's data version. While
+nothing changes the same file is served again (with ETag/304 support)
+instead of being rendered from scratch on every download.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from datetime import date
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils.http import quote_etag
+
+from .versions import get_data_version
+
+
+# Day and data version at the end of a cached report's file name
+VERSION_RE = re.compile(r'^(?P<day>\d{8})-v(?P<version>\d+)\.')
+
+
+def report_cache_dir():
+    return getattr(settings, 'REPORT_CACHE_DIR', os.path.join(settings.BASE_DIR, 'report_cache'))
+
+
+def _digest(value):
+    payload = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:20]
+
+
+def organization_data_version(organization):
+    """
+    Version of everything a member report depends on: the organization's
+    data version counter, bumped by every write to its members,
+    transactions, settings and theme.
+    """
+    return get_data_version(organization.pk)[0]
+
+
+class ReportArtifact:
+    """A cached report file for one organization, report kind and parameter set."""
+
+    def __init__(self, organization, kind, params, extension, version=None):
+        self.organization = organization
+        self.kind = kind
+        self.extension = extension
+        if version is None:
+            version = organization_data_version(organization)
+        # Reports print today's date, so a new day is a new version too
+        self.params_key = _digest(params)
+        self.version = (date.today().strftime('%Y%m%d'), int(version))
+        self.name = f'{self.kind}-{self.params_key}-{self.version[0]}-v{self.version[1]}'
+        self.etag = quote_etag(self.name)
+
+        directory = os.path.join(report_cache_dir(), str(organization.pk))
+        self.directory = directory
+        self.path = os.path.join(directory, f'{self.name}.{self.extension}')
+
+    @property
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def is_not_modified(self, request):
+        """True when the client already holds this exact version."""
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return self.etag in tags or f'W/{self.etag}' in tags
+
+    def build(self, builder):
+        """
+        Render the report with `builder(fileobj)` and store it atomically.
+        Older versions of the same report and parameters are removed; newer
+        ones, written by requests that saw later data, are left alone.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as output:
+                builder(output)
+            os.replace(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        prefix = f'{self.kind}-{self.params_key}-'
+        pattern = os.path.join(self.directory, f'{prefix}*.{self.extension}')
+        for stale_path in glob.glob(pattern):
+            match = VERSION_RE.match(os.path.basename(stale_path)[len(prefix):])
+            # Files of unknown format are left to prune_report_cache
+            if match is None or (match['day'], int(match['version'])) >= self.version:
+                continue
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass
+
+    def open(self, builder):
+        """The stored file opened for reading, rendering it first when missing."""
+        if not self.exists:
+            self.build(builder)
+        try:
+            return open(self.path, 'rb')
+        except FileNotFoundError:
+            # Swept by a build of newer data after our exists check
+            self.build(builder)
+            return open(self.path, 'rb')
+
+    def response(self, request, builder, filename, content_type):
+        """
+        304 if the client is current, otherwise stream the stored file,
+        rendering it first when this version has not been built yet.
+        """
+        if self.is_not_modified(request):
+            response = HttpResponseNotModified()
+        else:
+            response = FileResponse(
+                self.open(builder),
+                as_attachment=True,
+                filename=filename,
+                content_type=content_type,
+            )
+        response['ETag'] = self.etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+def prune_report_cache(max_age_seconds):
+    """Delete cached report files older than max_age_seconds. Returns the count removed."""
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for path in glob.glob(os.path.join(report_cache_dir(), '*', '*')):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
@@ -0,0 +1,238 @@
+"""
+Member search index.
+
+Searching members with icontains across name, phone and email scans every
+row of the organization on each keystroke. Instead each member is indexed as
+MemberSearchToken rows: accent-stripped lowercase name and course words,
+every suffix of the digits-only phone number, the email address and its
+words (so "gmail" finds the domain) and, when MEMBER_SEARCH_FUZZY is on, the
+trigrams of every name word.
+
+A search term matches members with a token starting with that term, looked
+up as an index range on (organization, kind, token). Since every phone
+suffix is indexed, digits match anywhere in the number, as they did with
+icontains; other terms match from the start of a word, not inside it. Longer
+words also match names sharing most of their trigrams, so "Mwambeni" still
+finds "Mwambene". Every term of a multi-word search must match. Course words
+are only searched when the caller asks for them (the member editor).
+
+The Member post_save signal re-indexes single members; bulk writers (the
+importer, generate_load_data) call index_members() themselves.
+"""
+
+import math
+import re
+import unicodedata
+
+from django.conf import settings
+from django.db.models import Count, Q
+
+from .models import Member, MemberSearchToken
+
+
+INDEXED_FIELDS = ('name', 'phone', 'email', 'course')
+TOKEN_ALPHABET = '0123456789abcdefghijklmnopqrstuvwxyz'
+MAX_TOKEN_LENGTH = 100
+FUZZY_MIN_LENGTH = 4     # shorter words are matched by prefix only
+FUZZY_THRESHOLD = 0.5    # share of a word's trigrams a member must have
+INDEX_BATCH_SIZE = 5000
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+COUNTRY_CODE = '255'
+
+
+def fuzzy_enabled():
+    return getattr(settings, 'MEMBER_SEARCH_FUZZY', True)
+
+
+def normalize(value):
+    """Lowercase and strip accents: 'Élia Ñyangasa' -> 'elia nyangasa'."""
+    value = unicodedata.normalize('NFKD', str(value or ''))
+    return ''.join(char for char in value if not unicodedata.combining(char)).lower()
+
+
+def words(value):
+    return _WORD_RE.findall(normalize(value))
+
+
+def phone_digits(value):
+    return ''.join(char for char in str(value or '') if char.isdigit())
+
+
+def local_phone(digits):
+    """'255755123456' and '0755123456' both become '755123456'."""
+    if digits.startswith(COUNTRY_CODE) and len(digits) > 9:
+        return digits[len(COUNTRY_CODE):]
+    if digits.startswith('0'):
+        return digits[1:]
+    return digits
+
+
+def trigrams(word):
+    padded = f'  {word} '
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def member_tokens(name, phone, email, course=None, fuzzy=None):
+    """Set of (kind, token) pairs to index for one member."""
+    fuzzy = fuzzy_enabled() if fuzzy is None else fuzzy
+    tokens = set()
+    for word in words(name):
+        tokens.add((MemberSearchToken.KIND_NAME, word))
+        if fuzzy:
+            tokens.update((MemberSearchToken.KIND_TRIGRAM, gram) for gram in trigrams(word))
+
+    # Every suffix, so a prefix lookup finds digits anywhere in the number
+    digits = phone_digits(phone)
+    tokens.update((MemberSearchToken.KIND_PHONE, digits[start:]) for start in range(len(digits)))
+
+    email = (email or '').strip().lower()
+    if email:
+        tokens.add((MemberSearchToken.KIND_EMAIL, email))
+        tokens.update((MemberSearchToken.KIND_EMAIL, word) for word in words(email))
+
+    tokens.update((MemberSearchToken.KIND_COURSE, word) for word in words(course))
+    return {(kind, token[:MAX_TOKEN_LENGTH]) for kind, token in tokens}
+
+
+def _token_rows(member, tokens):
+    return [
+        MemberSearchToken(
+            organization_id=member.organization_id, member_id=member.pk, kind=kind, token=token,
+        )
+        for kind, token in tokens
+    ]
+
+
+def index_member(member, created=False):
+    """Bring one member's tokens up to date; a no-op when nothing changed."""
+    if member.organization_id is None:
+        return
+    tokens = member_tokens(member.name, member.phone, member.email, member.course)
+    if not created:
+        existing = set(
+            MemberSearchToken.objects.filter(member_id=member.pk).values_list('kind', 'token')
+        )
+        if existing == tokens:
+            return
+        MemberSearchToken.objects.filter(member_id=member.pk).delete()
+    MemberSearchToken.objects.bulk_create(_token_rows(member, tokens))
+
+
+def index_members(members):
+    """Replace the tokens of many members with one delete and batched inserts."""
+    members = [member for member in members if member.organization_id is not None]
+    if not members:
+        return
+    MemberSearchToken.objects.filter(member_id__in=[member.pk for member in members]).delete()
+    rows = []
+    for member in members:
+        rows.extend(_token_rows(member, member_tokens(member.name, member.phone, member.email, member.course)))
+    MemberSearchToken.objects.bulk_create(rows, batch_size=INDEX_BATCH_SIZE)
+
+
+def rebuild_search_index(organization=None, batch_size=2000):
+    """Re-index every member (of one organization). Returns the member count."""
+    members = Member.objects.exclude(organization=None).only(
+        'id', 'organization_id', 'name', 'phone', 'email', 'course',
+    ).order_by('pk')
+    if organization is not None:
+        members = members.filter(organization=organization)
+
+    count = 0
+    batch = []
+    for member in members.iterator(chunk_size=batch_size):
+        batch.append(member)
+        if len(batch) >= batch_size:
+            index_members(batch)
+            count += len(batch)
+            batch = []
+    index_members(batch)
+    return count + len(batch)
+
+
+def _prefix_q(kind, prefix):
+    """
+    Tokens of `kind` starting with `prefix`. Tokens made of [0-9a-z] use a
+    plain range (token >= 'jo' AND token < 'jp') so any B-tree index serves
+    it regardless of LIKE/collation support.
+    """
+    condition = Q(kind=kind)
+    if all(char in TOKEN_ALPHABET for char in prefix):
+        for index in range(len(prefix) - 1, -1, -1):
+            position = TOKEN_ALPHABET.index(prefix[index])
+            if position < len(TOKEN_ALPHABET) - 1:
+                upper = prefix[:index] + TOKEN_ALPHABET[position + 1]
+                return condition & Q(token__gte=prefix, token__lt=upper)
+    return condition & Q(token__startswith=prefix)
+
+
+def query_terms(search):
+    """Split a search string into ('email', value) and ('word', value) terms."""
+    terms = []
+    for piece in (search or '').split():
+        if '@' in piece:
+            terms.append(('email', piece.lower()))
+        else:
+            terms.extend(('word', word) for word in words(piece))
+    return terms
+
+
+def _term_q(term, tokens, fuzzy, include_course=False):
+    """
+    Members matching one term. Each token kind gets its own subquery so every
+    lookup is a single (organization, kind, token) index range.
+    """
+    kind, value = term
+    if kind == 'email':
+        ranges = [_prefix_q(MemberSearchToken.KIND_EMAIL, value)]
+    else:
+        ranges = [
+            _prefix_q(MemberSearchToken.KIND_NAME, value),
+            _prefix_q(MemberSearchToken.KIND_EMAIL, value),
+        ]
+        if include_course:
+            ranges.append(_prefix_q(MemberSearchToken.KIND_COURSE, value))
+        if value.isdigit():
+            ranges.append(_prefix_q(MemberSearchToken.KIND_PHONE, value))
+            local = local_phone(value)
+            if len(value) >= 4 and local and local != value:
+                ranges.append(_prefix_q(MemberSearchToken.KIND_PHONE, local))
+
+    condition = Q()
+    for match in ranges:
+        condition |= Q(pk__in=tokens.filter(match).values('member_id'))
+
+    if kind == 'word' and fuzzy and len(value) >= FUZZY_MIN_LENGTH and not value.isdigit():
+        grams = trigrams(value)
+        similar = (
+            tokens.filter(kind=MemberSearchToken.KIND_TRIGRAM, token__in=grams)
+            .values('member_id')
+            .annotate(hits=Count('id'))
+            .filter(hits__gte=max(2, math.ceil(len(grams) * FUZZY_THRESHOLD)))
+            .values('member_id')
+        )
+        condition |= Q(pk__in=similar)
+    return condition
+
+
+def member_search_q(search, organization=None, fuzzy=None, include_course=False):
+    """
+    Q object over Member matching `search` through the index, or None for
+    blank input. Pass the organization so lookups stay within its index range.
+    """
+    if not (search or '').strip():
+        return None
+    terms = query_terms(search)
+    if not terms:
+        return Q(pk__in=[])
+
+    fuzzy = fuzzy_enabled() if fuzzy is None else fuzzy
+    tokens = MemberSearchToken.objects.all()
+    if organization is not None:
+        tokens = tokens.filter(organization=organization)
+
+    condition = Q()
+    for term in terms:
+        condition &= _term_q(term, tokens, fuzzy, include_course)
+    return condition
@@ -0,0 +1,101 @@
+"""
+Member statistics engine.
+
+Totals and status counts are computed with a single conditional-aggregate
+query. Unfiltered per-organization results are cached and invalidated by the
+Member/Transaction signals in models.py.
+"""
+
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import Member
+from .queries import MEMBER_STATUS_FILTERS, member_queryset
+
+
+STATS_CACHE_TIMEOUT = 60 * 60  # seconds; signals invalidate on every change
+DEFAULT_TARGET_AMOUNT = Decimal('210000.00')
+CENTS = Decimal('0.01')
+
+_ZERO = Value(Decimal('0.00'), output_field=DecimalField(max_digits=12, decimal_places=2))
+
+
+def _stats_cache_key(organization_id, active_only):
+    return f"tracker:stats:{organization_id}:{'active' if active_only else 'all'}"
+
+
+def aggregate_member_stats(queryset):
+    """
+    Return totals and status counts for a member queryset in one query.
+
+    Status buckets come from the stored Member.status: not started (paid == 0),
+    incomplete (0 < paid < pledge), complete (paid == pledge) and exceeded
+    (paid > pledge).
+    """
+    stats = queryset.order_by().aggregate(
+        total_pledged=Coalesce(Sum('pledge'), _ZERO),
+        total_collected=Coalesce(Sum('paid_total'), _ZERO),
+        member_count=Count('id'),
+        not_paid_count=Count('id', filter=Q(status=Member.STATUS_NOT_STARTED)),
+        incomplete_count=Count('id', filter=Q(status=Member.STATUS_INCOMPLETE)),
+        complete_count=Count('id', filter=Q(status=Member.STATUS_COMPLETE)),
+        exceeded_count=Count('id', filter=Q(status=Member.STATUS_EXCEEDED)),
+    )
+    # Some backends drop the scale on SUM(); keep money values at two places
+    for key in ('total_pledged', 'total_collected'):
+        stats[key] = Decimal(stats[key]).quantize(CENTS)
+    return stats
+
+
+def get_organization_stats(organization, active_only=False):
+    """Cached unfiltered stats for an organization's members."""
+    key = _stats_cache_key(organization.pk, active_only)
+    stats = cache.get(key)
+    if stats is None:
+        queryset = Member.objects.filter(organization=organization)
+        if active_only:
+            queryset = queryset.filter(is_active=True)
+        stats = aggregate_member_stats(queryset)
+        cache.set(key, stats, STATS_CACHE_TIMEOUT)
+    return dict(stats)
+
+
+def get_member_stats(organization, search=None, status_filter=None, active_only=False):
+    """
+    Stats for an organization's member list as currently filtered.
+
+    Unfiltered lists are served from the per-organization cache; searches and
+    status filters aggregate the filtered queryset directly.
+    """
+    if not (search or '').strip() and status_filter not in MEMBER_STATUS_FILTERS:
+        return get_organization_stats(organization, active_only=active_only)
+    queryset = member_queryset(
+        organization, search=search, status_filter=status_filter, active_only=active_only,
+    )
+    return aggregate_member_stats(queryset)
+
+
+def invalidate_organization_stats(organization_id):
+    """Drop cached stats for an organization."""
+    if organization_id is None:
+        return
+    cache.delete_many([
+        _stats_cache_key(organization_id, True),
+        _stats_cache_key(organization_id, False),
+    ])
+
+
+def get_target_amount(organization):
+    """Organization fundraising target, falling back to the default."""
+    try:
+        return Decimal(str(organization.theme.target_amount))
+    except Exception:
+        return DEFAULT_TARGET_AMOUNT
+
+
+def progress_percentage(total_collected, target_amount):
+    """Collected amount as a percentage of the target."""
+    return (total_collected / target_amount * 100) if target_amount > 0 else 0
@@ -0,0 +1,93 @@
+"""
+Subscription state.
+
+Organization.save() keeps `effective_until` (the end of the current trial or
+subscription) in sync with the subscription fields, so deciding whether an
+organization has access is a comparison against that one timestamp on the
+cached tenant. Nothing here writes during a request: organizations whose
+access has run out are reported as NOT_SUBSCRIBED straight away and flipped
+in the database by the `expire_subscriptions` command, run on a schedule.
+"""
+
+from django.db import transaction as db_transaction
+from django.utils import timezone
+
+from .models import Organization
+
+
+def effective_status(organization, now=None):
+    """The subscription status, treating a lapsed trial/subscription as NOT_SUBSCRIBED."""
+    now = now or timezone.now()
+    status = organization.subscription_status
+    if status in ('FREE_TRIAL', 'SUBSCRIBED'):
+        effective_until = organization.effective_until
+        if effective_until is not None and effective_until <= now:
+            return 'NOT_SUBSCRIBED'
+    return status
+
+
+def subscription_state(organization, now=None):
+    """
+    Return (is_active, status_info) for an organization without touching
+    the database.
+    """
+    now = now or timezone.now()
+    org = organization
+    status = effective_status(org, now)
+    effective_until = org.effective_until
+
+    active_sub = bool(status == 'SUBSCRIBED' and effective_until and effective_until > now)
+    trial_active = bool(status == 'FREE_TRIAL' and effective_until and effective_until > now)
+    is_active = active_sub or trial_active
+
+    status_info = {
+        'subscription_status': status,
+        'is_active': is_active,
+        'trial_active': trial_active,
+        'subscription_active': active_sub,
+        'days_remaining': (effective_until - now).days if is_active else None,
+        'subscription_expires_at': (
+            org.subscription_expires_at.isoformat() if org.subscription_expires_at else None
+        ),
+        'trial_started_at': (
+            org.trial_started_at.isoformat() if org.trial_started_at else None
+        ),
+    }
+    return is_active, status_info
+
+
+def expired_organizations(now=None):
+    """Organizations still marked FREE_TRIAL/SUBSCRIBED whose access has ended."""
+    now = now or timezone.now()
+    return Organization.objects.filter(
+        subscription_status__in=['FREE_TRIAL', 'SUBSCRIBED'],
+        effective_until__lte=now,
+    )
+
+
+def expire_subscriptions(now=None):
+    """
+    Flip every lapsed organization to NOT_SUBSCRIBED in one UPDATE.
+    Returns the list of (id, slug) pairs that were changed.
+    """
+    from .platform_metrics import refresh_organization_metrics
+    from .tenants import invalidate_tenant
+    from .versions import bump_data_version
+
+    now = now or timezone.now()
+    with db_transaction.atomic():
+        expired = list(expired_organizations(now).select_for_update().values_list('pk', 'slug'))
+        if not expired:
+            return []
+        Organization.objects.filter(pk__in=[pk for pk, _ in expired]).update(
+            subscription_status='NOT_SUBSCRIBED',
+            effective_until=None,
+            updated_at=now,
+        )
+
+    # update() skips the post_save signals that normally do this
+    for pk, slug in expired:
+        invalidate_tenant(pk, slug)
+        bump_data_version(pk)
+    refresh_organization_metrics()
+    return expired
@@ -0,0 +1,109 @@
+"""
+Tenant resolution.
+
+Every tenant page and API call resolves an organization from its URL slug.
+Resolved organizations (with their theme) are kept in a small in-process LRU
+in front of the shared Django cache, so the common case needs no query at
+all. Organization/OrganizationTheme signals in models.py invalidate both
+layers; other processes drop their local copy after TENANT_LOCAL_CACHE_TTL.
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Organization
+
+
+TENANT_CACHE_TIMEOUT = getattr(settings, 'TENANT_CACHE_TIMEOUT', 60 * 60)
+TENANT_LOCAL_CACHE_SIZE = getattr(settings, 'TENANT_LOCAL_CACHE_SIZE', 256)
+TENANT_LOCAL_CACHE_TTL = getattr(settings, 'TENANT_LOCAL_CACHE_TTL', 30)
+
+
+def _tenant_cache_key(slug):
+    return f'tracker:tenant:{slug}'
+
+
+def _tenant_slug_cache_key(organization_id):
+    return f'tracker:tenant-slug:{organization_id}'
+
+
+class _LocalTenantCache:
+    """
+    Thread-safe LRU of pickled organizations with a short expiry.
+
+    Entries are stored pickled so every request gets its own instance;
+    views are free to modify request.tenant without affecting other threads.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, slug):
+        with self._lock:
+            entry = self._entries.get(slug)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at < time.monotonic():
+                del self._entries[slug]
+                return None
+            self._entries.move_to_end(slug)
+        return pickle.loads(payload)
+
+    def set(self, slug, organization):
+        payload = pickle.dumps(organization, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._entries[slug] = (time.monotonic() + self.ttl, payload)
+            self._entries.move_to_end(slug)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, slug):
+        with self._lock:
+            self._entries.pop(slug, None)
+
+
+_local_cache = _LocalTenantCache(TENANT_LOCAL_CACHE_SIZE, TENANT_LOCAL_CACHE_TTL)
+
+
+def get_tenant(slug):
+    """
+    Return the active organization for `slug`, with its theme loaded.
+    Raises Organization.DoesNotExist for unknown or inactive slugs.
+    """
+    organization = _local_cache.get(slug)
+    if organization is not None:
+        return organization
+
+    organization = cache.get(_tenant_cache_key(slug))
+    if organization is None:
+        organization = Organization.objects.select_related('theme').get(slug=slug, is_active=True)
+        cache.set(_tenant_cache_key(slug), organization, TENANT_CACHE_TIMEOUT)
+        cache.set(_tenant_slug_cache_key(organization.pk), slug, TENANT_CACHE_TIMEOUT)
+
+    _local_cache.set(slug, organization)
+    return organization
+
+
+def invalidate_tenant(organization_id, slug=None):
+    """
+    Forget the cached organization. The slug it was cached under is looked
+    up as well, so renaming an organization's slug drops the old entry.
+    """
+    slugs = {slug} if slug else set()
+    cached_slug = cache.get(_tenant_slug_cache_key(organization_id))
+    if cached_slug:
+        slugs.add(cached_slug)
+
+    for stale_slug in slugs:
+        _local_cache.delete(stale_slug)
+        cache.delete(_tenant_cache_key(stale_slug))
+    cache.delete(_tenant_slug_cache_key(organization_id))
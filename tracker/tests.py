@@ -1,3 +1,1084 @@
-from django.test import TestCase
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+import openpyxl
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .instrumentation import RequestMetricsRegistry, get_query_budget, query_budget
+from .context_processors import get_theme_values, invalidate_theme_context
+from .importer import MemberImporter, import_members_from_excel, recalculate_paid_totals
+from .jobs import create_import_job, requeue_stale_import_jobs, run_import_job
+from .models import (
+    DeletedRecord, ImportJob, Member, MemberEditLog, MemberSearchToken, Organization, OrganizationTheme,
+    OrganizationUser, PaymentRequest, Transaction,
+)
+from .pagination import InvalidCursor, encode_cursor, keyset_paginate
+from .payments import IdempotencyConflict, record_bulk_payments, record_payment
+from .permissions import get_org_membership, get_user_org_role, is_org_admin, is_org_owner
+from .platform_metrics import get_platform_metrics, pending_requests_count, refresh_payment_metrics
+from .queries import filter_members, member_queryset
+from .reports import ReportArtifact
+from .subscriptions import expire_subscriptions, subscription_state
+from .sync import changes_since, issue_token, prune_tombstones, read_token, tombstone_retention
+from .tenants import get_tenant, invalidate_tenant
+from .versions import get_data_version
+
+
+def without_bulk_insert_returning():
+    """Make bulk_create leave primary keys unset, as it does on MySQL."""
+    return mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False)
+
+
+def members_workbook(*rows):
+    """An in-memory members workbook in the import layout."""
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(['Name', 'Pledge', 'Paid', 'Phone', 'Email', 'Course', 'Year'])
+    for row in rows:
+        sheet.append(list(row))
+    content = BytesIO()
+    workbook.save(content)
+    content.seek(0)
+    return content
+
+
+class TrackerTestCase(TestCase):
+    """One organization with a staff user, and helpers to add members and payments."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(name='Org One', slug='org-one')
+        cls.user = User.objects.create_user('collector', password='secret')
+
+    def create_member(self, name='Amina', pledge='1000.00', **kwargs):
+        return Member.objects.create(
+            organization=self.organization, name=name, pledge=Decimal(pledge), **kwargs
+        )
+
+    def create_transaction(self, member, amount):
+        return Transaction.objects.create(
+            organization=self.organization,
+            member=member,
+            amount=Decimal(amount),
+            date=date.today(),
+            added_by=self.user,
+        )
+
+    def assertLedger(self, member, paid_total, status):
+        member.refresh_from_db()
+        self.assertEqual(member.paid_total, Decimal(paid_total))
+        self.assertEqual(member.status, status)
+
+
+class MemberLedgerTests(TrackerTestCase):
+    """Transaction.save()/delete() keep Member.paid_total and status current."""
+
+    def test_create_adds_amount(self):
+        member = self.create_member()
+        self.create_transaction(member, '400.00')
+        self.assertLedger(member, '400.00', Member.STATUS_INCOMPLETE)
+        self.create_transaction(member, '600.00')
+        self.assertLedger(member, '1000.00', Member.STATUS_COMPLETE)
+
+    def test_amount_change_applies_difference(self):
+        member = self.create_member()
+        transaction = self.create_transaction(member, '400.00')
+        transaction.amount = Decimal('1500.00')
+        transaction.save()
+        self.assertLedger(member, '1500.00', Member.STATUS_EXCEEDED)
+        transaction.amount = Decimal('250.00')
+        transaction.save()
+        self.assertLedger(member, '250.00', Member.STATUS_INCOMPLETE)
+
+    def test_member_reassignment_moves_amount(self):
+        first = self.create_member('Amina')
+        second = self.create_member('Baraka')
+        transaction = self.create_transaction(first, '1000.00')
+        transaction.member = second
+        transaction.save()
+        self.assertLedger(first, '0.00', Member.STATUS_NOT_STARTED)
+        self.assertLedger(second, '1000.00', Member.STATUS_COMPLETE)
+
+    def test_delete_subtracts_amount(self):
+        member = self.create_member()
+        kept = self.create_transaction(member, '300.00')
+        removed = self.create_transaction(member, '700.00')
+        removed.delete()
+        self.assertLedger(member, '300.00', Member.STATUS_INCOMPLETE)
+        kept.delete()
+        self.assertLedger(member, '0.00', Member.STATUS_NOT_STARTED)
+
+    def test_matches_full_recalculation(self):
+        member = self.create_member()
+        for amount in ('120.50', '80.25', '999.25'):
+            self.create_transaction(member, amount)
+        member.refresh_from_db()
+        incremental = member.paid_total
+        member.update_paid_total()
+        self.assertEqual(incremental, member.paid_total)
+
+    def test_full_save_keeps_payments_recorded_since_load(self):
+        member = self.create_member(pledge='1000.00')
+        stale = Member.objects.get(pk=member.pk)
+        self.create_transaction(member, '400.00')
+
+        stale.phone = '0712000001'
+        stale.save()
+        self.assertEqual(stale.paid_total, Decimal('400.00'))
+        self.assertLedger(member, '400.00', Member.STATUS_INCOMPLETE)
+        member.refresh_from_db()
+        self.assertEqual(member.phone, '0712000001')
+
+    def test_pledge_edit_on_stale_instance_uses_ledger_total(self):
+        member = self.create_member(pledge='1000.00')
+        stale = Member.objects.get(pk=member.pk)
+        self.create_transaction(member, '600.00')
+
+        stale.pledge = Decimal('500.00')
+        stale.save()
+        self.assertLedger(member, '600.00', Member.STATUS_EXCEEDED)
+
+    def test_explicit_paid_total_update_is_written(self):
+        member = self.create_member(pledge='1000.00')
+        member.paid_total = Decimal('1000.00')
+        member.save(update_fields=['paid_total', 'updated_at'])
+        self.assertLedger(member, '1000.00', Member.STATUS_COMPLETE)
+
+    def test_fix_member_totals_keeps_payments_recorded_during_the_run(self):
+        member = self.create_member()
+        self.create_transaction(member, '400.00')
+        Member.objects.filter(pk=member.pk).update(paid_total=Decimal('0.00'))
+
+        def pay_then_fix(member_ids):
+            # A payment lands between the drift scan and the repair
+            self.create_transaction(member, '100.00')
+            recalculate_paid_totals(member_ids)
+
+        with mock.patch('tracker.management.commands.fix_member_totals.recalculate_paid_totals', pay_then_fix):
+            call_command('fix_member_totals', stdout=StringIO())
+        self.assertLedger(member, '500.00', Member.STATUS_INCOMPLETE)
+
+
+class BulkPaymentTests(TrackerTestCase):
+    """record_bulk_payments() returns saved transactions on every database backend."""
+
+    def record(self, *payments):
+        return record_bulk_payments(self.organization, self.user, list(payments))
+
+    def assertRecordedIds(self, recorded):
+        ids = [transaction.pk for transaction, _, _ in recorded]
+        self.assertNotIn(None, ids)
+        self.assertEqual(
+            set(Transaction.objects.filter(organization=self.organization).values_list('pk', flat=True)),
+            set(ids),
+        )
+
+    def test_records_payments_and_totals(self):
+        first = self.create_member('Amina')
+        second = self.create_member('Baraka')
+        recorded, errors = self.record(
+            {'member_id': first.pk, 'payment_amount': Decimal('400.00')},
+            {'member_id': second.pk, 'payment_amount': Decimal('1000.00'), 'idempotency_key': 'session-1-b'},
+        )
+        self.assertEqual(errors, [])
+        self.assertRecordedIds(recorded)
+        self.assertLedger(first, '400.00', Member.STATUS_INCOMPLETE)
+        self.assertLedger(second, '1000.00', Member.STATUS_COMPLETE)
+
+    def test_reads_ids_back_without_bulk_insert_returning(self):
+        member = self.create_member()
+        with without_bulk_insert_returning():
+            recorded, errors = self.record(
+                {'member_id': member.pk, 'payment_amount': Decimal('100.00')},
+                {'member_id': member.pk, 'payment_amount': Decimal('200.00'), 'idempotency_key': 'session-1-a'},
+            )
+        self.assertEqual(errors, [])
+        self.assertRecordedIds(recorded)
+        self.assertLedger(member, '300.00', Member.STATUS_INCOMPLETE)
+
+    def test_inactive_and_unknown_members_are_skipped(self):
+        inactive = self.create_member(is_active=False)
+        recorded, errors = self.record(
+            {'member_id': inactive.pk, 'payment_amount': Decimal('100.00')},
+            {'member_id': inactive.pk + 1000, 'payment_amount': Decimal('100.00')},
+        )
+        self.assertEqual(recorded, [])
+        self.assertEqual([error['error'] for error in errors], ['Member is inactive.', 'Member not found.'])
+        self.assertLedger(inactive, '0.00', Member.STATUS_NOT_STARTED)
+
+    def test_same_key_twice_is_recorded_once(self):
+        member = self.create_member()
+        payment = {'member_id': member.pk, 'payment_amount': Decimal('100.00'), 'idempotency_key': 'queued-0001'}
+        (first, _, created), = self.record(payment)[0]
+        (again, _, duplicate_created), = self.record(payment)[0]
+        self.assertTrue(created)
+        self.assertFalse(duplicate_created)
+        self.assertEqual(first.pk, again.pk)
+        self.assertLedger(member, '100.00', Member.STATUS_INCOMPLETE)
+
+
+class RecordPaymentTests(TrackerTestCase):
+    """Single and replayed payments share the bulk path's idempotency and member checks."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        OrganizationUser.objects.create(organization=cls.organization, user=cls.user, role='owner')
+        cls.organization.subscription_status = 'SUBSCRIBED'
+        cls.organization.subscription_expires_at = timezone.now() + timedelta(days=30)
+        cls.organization.save()
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_same_key_twice_is_recorded_once(self):
+        member = self.create_member()
+        first, created = record_payment(
+            self.organization, member, self.user, Decimal('100.00'), idempotency_key='daily-0001',
+        )
+        again, duplicate_created = record_payment(
+            self.organization, member, self.user, Decimal('100.00'), idempotency_key='daily-0001',
+        )
+        self.assertTrue(created)
+        self.assertFalse(duplicate_created)
+        self.assertEqual(first.pk, again.pk)
+        self.assertLedger(member, '100.00', Member.STATUS_INCOMPLETE)
+        with self.assertRaises(IdempotencyConflict):
+            record_payment(self.organization, member, self.user, Decimal('200.00'), idempotency_key='daily-0001')
+
+    def test_inactive_member_is_rejected(self):
+        member = self.create_member(is_active=False)
+        with self.assertRaisesMessage(ValueError, 'Member is inactive.'):
+            record_payment(self.organization, member, self.user, Decimal('100.00'))
+
+        url = reverse('api:member_transactions', kwargs={'org_slug': self.organization.slug, 'member_id': member.pk})
+        self.client.logout()
+        response = self.client.post(
+            url, {'amount': '100.00'}, content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertLedger(member, '0.00', Member.STATUS_NOT_STARTED)
+
+    def test_replay_returns_transaction_ids(self):
+        member = self.create_member()
+        inactive = self.create_member('Baraka', is_active=False)
+        url = reverse('tracker:replay_daily_payments', kwargs={'org_slug': self.organization.slug})
+        body = {'payments': [
+            {'member_id': member.pk, 'payment_amount': '100', 'idempotency_key': 'queued-0001'},
+            {'member_id': member.pk, 'payment_amount': '250', 'idempotency_key': 'queued-0002'},
+            {'member_id': inactive.pk, 'payment_amount': '100', 'idempotency_key': 'queued-0003'},
+        ]}
+
+        with without_bulk_insert_returning():
+            first = self.client.post(url, body, content_type='application/json').json()
+            again = self.client.post(url, body, content_type='application/json').json()
+
+        ids = [item['transaction_id'] for item in first['recorded']]
+        self.assertNotIn(None, ids)
+        self.assertEqual([item['transaction_id'] for item in again['recorded']], ids)
+        self.assertEqual([item['duplicate'] for item in again['recorded']], [True, True])
+        self.assertEqual([error['error'] for error in first['errors']], ['Member is inactive.'])
+        self.assertEqual(Transaction.objects.filter(organization=self.organization).count(), 2)
+        self.assertLedger(member, '350.00', Member.STATUS_INCOMPLETE)
+
+
+class MemberImporterTests(TrackerTestCase):
+    """The chunked Excel importer links members, payments and counts correctly."""
+
+    def run_import(self, *rows, update_existing=False):
+        return import_members_from_excel(
+            members_workbook(*rows), self.organization, self.user, update_existing=update_existing,
+        )
+
+    def test_creates_members_with_payments(self):
+        result = self.run_import(['Amina', 1000, 400], ['Baraka', 500, 0])
+        self.assertEqual((result.created_count, result.transaction_count), (2, 1))
+        self.assertLedger(Member.objects.get(name='Amina'), '400.00', Member.STATUS_INCOMPLETE)
+        self.assertLedger(Member.objects.get(name='Baraka'), '0.00', Member.STATUS_NOT_STARTED)
+
+    def test_links_new_members_without_bulk_insert_returning(self):
+        with without_bulk_insert_returning():
+            result = self.run_import(['Amina', 1000, 400], ['Baraka', 500, 500])
+        self.assertEqual(result.errors, [])
+        self.assertEqual(result.transaction_count, 2)
+        self.assertLedger(Member.objects.get(name='Amina'), '400.00', Member.STATUS_INCOMPLETE)
+        self.assertLedger(Member.objects.get(name='Baraka'), '500.00', Member.STATUS_COMPLETE)
+        self.assertTrue(MemberSearchToken.objects.filter(member__name='Baraka').exists())
+
+    def test_repeated_new_name_is_a_duplicate_row(self):
+        result = self.run_import(['Amina', 1000, 400], ['Amina', 2000, 100], update_existing=True)
+        self.assertEqual((result.created_count, result.updated_count), (1, 0))
+        self.assertEqual(len(result.errors), 1)
+        self.assertLedger(Member.objects.get(name='Amina'), '400.00', Member.STATUS_INCOMPLETE)
+
+    def test_updates_existing_member(self):
+        member = self.create_member('Amina')
+        result = self.run_import(['Amina', 2000, 2000], update_existing=True)
+        self.assertEqual((result.created_count, result.updated_count), (0, 1))
+        self.assertLedger(member, '2000.00', Member.STATUS_COMPLETE)
+
+    def test_failed_import_leaves_committed_chunks_consistent(self):
+        def fail_after_first_chunk(result):
+            raise RuntimeError('worker stopped')
+
+        importer = MemberImporter(
+            self.organization, self.user, chunk_size=1, progress_callback=fail_after_first_chunk,
+        )
+        with self.assertRaises(RuntimeError):
+            importer.run(members_workbook(['Amina', 1000, 400], ['Baraka', 500, 500]))
+        self.assertLedger(Member.objects.get(name='Amina'), '400.00', Member.STATUS_INCOMPLETE)
+        self.assertFalse(Member.objects.filter(name='Baraka').exists())
+
+
+@override_settings(IMPORT_JOBS_RUN_IN_THREADS=False)
+class ImportJobTests(TrackerTestCase):
+    """Background import jobs do not keep uploaded workbooks around."""
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root.name))
+
+    def create_job(self, content):
+        upload = SimpleUploadedFile('members.xlsx', content)
+        return create_import_job(self.organization, self.user, upload)
+
+    def test_upload_is_deleted_after_success(self):
+        job = self.create_job(members_workbook(['Amina', 1000, 400]).getvalue())
+        path = job.file.path
+        self.assertTrue(os.path.exists(path))
+        job = run_import_job(job.pk)
+        self.assertEqual(job.status, ImportJob.STATUS_COMPLETED)
+        self.assertEqual(job.created_count, 1)
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(ImportJob.objects.get(pk=job.pk).file)
+
+    def test_upload_is_deleted_after_failure(self):
+        job = self.create_job(b'not a workbook')
+        path = job.file.path
+        job = run_import_job(job.pk)
+        self.assertEqual(job.status, ImportJob.STATUS_FAILED)
+        self.assertFalse(os.path.exists(path))
+
+    def test_requeue_skips_jobs_that_still_report_progress(self):
+        long_ago = timezone.now() - timedelta(hours=2)
+        running = self.create_job(members_workbook(['Amina', 1000, 400]).getvalue())
+        ImportJob.objects.filter(pk=running.pk).update(
+            status=ImportJob.STATUS_RUNNING, started_at=long_ago, heartbeat_at=timezone.now(),
+        )
+        stalled = self.create_job(members_workbook(['Baraka', 1000, 400]).getvalue())
+        ImportJob.objects.filter(pk=stalled.pk).update(
+            status=ImportJob.STATUS_RUNNING, started_at=long_ago, heartbeat_at=long_ago,
+        )
+
+        self.assertEqual(requeue_stale_import_jobs(timedelta(minutes=30)), 1)
+        self.assertEqual(ImportJob.objects.get(pk=running.pk).status, ImportJob.STATUS_RUNNING)
+        self.assertEqual(ImportJob.objects.get(pk=stalled.pk).status, ImportJob.STATUS_PENDING)
+
+    def test_requeue_fails_jobs_whose_upload_is_gone(self):
+        long_ago = timezone.now() - timedelta(hours=2)
+        job = self.create_job(members_workbook(['Amina', 1000, 400]).getvalue())
+        os.remove(job.file.path)
+        ImportJob.objects.filter(pk=job.pk).update(
+            status=ImportJob.STATUS_RUNNING, started_at=long_ago, heartbeat_at=long_ago,
+        )
+
+        self.assertEqual(requeue_stale_import_jobs(timedelta(minutes=30)), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.STATUS_FAILED)
+        self.assertTrue(job.failure_reason)
+
+
+class ReportArtifactTests(TrackerTestCase):
+    """Building a cached report only sweeps versions older than itself."""
+
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.enterContext(override_settings(REPORT_CACHE_DIR=cache_dir.name))
+
+    def build(self, version):
+        artifact = ReportArtifact(self.organization, 'members', {'status': 'all'}, 'pdf', version=version)
+        artifact.build(lambda output: output.write(b'%PDF'))
+        return artifact
+
+    def test_slow_build_of_older_version_keeps_newer_file(self):
+        newer = self.build(5)
+        older = self.build(4)
+        self.assertTrue(newer.exists)
+        self.assertTrue(older.exists)
+
+    def test_build_removes_older_versions(self):
+        older = self.build(4)
+        newer = self.build(5)
+        self.assertFalse(older.exists)
+        self.assertTrue(newer.exists)
+
+
+class SessionRefreshTests(TrackerTestCase):
+    """Active sessions are re-saved at most once per SESSION_REFRESH_INTERVAL."""
+
+    def session_writes(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('tracker:terms'))
+        return [
+            query['sql'] for query in queries.captured_queries
+            if 'django_session' in query['sql'] and not query['sql'].startswith('SELECT')
+        ]
+
+    def test_unchanged_session_is_not_saved_on_every_request(self):
+        self.client.force_login(self.user)
+        self.assertTrue(self.session_writes())
+        self.assertEqual(self.session_writes(), [])
+
+    @override_settings(SESSION_REFRESH_INTERVAL=0)
+    def test_session_is_refreshed_after_the_interval(self):
+        self.client.force_login(self.user)
+        self.session_writes()
+        self.assertTrue(self.session_writes())
+
+
+class GenerateLoadDataTests(TestCase):
+    """The load generator links transactions and edit logs to their members."""
+
+    def test_links_rows_without_bulk_insert_returning(self):
+        with without_bulk_insert_returning():
+            call_command(
+                'generate_load_data', members=40, staff=1, batch_size=15, seed=1,
+                edit_logs=1, stdout=StringIO(),
+            )
+        organization = Organization.objects.get(slug='loadtest-1')
+        self.assertEqual(organization.members.count(), 40)
+        self.assertEqual(MemberEditLog.objects.filter(organization=organization).count(), 40)
+        self.assertFalse(Transaction.objects.filter(organization=organization, member__isnull=True).exists())
+        for member in organization.members.all():
+            self.assertEqual(member.paid_total, member.transaction_set.aggregate(total=Sum('amount'))['total'] or 0)
+
+
+class QueryBudgetTests(TrackerTestCase):
+    """Hot views stay within their QUERY_BUDGETS however many members an organization has."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.organization.subscription_status = 'SUBSCRIBED'
+        cls.organization.subscription_expires_at = timezone.now() + timedelta(days=30)
+        cls.organization.save()
+        OrganizationUser.objects.create(organization=cls.organization, user=cls.user, role='owner')
+        for number in range(30):
+            member = Member.objects.create(organization=cls.organization, name=f'Member {number:02d}')
+            Transaction.objects.create(
+                organization=cls.organization, member=member, amount=Decimal('500.00'),
+                date=date.today(), added_by=cls.user,
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def assertWithinBudget(self, view_name, method='get', data=None):
+        """Request a view cold (empty caches) and check its query count against the budget."""
+        url = reverse(view_name, kwargs={'org_slug': self.organization.slug})
+        headers = {}
+        if view_name.startswith('api:'):
+            # The mobile app authenticates with JWT rather than the session
+            self.client.logout()
+            headers['HTTP_AUTHORIZATION'] = f'Bearer {AccessToken.for_user(self.user)}'
+        with query_budget(get_query_budget(view_name), view_name):
+            if method == 'post':
+                response = self.client.post(url, data, content_type='application/json', **headers)
+            else:
+                response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_dashboard(self):
+        self.assertWithinBudget('tracker:dashboard')
+
+    def test_daily_collection(self):
+        self.assertWithinBudget('tracker:daily_collection')
+
+    def test_api_member_list(self):
+        self.assertWithinBudget('api:member_list')
+
+    def test_api_transaction_list(self):
+        self.assertWithinBudget('api:transaction_list')
+
+    def test_api_bulk_payment(self):
+        payments = [
+            {'member_id': member_id, 'payment_amount': '100.00'}
+            for member_id in Member.objects.filter(organization=self.organization).values_list('pk', flat=True)
+        ]
+        response = self.assertWithinBudget('api:bulk_payment', 'post', {'payments': payments})
+        self.assertEqual(response.json()['data']['success_count'], 30)
+
+
+class ConditionalGetTests(TrackerTestCase):
+    """API lists answer 304 until the organization's data changes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        OrganizationUser.objects.create(organization=cls.organization, user=cls.user, role='owner')
+        cls.organization.subscription_status = 'SUBSCRIBED'
+        cls.organization.subscription_expires_at = timezone.now() + timedelta(days=30)
+        cls.organization.save()
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('api:member_list', kwargs={'org_slug': self.organization.slug})
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.user)}'}
+
+    def test_not_modified_until_a_write(self):
+        first = self.client.get(self.url, **self.auth)
+        self.assertEqual(first.status_code, 200)
+        etag = first['ETag']
+
+        cached = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, **self.auth)
+        self.assertEqual(cached.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_member()
+        changed = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, **self.auth)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+
+    def test_subscription_status_is_not_conditional(self):
+        url = reverse('api:subscription_status', kwargs={'org_slug': self.organization.slug})
+        first = self.client.get(url, **self.auth)
+        self.assertEqual(first.status_code, 200)
+        self.assertFalse(first.has_header('ETag'))
+        again = self.client.get(url, HTTP_IF_NONE_MATCH='"anything"', **self.auth)
+        self.assertEqual(again.status_code, 200)
+
+
+class OrganizationMembershipTests(TrackerTestCase):
+    """get_org_membership() runs one query per request and organization."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.membership = OrganizationUser.objects.create(organization=cls.organization, user=cls.user, role='owner')
+        cls.other = Organization.objects.create(name='Org Two', slug='org-two')
+        cls.organization.subscription_status = 'SUBSCRIBED'
+        cls.organization.subscription_expires_at = timezone.now() + timedelta(days=30)
+        cls.organization.save()
+
+    def test_memoized_per_organization(self):
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(get_org_membership(user, self.organization), self.membership)
+            self.assertTrue(is_org_owner(user, self.organization))
+            self.assertTrue(is_org_admin(user, self.organization))
+        with self.assertNumQueries(1):
+            self.assertIsNone(get_org_membership(user, self.other))
+            self.assertFalse(is_org_admin(user, self.other))
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_org_role(user, self.organization), 'owner')
+            self.assertIsNone(get_user_org_role(user, self.other))
+
+    def test_not_shared_between_users(self):
+        outsider = User.objects.create_user('outsider')
+        self.assertIsNotNone(get_org_membership(User.objects.get(pk=self.user.pk), self.organization))
+        self.assertIsNone(get_org_membership(outsider, self.organization))
+
+    def test_one_membership_query_per_request(self):
+        self.client.force_login(self.user)
+        url = reverse('tracker:daily_collection', kwargs={'org_slug': self.organization.slug})
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        membership_queries = [
+            query['sql'] for query in queries.captured_queries
+            if 'FROM "tracker_organizationuser"' in query['sql'] and '"user_id" =' in query['sql']
+        ]
+        self.assertEqual(len(membership_queries), 1, membership_queries)
+
+
+class ExcelExportTests(TrackerTestCase):
+    """Streamed write-only exports open as ordinary workbooks with the expected rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        OrganizationUser.objects.create(organization=cls.organization, user=cls.user, role='owner')
+        cls.organization.subscription_status = 'SUBSCRIBED'
+        cls.organization.subscription_expires_at = timezone.now() + timedelta(days=30)
+        cls.organization.save()
+
+    def setUp(self):
+        amina = self.create_member('Amina', pledge='1000.00', phone='0712000001', course='Medicine')
+        self.create_member('Baraka', pledge='500.00')
+        self.create_transaction(amina, '400.00')
+
+    def open_export(self, view_name, **extra):
+        response = self.client.get(reverse(view_name, kwargs={'org_slug': self.organization.slug}), **extra)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        return openpyxl.load_workbook(BytesIO(b''.join(response.streaming_content)))
+
+    def table(self, sheet):
+        rows = list(sheet.iter_rows(values_only=True))
+        self.assertEqual(rows[0][0], f'{self.organization.name} - {sheet.title.split()[0]} Report')
+        return rows[3], rows[4:]
+
+    def test_api_members_export(self):
+        workbook = self.open_export('api:export_members_excel', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        header, rows = self.table(workbook['Members Data'])
+        self.assertEqual(header[:4], ('Name', 'Pledge (TZS)', 'Paid (TZS)', 'Remaining (TZS)'))
+        self.assertEqual([row[:4] for row in rows], [('Amina', 1000, 400, 600), ('Baraka', 500, 0, 500)])
+        self.assertEqual(rows[0][8], 'Incomplete')
+
+    def test_api_transactions_export(self):
+        workbook = self.open_export('api:export_transactions_excel', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        header, rows = self.table(workbook['Transactions Data'])
+        self.assertEqual(header, ('Date', 'Member Name', 'Amount (TZS)', 'Note', 'Added By', 'Created Date'))
+        self.assertEqual([(row[1], row[2], row[4]) for row in rows], [('Amina', 400, 'collector')])
+
+    def test_web_members_report(self):
+        self.client.force_login(self.user)
+        workbook = self.open_export('tracker:export_excel')
+        self.assertEqual(workbook.sheetnames, ['Members Data', 'Summary'])
+        header, rows = self.table(workbook['Members Data'])
+        self.assertEqual(header[:5], ('Name', 'Phone', 'Email', 'Course', 'Year'))
+        self.assertEqual([row[0] for row in rows], ['Amina', 'Baraka'])
+        self.assertEqual(rows[0][1:4], ('0712000001', None, 'Medicine'))
+        summary = dict(workbook['Summary'].iter_rows(values_only=True))
+        self.assertEqual(summary['Total Members'], 2)
+
+
+class KeysetPaginationTests(TrackerTestCase):
+    """Tampered cursors fall back to the first page instead of failing the request."""
+
+    tampered = [
+        encode_cursor(['not-a-date', 'not-an-id']),
+        encode_cursor(['2026-01-01', 10 ** 30]),
+        encode_cursor([None, 1]),
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        OrganizationUser.objects.create(organization=cls.organization, user=cls.user, role='owner')
+        cls.organization.subscription_status = 'SUBSCRIBED'
+        cls.organization.subscription_expires_at = timezone.now() + timedelta(days=30)
+        cls.organization.save()
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.create_transaction(self.create_member(), '100.00')
+
+    def test_decode_rejects_wrong_types(self):
+        queryset = Transaction.objects.all()
+        for cursor in self.tampered:
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                keyset_paginate(queryset, ('-date', '-id'), after=cursor)
+        page = keyset_paginate(queryset, ('-date', '-id'), limit=1)
+        self.assertEqual(len(keyset_paginate(queryset, ('-date', '-id'), before=encode_cursor(
+            [page.object_list[0].date, page.object_list[0].id],
+        ))), 0)
+
+    def test_web_pages_ignore_tampered_cursors(self):
+        urls = [
+            reverse('tracker:admin_log', kwargs={'org_slug': self.organization.slug}),
+            reverse('tracker:daily_collection_rows', kwargs={'org_slug': self.organization.slug}),
+        ]
+        for url in urls:
+            for param in ('after', 'before', 'edit_after'):
+                for cursor in self.tampered:
+                    with self.subTest(url=url, param=param, cursor=cursor):
+                        self.assertEqual(self.client.get(url, {param: cursor}).status_code, 200)
+
+    def test_api_lists_reject_tampered_cursors(self):
+        self.client.logout()
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.user)}'}
+        for view_name in ('api:member_list', 'api:transaction_list'):
+            url = reverse(view_name, kwargs={'org_slug': self.organization.slug})
+            self.assertEqual(self.client.get(url, {'cursor': ''}, **auth).status_code, 200)
+            for cursor in self.tampered + ['not-base64!']:
+                with self.subTest(view_name=view_name, cursor=cursor):
+                    response = self.client.get(url, {'cursor': cursor}, **auth)
+                    self.assertEqual(response.status_code, 400)
+                    self.assertFalse(response.json()['success'])
+
+
+class RequestMetricsRegistryTests(TestCase):
+    """Worker processes publish their metrics to the cache and the snapshot merges them."""
+
+    def setUp(self):
+        cache.clear()
+
+    def worker(self, name):
+        worker = RequestMetricsRegistry()
+        worker.process = name
+        return worker
+
+    def sample(self, queries, **kwargs):
+        return dict({
+            'view': 'tracker:dashboard', 'tenant': 'org-one', 'method': 'GET', 'path': '/org-one/',
+            'status': 200, 'queries': queries, 'db_ms': 1.0, 'total_ms': 10.0, 'bytes': 100,
+            'over_budget': False, 'timestamp': time.time(),
+        }, **kwargs)
+
+    def test_snapshot_merges_published_workers(self):
+        first, second = self.worker('web:1'), self.worker('web:2')
+        first.record(self.sample(4))
+        second.record(self.sample(8))
+        second.record(self.sample(9, total_ms=2000.0))
+        first.publish()
+        second.publish()
+
+        snapshot = first.snapshot()
+        self.assertEqual(snapshot['processes'], ['web:1', 'web:2'])
+        [row] = snapshot['views']
+        self.assertEqual((row['requests'], row['max_queries'], row['avg_queries']), (3, 9, 7.0))
+        self.assertEqual(len(snapshot['slow_requests']), 1)
+
+    def test_reset_clears_every_worker(self):
+        first, second = self.worker('web:1'), self.worker('web:2')
+        second.record(self.sample(8))
+        second.publish()
+        first.reset_all()
+        self.assertEqual(first.snapshot()['views'], [])
+        second.publish()
+        self.assertEqual(second.snapshot()['views'], [])
+
+
+class PlatformMetricsTests(TrackerTestCase):
+    """The Bossin dashboard snapshot follows payment request changes."""
+
+    def setUp(self):
+        cache.clear()
+
+    def create_request(self, amount, status='approved', **dates):
+        payment_request = PaymentRequest.objects.create(
+            organization=self.organization, submitted_by=self.user, amount_tzs=Decimal(amount),
+            months=1, category_snapshot='organization', status=status,
+        )
+        if dates:
+            PaymentRequest.objects.filter(pk=payment_request.pk).update(**dates)
+        return payment_request
+
+    def test_this_month_revenue_counts_by_approval_month(self):
+        now = timezone.now()
+        # Requested two months ago, approved now
+        self.create_request('30000.00', created_at=now - timedelta(days=62), updated_at=now)
+        self.create_request('5000.00', status='pending')
+        refresh_payment_metrics()
+
+        snapshot = get_platform_metrics()
+        this_month = timezone.localdate().strftime('%Y-%m')
+        self.assertEqual(snapshot.pending_requests, 1)
+        self.assertEqual(snapshot.total_revenue, Decimal('30000.00'))
+        self.assertEqual(Decimal(snapshot.approved_revenue_by_month[this_month]), Decimal('30000.00'))
+        self.assertNotIn(this_month, snapshot.revenue_by_month)
+
+    def decline_in_admin(self, *payment_requests):
+        admin_user = User.objects.create_superuser('root', 'root@example.com', 'pass')
+        self.client.force_login(admin_user)
+        return self.client.post(reverse('admin:tracker_paymentrequest_changelist'), {
+            'action': 'decline_requests',
+            '_selected_action': [payment_request.pk for payment_request in payment_requests],
+        })
+
+    def test_admin_decline_refreshes_pending_badge(self):
+        pending = self.create_request('5000.00', status='pending')
+        self.create_request('7000.00', status='pending')
+        self.assertEqual(pending_requests_count(), 2)
+
+        self.decline_in_admin(pending)
+        self.assertEqual(pending_requests_count(), 1)
+
+    def test_admin_decline_refreshes_snapshot(self):
+        approved = self.create_request('30000.00')
+        pending = self.create_request('5000.00', status='pending')
+        refresh_payment_metrics()
+
+        self.decline_in_admin(approved, pending)
+        snapshot = get_platform_metrics()
+        self.assertEqual(snapshot.pending_requests, 0)
+        self.assertEqual(snapshot.total_revenue, Decimal('0.00'))
+        self.assertEqual(snapshot.revenue_by_month, {})
+        self.assertEqual(snapshot.approved_revenue_by_month, {})
+
+
+class MemberStatusTests(TrackerTestCase):
+    """The stored Member.status follows paid_total and pledge on every write path."""
+
+    def test_pledge_change_updates_status(self):
+        member = self.create_member(pledge='1000.00')
+        self.create_transaction(member, '1000.00')
+        member.refresh_from_db()
+        member.pledge = Decimal('800.00')
+        member.save(update_fields=['pledge'])
+        self.assertLedger(member, '1000.00', Member.STATUS_EXCEEDED)
+        member.pledge = Decimal('2000.00')
+        member.save()
+        self.assertLedger(member, '1000.00', Member.STATUS_INCOMPLETE)
+
+    def test_bulk_recalculation_updates_status(self):
+        member = self.create_member(pledge='1000.00')
+        self.create_transaction(member, '1000.00')
+        # Drift left behind by a write that bypassed Transaction.delete()
+        Transaction.objects.filter(member=member).update(amount=Decimal('250.00'))
+        recalculate_paid_totals([member.pk])
+        self.assertLedger(member, '250.00', Member.STATUS_INCOMPLETE)
+
+    def test_fix_member_totals_updates_status(self):
+        member = self.create_member(pledge='1000.00')
+        self.create_transaction(member, '400.00')
+        Member.objects.filter(pk=member.pk).update(paid_total=Decimal('0.00'), status=Member.STATUS_NOT_STARTED)
+        call_command('fix_member_totals', stdout=StringIO())
+        self.assertLedger(member, '400.00', Member.STATUS_INCOMPLETE)
+
+    def test_status_filters_use_stored_status(self):
+        self.create_transaction(self.create_member('Amina'), '1000.00')
+        self.create_transaction(self.create_member('Baraka'), '1500.00')
+        self.create_transaction(self.create_member('Chausiku'), '10.00')
+        self.create_member('Daudi')
+
+        def names(status_filter):
+            return list(member_queryset(self.organization, status_filter=status_filter).values_list('name', flat=True))
+
+        self.assertEqual(names('complete'), ['Amina', 'Baraka'])
+        self.assertEqual(names('exceeded'), ['Baraka'])
+        self.assertEqual(names('incomplete'), ['Chausiku'])
+        self.assertEqual(names('not_started'), ['Daudi'])
+
+
+class MemberSearchTests(TrackerTestCase):
+    """The member search index matches what the icontains search used to."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        OrganizationUser.objects.create(organization=cls.organization, user=cls.user, role='owner')
+        cls.organization.subscription_status = 'SUBSCRIBED'
+        cls.organization.subscription_expires_at = timezone.now() + timedelta(days=30)
+        cls.organization.save()
+        Member.objects.create(
+            organization=cls.organization, name='Amina Mwambene', phone='0712000001',
+            email='amina@gmail.com', course='Civil Engineering',
+        )
+        Member.objects.create(
+            organization=cls.organization, name='Baraka Juma', phone='+255 754 123 456',
+            email='baraka.juma@udsm.ac.tz', course='Medicine',
+        )
+
+    def search(self, text, include_course=False):
+        queryset = filter_members(
+            Member.objects.filter(organization=self.organization), search=text,
+            organization=self.organization, include_course=include_course,
+        )
+        return sorted(queryset.values_list('name', flat=True))
+
+    def test_name_words_and_misspellings(self):
+        self.assertEqual(self.search('mwamb'), ['Amina Mwambene'])
+        self.assertEqual(self.search('Mwambeni'), ['Amina Mwambene'])
+        self.assertEqual(self.search('juma baraka'), ['Baraka Juma'])
+
+    def test_phone_digits_anywhere(self):
+        self.assertEqual(self.search('000001'), ['Amina Mwambene'])
+        self.assertEqual(self.search('0754123'), ['Baraka Juma'])
+        self.assertEqual(self.search('123456'), ['Baraka Juma'])
+
+    def test_email_and_domain(self):
+        self.assertEqual(self.search('gmail'), ['Amina Mwambene'])
+        self.assertEqual(self.search('baraka.juma@udsm'), ['Baraka Juma'])
+        self.assertEqual(self.search('udsm'), ['Baraka Juma'])
+
+    def test_course_only_when_asked(self):
+        self.assertEqual(self.search('Engineering'), [])
+        self.assertEqual(self.search('Engineering', include_course=True), ['Amina Mwambene'])
+
+    def test_edit_members_searches_course(self):
+        self.client.force_login(self.user)
+        url = reverse('tracker:edit_members', kwargs={'org_slug': self.organization.slug})
+        response = self.client.get(url, {'search': 'Engineering'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Amina Mwambene')
+        self.assertNotContains(response, 'Baraka Juma')
+
+    def test_course_edit_reindexes(self):
+        member = Member.objects.get(name='Baraka Juma')
+        member.course = 'Nursing'
+        member.save(update_fields=['course'])
+        self.assertEqual(self.search('nursing', include_course=True), ['Baraka Juma'])
+
+
+class SyncTests(TrackerTestCase):
+    """Delta sync returns changed rows and tombstones, or asks the client to reset."""
+
+    def backdate(self, days=1):
+        past = timezone.now() - timedelta(days=days)
+        Member.objects.filter(organization=self.organization).update(updated_at=past)
+        Transaction.objects.filter(organization=self.organization).update(updated_at=past)
+        return past
+
+    def test_returns_changed_rows_only(self):
+        unchanged = self.create_member('Amina')
+        changed = self.create_member('Baraka')
+        since = self.backdate() + timedelta(hours=1)
+        self.create_transaction(changed, '100.00')
+
+        token = issue_token(self.organization, now=since)
+        changes = changes_since(self.organization, read_token(token, self.organization))
+        self.assertEqual([member.pk for member in changes['members']], [changed.pk])
+        self.assertNotIn(unchanged, changes['members'])
+        self.assertEqual(len(changes['transactions']), 1)
+        self.assertEqual(changes['deleted'], {'members': [], 'transactions': []})
+
+    def test_deletes_leave_tombstones(self):
+        member = self.create_member('Amina')
+        other = self.create_member('Baraka')
+        transaction = self.create_transaction(other, '100.00')
+        since = self.backdate() + timedelta(hours=1)
+        transaction_id, member_id = transaction.pk, member.pk
+        transaction.delete()
+        member.delete()
+
+        changes = changes_since(self.organization, since)
+        self.assertEqual(changes['deleted'], {'members': [member_id], 'transactions': [transaction_id]})
+        self.assertEqual(DeletedRecord.objects.filter(organization=self.organization).count(), 2)
+
+    def test_reset_for_missing_foreign_or_expired_tokens(self):
+        other = Organization.objects.create(name='Org Two', slug='org-two')
+        self.assertIsNone(read_token('', self.organization))
+        self.assertIsNone(read_token('not-a-token', self.organization))
+        self.assertIsNone(read_token(issue_token(other), self.organization))
+        self.assertIsNone(changes_since(self.organization, None))
+        expired = timezone.now() - tombstone_retention() - timedelta(days=1)
+        self.assertIsNone(changes_since(self.organization, expired))
+
+    @override_settings(SYNC_MAX_CHANGES=2)
+    def test_reset_when_too_many_rows_changed(self):
+        since = timezone.now() - timedelta(hours=1)
+        for name in ('Amina', 'Baraka'):
+            self.create_member(name)
+        self.assertIsNotNone(changes_since(self.organization, since, include_transactions=False))
+        self.create_member('Chausiku')
+        self.assertIsNone(changes_since(self.organization, since, include_transactions=False))
+
+    def test_prune_removes_old_tombstones(self):
+        DeletedRecord.record(self.organization.pk, DeletedRecord.KIND_MEMBER, 1)
+        DeletedRecord.objects.update(deleted_at=timezone.now() - tombstone_retention() - timedelta(days=1))
+        DeletedRecord.record(self.organization.pk, DeletedRecord.KIND_MEMBER, 2)
+        self.assertEqual(prune_tombstones(), 1)
+        self.assertEqual(list(DeletedRecord.objects.values_list('object_id', flat=True)), [2])
+
+    def test_sync_endpoint(self):
+        OrganizationUser.objects.create(organization=self.organization, user=self.user, role='owner')
+        self.client.force_login(self.user)
+        url = reverse('api:sync', kwargs={'org_slug': self.organization.slug})
+
+        first = self.client.get(url).json()['data']
+        self.assertTrue(first['reset'])
+        self.create_member('Amina')
+        second = self.client.get(url, {'since': first['token']}).json()['data']
+        self.assertFalse(second['reset'])
+        self.assertEqual([member['name'] for member in second['members']], ['Amina'])
+
+
+class SubscriptionExpiryTests(TrackerTestCase):
+    """Lapsed trials read as NOT_SUBSCRIBED at once and are flipped by expire_subscriptions."""
+
+    def setUp(self):
+        cache.clear()
+        self.started = timezone.now() - timedelta(days=1)
+        Organization.objects.filter(pk=self.organization.pk).update(
+            subscription_status='FREE_TRIAL', trial_started_at=self.started,
+            effective_until=self.started + timedelta(days=Organization.TRIAL_DAYS),
+        )
+        self.organization.refresh_from_db()
+        invalidate_tenant(self.organization.pk, self.organization.slug)
+        self.lapsed = self.organization.effective_until + timedelta(minutes=1)
+
+    def test_lapsed_trial_reads_as_not_subscribed(self):
+        is_active, info = subscription_state(self.organization, now=self.started)
+        self.assertTrue(is_active)
+        self.assertEqual(info['subscription_status'], 'FREE_TRIAL')
+
+        is_active, info = subscription_state(self.organization, now=self.lapsed)
+        self.assertFalse(is_active)
+        self.assertEqual(info['subscription_status'], 'NOT_SUBSCRIBED')
+        self.assertIsNone(info['days_remaining'])
+
+    def test_expire_flips_lapsed_organizations_only(self):
+        active = Organization.objects.create(
+            name='Org Two', slug='org-two', subscription_status='SUBSCRIBED',
+            subscription_expires_at=self.lapsed + timedelta(days=30),
+        )
+        self.assertEqual(expire_subscriptions(now=self.started), [])
+
+        self.assertEqual(expire_subscriptions(now=self.lapsed), [(self.organization.pk, 'org-one')])
+        self.organization.refresh_from_db()
+        self.assertEqual(self.organization.subscription_status, 'NOT_SUBSCRIBED')
+        self.assertIsNone(self.organization.effective_until)
+        active.refresh_from_db()
+        self.assertEqual(active.subscription_status, 'SUBSCRIBED')
+
+        self.assertEqual(expire_subscriptions(now=self.lapsed), [])
+
+    def test_expire_invalidates_tenant_and_data_version(self):
+        self.assertEqual(get_tenant('org-one').subscription_status, 'FREE_TRIAL')
+        version, _ = get_data_version(self.organization.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            expire_subscriptions(now=self.lapsed)
+
+        self.assertEqual(get_tenant('org-one').subscription_status, 'NOT_SUBSCRIBED')
+        self.assertEqual(get_data_version(self.organization.pk)[0], version + 1)
+
+
+class ThemeContextCacheTests(TrackerTestCase):
+    """Cached theme values and tenants are dropped when the theme changes."""
+
+    def setUp(self):
+        cache.clear()
+        self.theme = OrganizationTheme.objects.create(
+            organization=self.organization, navbar_title='Old title', primary_color='#111111',
+        )
+        invalidate_tenant(self.organization.pk, self.organization.slug)
+
+    def test_values_are_cached(self):
+        self.assertEqual(get_theme_values(get_tenant('org-one'))['primary_color'], '#111111')
+        OrganizationTheme.objects.filter(pk=self.theme.pk).update(primary_color='#222222')
+        self.assertEqual(get_theme_values(Organization.objects.get(pk=self.organization.pk))['primary_color'], '#111111')
+
+        invalidate_theme_context(self.organization.pk)
+        self.assertEqual(get_theme_values(Organization.objects.get(pk=self.organization.pk))['primary_color'], '#222222')
+
+    def test_theme_save_invalidates_values_and_tenant(self):
+        self.assertEqual(get_theme_values(get_tenant('org-one'))['navbar_title'], 'Old title')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.theme.navbar_title = 'New title'
+            self.theme.primary_color = '#222222'
+            self.theme.save()
+
+        tenant = get_tenant('org-one')
+        self.assertEqual(tenant.theme.primary_color, '#222222')
+        values = get_theme_values(tenant)
+        self.assertEqual(values['navbar_title'], 'New title')
+        self.assertEqual(values['primary_color'], '#222222')
+
+    def test_theme_delete_falls_back_to_defaults(self):
+        get_theme_values(get_tenant('org-one'))
+        self.theme.delete()
+        self.assertEqual(get_theme_values(get_tenant('org-one')), {})
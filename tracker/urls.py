@@ -8,6 +8,7 @@ tenant_urlpatterns = [
     # Main views
     path('', views.dashboard, name='dashboard'),
     path('daily-collection/', views.daily_collection, name='daily_collection'),
+    path('daily-collection/rows/', views.daily_collection_rows, name='daily_collection_rows'),
     path('member/<int:member_id>/', views.member_detail, name='member_detail'),
     path('member/add/', views.add_member, name='add_member'),
     path('member/<int:member_id>/edit/', views.edit_member, name='edit_member'),
@@ -18,6 +19,9 @@ tenant_urlpatterns = [
     path('export/member-edit-log/pdf/', views.export_member_edit_log_pdf, name='export_member_edit_log_pdf'),
     path('health/', views.health_check, name='health_check'),
     path('import-excel/', views.import_excel, name='import_excel'),
+    path('import-excel/jobs/<int:job_id>/', views.import_job_detail, name='import_job_detail'),
+    path('import-excel/jobs/<int:job_id>/status/', views.import_job_status, name='import_job_status'),
+    path('import-excel/jobs/<int:job_id>/errors/', views.import_job_errors, name='import_job_errors'),
     path('ajax/update-transaction/', views.update_transaction_ajax, name='update_transaction_ajax'),
     path('ajax/delete-transaction/', views.delete_transaction_ajax, name='delete_transaction_ajax'),
     path('export/excel/', views.export_excel, name='export_excel'),
@@ -37,6 +41,7 @@ tenant_urlpatterns = [
     path('ajax/add-members/', views.add_member_ajax, name='add_member_ajaxs'),
     path('ajax/update-transaction-note/', views.update_transaction_note_ajax, name='update_transaction_note_ajax'),
     path('ajax/record-daily-payment/', views.record_daily_payment_ajax, name='record_daily_payment_ajax'),
+    path('ajax/replay-daily-payments/', views.replay_daily_payments, name='replay_daily_payments'),
     
     # Organization Admin URLs
     path('admin/', views.org_admin_dashboard, name='org_admin_dashboard'),
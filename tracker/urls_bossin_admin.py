@@ -36,5 +36,10 @@ urlpatterns = [
     
     # System Settings
     path('settings/', views_bossin_admin.bossin_settings, name='settings'),
+
+    # Request metrics
+    path('metrics/', views_bossin_admin.bossin_metrics, name='metrics'),
+    path('metrics/json/', views_bossin_admin.bossin_metrics_json, name='metrics_json'),
+    path('metrics/reset/', views_bossin_admin.bossin_metrics_reset, name='metrics_reset'),
 ]
 
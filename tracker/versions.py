@@ -0,0 +1,52 @@
+"""
+Per-organization data version.
+
+Every write that can change what an organization's API responses contain
+(members, transactions, the organization, its theme, staff and payment
+requests) bumps a counter in OrganizationDataVersion. Model signals cover
+single saves and deletes; bulk writers (payments, the importer,
+expire_subscriptions, fix_member_totals) call bump_data_version() next to
+their cache invalidation.
+
+The bump runs after the transaction commits: a response computed from the
+new rows may carry the previous version for a moment, which only costs the
+client one extra download, never a stale 304.
+"""
+
+from django.db import IntegrityError, transaction as db_transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OrganizationDataVersion
+
+
+def get_data_version(organization_id):
+    """(version, updated_at) of an organization; (0, None) before its first write."""
+    row = OrganizationDataVersion.objects.filter(
+        organization_id=organization_id,
+    ).values_list('version', 'updated_at').first()
+    return row or (0, None)
+
+
+def _bump(organization_id):
+    now = timezone.now()
+    bumped = OrganizationDataVersion.objects.filter(organization_id=organization_id).update(
+        version=F('version') + 1, updated_at=now,
+    )
+    if bumped:
+        return
+    try:
+        with db_transaction.atomic():
+            OrganizationDataVersion.objects.create(organization_id=organization_id, version=1, updated_at=now)
+    except IntegrityError:
+        # Created concurrently, or the organization was deleted meanwhile
+        OrganizationDataVersion.objects.filter(organization_id=organization_id).update(
+            version=F('version') + 1, updated_at=now,
+        )
+
+
+def bump_data_version(organization_id):
+    """Bump the organization's data version once the current transaction commits."""
+    if organization_id is None:
+        return
+    db_transaction.on_commit(lambda: _bump(organization_id))
@@ -2,7 +2,7 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login, authenticate, logout
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
+from django.http import Http404, JsonResponse, HttpResponse
 from django.views.decorators.http import require_POST
 from django.views.decorators.csrf import csrf_exempt
 from django.db.models import Sum, Q, Count, F
@@ -14,12 +14,21 @@ import openpyxl
 from io import BytesIO
 from django.db import connection
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 
-from .models import Member, Transaction, OrganizationUser, Organization, OrganizationTheme, MemberEditLog, PaymentRequest, SystemSettings
+from .models import Member, Transaction, OrganizationUser, Organization, OrganizationTheme, MemberEditLog, PaymentRequest, SystemSettings, ImportJob
 from .forms import CustomLoginForm, MemberForm, QuickMemberForm, TransactionForm, MemberUpdateForm, ExcelImportForm, SignUpForm, AddOrganizationUserForm
 # Removed Django's staff_member_required - using org_staff_required instead
 from django.contrib.auth.models import User
-from .permissions import org_staff_required, org_admin_required, org_owner_required, is_org_owner, is_org_admin
+from .permissions import org_staff_required, org_admin_required, org_owner_required, is_org_owner, is_org_admin, is_org_member, org_member_required
+from .queries import filter_members, member_queryset
+from .pagination import InvalidCursor, keyset_paginate
+from .payments import clean_idempotency_key, record_bulk_payments, record_payment
+from .stats import get_member_stats
+from .importer import import_members_from_excel
+from .jobs import create_import_job, import_job_progress
+from .exports import build_members_report_workbook, save_to_tempfile, xlsx_response
+from .reports import ReportArtifact
 import secrets
 import string
 
@@ -264,12 +273,7 @@ def edit_members(request, org_slug=None):
         # Handle search (keep for backend if needed)
         search_query = request.GET.get('search', '').strip()
         if search_query:
-            members = members.filter(
-                Q(name__icontains=search_query) |
-                Q(phone__icontains=search_query) |
-                Q(email__icontains=search_query) |
-                Q(course__icontains=search_query)
-            )
+            members = filter_members(members, search=search_query, organization=tenant, include_course=True)
 
         # Calculate statistics for quick stats - FOR THIS ORGANIZATION ONLY
         total_members = Member.objects.filter(organization=tenant).count()
@@ -398,6 +402,7 @@ def update_member_ajaxs(request, org_slug=None):
                 member.year = new_year
 
         # Update paid amount (admin and owner only)
+        paid_override = None
         if 'paid_total' in data:
             if not is_org_admin(request.user, tenant):
                 # If non-admin user somehow sent paid_total, ignore it and continue
@@ -410,11 +415,15 @@ def update_member_ajaxs(request, org_slug=None):
                         return JsonResponse({'success': False, 'error': 'Paid amount cannot be negative'})
                     if member.paid_total != paid_amount:
                         changes.append(('paid_total', str(member.paid_total), str(paid_amount)))
-                        member.paid_total = paid_amount
+                        paid_override = paid_amount
                 except (ValueError, TypeError):
                     return JsonResponse({'success': False, 'error': 'Invalid paid amount'})
 
         member.save()
+        if paid_override is not None:
+            # A full save keeps the ledger's paid_total; a manual override is written explicitly
+            member.paid_total = paid_override
+            member.save(update_fields=['paid_total', 'updated_at'])
         
         # Log all changes to MemberEditLog
         for field_name, before_val, after_val in changes:
@@ -634,7 +643,7 @@ def export_excel(request, org_slug=None):
             return redirect_to_dashboard(request)
         
         # Check if user is member of this organization
-        if not OrganizationUser.objects.filter(user=request.user, organization=tenant, is_active=True).exists():
+        if not is_org_member(request.user, tenant):
             messages.error(request, 'You are not a member of this organization')
             return redirect_to_dashboard(request)
         
@@ -642,211 +651,14 @@ def export_excel(request, org_slug=None):
         search_query = request.GET.get('search', '')
         filter_status = request.GET.get('filter', '')
 
-        # Get members FOR THIS ORGANIZATION ONLY
-        members = []
-        try:
-            all_members = Member.objects.filter(organization=tenant)
-            for member in all_members:
-                try:
-                    if member.pledge is None or member.paid_total is None:
-                        if member.pledge is None:
-                            member.pledge = Decimal('70000.00')
-                        if member.paid_total is None:
-                            member.paid_total = Decimal('0.00')
-                        member.save()
-                    members.append(member)
-                except Exception:
-                    continue
-        except Exception:
-            members = []
-
-        # Apply search filter
-        if search_query and members:
-            filtered_members = []
-            for member in members:
-                try:
-                    if (search_query.lower() in member.name.lower() or
-                        (member.phone and search_query in member.phone) or
-                        (member.email and search_query.lower() in member.email.lower())):
-                        filtered_members.append(member)
-                except:
-                    continue
-            members = filtered_members
-
-        # Apply status filter
-        if filter_status and members:
-            filtered_members = []
-            for member in members:
-                try:
-                    if filter_status == 'incomplete' and member.paid_total > 0 and member.paid_total < member.pledge:
-                        filtered_members.append(member)
-                    elif filter_status == 'complete' and member.paid_total >= member.pledge:
-                        filtered_members.append(member)
-                    elif filter_status == 'pledged' and member.pledge > 70000:
-                        filtered_members.append(member)
-                    elif filter_status == 'not_started' and member.paid_total == 0:
-                        filtered_members.append(member)
-                    elif filter_status == 'exceeded' and member.paid_total > member.pledge:
-                        filtered_members.append(member)
-                except:
-                    continue
-            members = filtered_members
-
-        # Create workbook and worksheet
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Members Data"
-
-        # Add organization header
-        ws.merge_cells('A1:J1')
-        org_header = ws['A1']
-        org_header.value = f"{tenant.name} - Members Report"
-        org_header.font = Font(bold=True, size=14, color="FFFFFF")
-        org_header.fill = PatternFill(start_color="2c3e50", end_color="2c3e50", fill_type="solid")
-        org_header.alignment = Alignment(horizontal='center', vertical='center')
-        ws.row_dimensions[1].height = 25
-        
-        # Add export date
-        ws.merge_cells('A2:J2')
-        date_cell = ws['A2']
-        date_cell.value = f"Exported on {date.today().strftime('%B %d, %Y')}"
-        date_cell.font = Font(italic=True, size=10, color="666666")
-        date_cell.alignment = Alignment(horizontal='center', vertical='center')
-        ws.row_dimensions[2].height = 15
-
-        # Define styles
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        center_alignment = Alignment(horizontal='center', vertical='center')
-        currency_alignment = Alignment(horizontal='right', vertical='center')
-
-        # Headers (starting at row 4 after org header and date)
-        headers = [
-            'Name', 'Phone', 'Email', 'Course', 'Year',
-            'Pledge Amount', 'Paid Amount', 'Balance', 'Status', 'Progress %'
-        ]
-
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=4, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.border = border
-            cell.alignment = center_alignment
-
-        # Data rows (starting at row 5)
-        for row_num, member in enumerate(members, 5):
-            try:
-                pledge = member.pledge if member.pledge is not None else Decimal('70000.00')
-                paid = member.paid_total if member.paid_total is not None else Decimal('0.00')
-                balance = pledge - paid
-                progress = (paid / pledge * 100) if pledge > 0 else 0
-
-                # Determine status
-                if paid == 0:
-                    status = "Not Started"
-                elif paid < pledge:
-                    status = "Incomplete"
-                elif paid == pledge:
-                    status = "Complete"
-                else:
-                    status = "Exceeded"
-
-                # Data
-                data = [
-                    member.name,
-                    member.phone or '',
-                    member.email or '',
-                    member.course or '',
-                    member.year or '',
-                    float(pledge),
-                    float(paid),
-                    float(balance),
-                    status,
-                    f"{progress:.1f}%"
-                ]
-
-                for col, value in enumerate(data, 1):
-                    cell = ws.cell(row=row_num, column=col, value=value)
-                    cell.border = border
-
-                    # Special formatting for currency columns
-                    if col in [6, 7, 8]:  # Pledge, Paid, Balance
-                        cell.number_format = '#,##0.00'
-                        cell.alignment = currency_alignment
-                    else:
-                        cell.alignment = center_alignment
-
-            except Exception:
-                continue
+        # Members FOR THIS ORGANIZATION ONLY, filtered in SQL and streamed to the sheet
+        members_qs = member_queryset(tenant, search=search_query, status_filter=filter_status)
+        workbook = build_members_report_workbook(tenant, members_qs)
 
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-
-        # Add summary sheet
-        summary_ws = wb.create_sheet("Summary")
-
-        # Calculate totals
-        total_members = len(members)
-        total_pledged = sum(member.pledge or Decimal('70000.00') for member in members)
-        total_collected = sum(member.paid_total or Decimal('0.00') for member in members)
-        # Get organization's target amount from theme
-        try:
-            target_amount = Decimal(str(tenant.theme.target_amount))
-        except:
-            target_amount = Decimal('210000.00')
-        progress_percentage = (total_collected / target_amount * 100) if target_amount > 0 else 0
-
-        # Summary data
-        summary_data = [
-            ['FUNDRAISING SUMMARY', ''],
-            ['', ''],
-            ['Total Members', total_members],
-            ['Total Pledged', f"TSh {total_pledged:,.2f}"],
-            ['Total Collected', f"TSh {total_collected:,.2f}"],
-            ['Target Amount', f"TSh {target_amount:,.2f}"],
-            ['Progress', f"{progress_percentage:.1f}%"],
-            ['', ''],
-            ['Export Date', date.today().strftime('%Y-%m-%d')],
-        ]
-
-        for row_num, (label, value) in enumerate(summary_data, 1):
-            summary_ws.cell(row=row_num, column=1, value=label).font = Font(bold=True)
-            summary_ws.cell(row=row_num, column=2, value=value)
-
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        # Create response
-        response = HttpResponse(
-            output.read(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
         # Include organization name in filename
         org_name_slug = tenant.slug.replace('-', '_')
         filename = f"{org_name_slug}_members_data_{date.today().strftime('%Y%m%d')}.xlsx"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-
-        return response
+        return xlsx_response(save_to_tempfile(workbook), filename)
 
     except Exception as e:
         messages.error(request, f"Error exporting Excel: {str(e)}")
@@ -862,7 +674,7 @@ def export_pdf(request, org_slug=None):
             return redirect_to_dashboard(request)
         
         # Check if user is member of this organization
-        if not OrganizationUser.objects.filter(user=request.user, organization=tenant, is_active=True).exists():
+        if not is_org_member(request.user, tenant):
             messages.error(request, 'You are not a member of this organization')
             return redirect_to_dashboard(request)
         
@@ -870,355 +682,311 @@ def export_pdf(request, org_slug=None):
         search_query = request.GET.get('search', '')
         filter_status = request.GET.get('filter', '')
 
-        # Get members FOR THIS ORGANIZATION ONLY
-        members = []
-        try:
-            all_members = Member.objects.filter(organization=tenant)
-            for member in all_members:
-                try:
-                    if member.pledge is None or member.paid_total is None:
-                        if member.pledge is None:
-                            member.pledge = Decimal('70000.00')
-                        if member.paid_total is None:
-                            member.paid_total = Decimal('0.00')
-                        member.save()
-                    members.append(member)
-                except Exception:
-                    continue
-        except Exception:
-            members = []
-
-        # Apply same filters as Excel export
-        if search_query and members:
-            filtered_members = []
-            for member in members:
-                try:
-                    if (search_query.lower() in member.name.lower() or
-                        (member.phone and search_query in member.phone) or
-                        (member.email and search_query.lower() in member.email.lower())):
-                        filtered_members.append(member)
-                except:
-                    continue
-            members = filtered_members
-
-        if filter_status and members:
-            filtered_members = []
-            for member in members:
-                try:
-                    if filter_status == 'incomplete' and member.paid_total > 0 and member.paid_total < member.pledge:
-                        filtered_members.append(member)
-                    elif filter_status == 'complete' and member.paid_total >= member.pledge:
-                        filtered_members.append(member)
-                    elif filter_status == 'pledged' and member.pledge > 70000:
-                        filtered_members.append(member)
-                    elif filter_status == 'not_started' and member.paid_total == 0:
-                        filtered_members.append(member)
-                    elif filter_status == 'exceeded' and member.paid_total > member.pledge:
-                        filtered_members.append(member)
-                except:
-                    continue
-            members = filtered_members
-
-        # Create PDF with custom page template for logo
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=120, bottomMargin=60)
-
-        # Container for PDF elements
-        elements = []
-
-        # Styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            alignment=1,  # Center alignment
-            textColor=colors.HexColor('#2c3e50')
-        )
-
-        filter_style = ParagraphStyle(
-            'FilterStyle',
-            parent=styles['Normal'],
-            fontSize=12,
-            spaceAfter=20,
-            alignment=1,  # Center alignment
-            textColor=colors.HexColor('#7f8c8d')
+        # Serve the stored report while the organization's data is unchanged
+        current_url = request.build_absolute_uri()
+        artifact = ReportArtifact(
+            tenant, 'members-pdf',
+            {'search': search_query, 'filter': filter_status, 'url': current_url},
+            'pdf',
         )
 
-        # Link style for download hyperlink
-        link_style = ParagraphStyle(
-            'LinkStyle',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=15,
-            alignment=1,  # Center alignment
-            textColor=colors.HexColor('#3498db')
-        )
+        def build_pdf(buffer):
+            # Get members FOR THIS ORGANIZATION ONLY, filtered in SQL
+            members = list(member_queryset(tenant, search=search_query, status_filter=filter_status))
+
+            # Create PDF with custom page template for logo
+            doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=120, bottomMargin=60)
+
+            # Container for PDF elements
+            elements = []
+
+            # Styles
+            styles = getSampleStyleSheet()
+            title_style = ParagraphStyle(
+                'CustomTitle',
+                parent=styles['Heading1'],
+                fontSize=18,
+                spaceAfter=30,
+                alignment=1,  # Center alignment
+                textColor=colors.HexColor('#2c3e50')
+            )
 
-        # Dynamic title based on filters - Use organization name
-        base_title = f"MEMBERS REPORT: {tenant.name.upper()}"
+            filter_style = ParagraphStyle(
+                'FilterStyle',
+                parent=styles['Normal'],
+                fontSize=12,
+                spaceAfter=20,
+                alignment=1,  # Center alignment
+                textColor=colors.HexColor('#7f8c8d')
+            )
 
-        # Add filter information to title
-        filter_info = []
-        if filter_status:
-            filter_map = {
-                'incomplete': 'INCOMPLETE PAYMENTS',
-                'complete': 'COMPLETE PAYMENTS',
-                'pledged': 'PLEDGED ABOVE Tsh 70,000',
-                'not_started': 'NOT STARTED',
-                'exceeded': 'EXCEEDED PLEDGES'
-            }
-            filter_info.append(filter_map.get(filter_status, filter_status.upper()))
+            # Link style for download hyperlink
+            link_style = ParagraphStyle(
+                'LinkStyle',
+                parent=styles['Normal'],
+                fontSize=10,
+                spaceAfter=15,
+                alignment=1,  # Center alignment
+                textColor=colors.HexColor('#3498db')
+            )
 
-        if search_query:
-            filter_info.append(f'SEARCH: "{search_query.upper()}"')
+            # Dynamic title based on filters - Use organization name
+            base_title = f"MEMBERS REPORT: {tenant.name.upper()}"
+
+            # Add filter information to title
+            filter_info = []
+            if filter_status:
+                filter_map = {
+                    'incomplete': 'INCOMPLETE PAYMENTS',
+                    'complete': 'COMPLETE PAYMENTS',
+                    'pledged': 'PLEDGED ABOVE Tsh 70,000',
+                    'not_started': 'NOT STARTED',
+                    'exceeded': 'EXCEEDED PLEDGES'
+                }
+                filter_info.append(filter_map.get(filter_status, filter_status.upper()))
+
+            if search_query:
+                filter_info.append(f'SEARCH: "{search_query.upper()}"')
+
+            if filter_info:
+                title_text = f"{base_title}<br/><font size='14' color='#e74c3c'>({' - '.join(filter_info)})</font>"
+            else:
+                title_text = base_title
 
-        if filter_info:
-            title_text = f"{base_title}<br/><font size='14' color='#e74c3c'>({' - '.join(filter_info)})</font>"
-        else:
-            title_text = base_title
+            # Title
+            title = Paragraph(title_text, title_style)
+            elements.append(title)
 
-        # Title
-        title = Paragraph(title_text, title_style)
-        elements.append(title)
+            # Add download link for latest version
+            current_url = request.build_absolute_uri()
+            download_link_text = f'<a href="{current_url}" color="#3498db"><u>Click here to download the latest version of this report</u></a>'
+            download_link = Paragraph(download_link_text, link_style)
+            elements.append(download_link)
+            elements.append(Spacer(1, 12))
 
-        # Add download link for latest version
-        current_url = request.build_absolute_uri()
-        download_link_text = f'<a href="{current_url}" color="#3498db"><u>Click here to download the latest version of this report</u></a>'
-        download_link = Paragraph(download_link_text, link_style)
-        elements.append(download_link)
-        elements.append(Spacer(1, 12))
-
-        # Summary section
-        total_members = len(members)
-        total_pledged = sum(member.pledge or Decimal('70000.00') for member in members)
-        total_collected = sum(member.paid_total or Decimal('0.00') for member in members)
-        # Get organization's target amount from theme
-        try:
-            target_amount = Decimal(str(tenant.theme.target_amount))
-        except:
-            target_amount = Decimal('210000.00')
-        progress_percentage = (total_collected / target_amount * 100) if target_amount > 0 else 0
-
-        summary_data = [
-            ['SUMMARY', ''],
-            ['Total Members:', f"{total_members:,}"],
-            ['Total Pledged:', f"TSh {total_pledged:,.2f}"],
-            ['Total Collected:', f"TSh {total_collected:,.2f}"],
-            ['Target Amount:', f"TSh {target_amount:,.2f}"],
-            ['% Collected:', f"{progress_percentage:.1f}%"],
-            ['Report Date:', date.today().strftime('%B %d, %Y')],
-        ]
+            # Summary section
+            total_members = len(members)
+            total_pledged = sum(member.pledge or Decimal('70000.00') for member in members)
+            total_collected = sum(member.paid_total or Decimal('0.00') for member in members)
+            # Get organization's target amount from theme
+            try:
+                target_amount = Decimal(str(tenant.theme.target_amount))
+            except:
+                target_amount = Decimal('210000.00')
+            progress_percentage = (total_collected / target_amount * 100) if target_amount > 0 else 0
+
+            summary_data = [
+                ['SUMMARY', ''],
+                ['Total Members:', f"{total_members:,}"],
+                ['Total Pledged:', f"TSh {total_pledged:,.2f}"],
+                ['Total Collected:', f"TSh {total_collected:,.2f}"],
+                ['Target Amount:', f"TSh {target_amount:,.2f}"],
+                ['% Collected:', f"{progress_percentage:.1f}%"],
+                ['Report Date:', date.today().strftime('%B %d, %Y')],
+            ]
 
-        summary_table = Table(summary_data, colWidths=[2*inch, 2*inch])
-        summary_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
-
-        elements.append(summary_table)
-        elements.append(Spacer(1, 20))
-
-        # Members table
-        if members:
-            # Table headers with index number
-            headers = ['#', 'Name', 'Phone', 'Pledge', 'Paid', 'Exceed/Remain(-)', 'Status']
-
-            # Prepare data
-            table_data = [headers]
-
-            for index, member in enumerate(members, 1):
-                try:
-                    pledge = member.pledge if member.pledge is not None else Decimal('70000.00')
-                    paid = member.paid_total if member.paid_total is not None else Decimal('0.00')
-                    balance = paid - pledge
-
-                    if paid == 0:
-                        status = "Not Started"
-                    elif paid < pledge:
-                        status = "Incomplete"
-                    elif paid == pledge:
-                        status = "Complete"
-                    else:
-                        status = "Exceeded"
-
-                    row = [
-                        str(index),  # Index number
-                        member.name[:20] + "..." if len(member.name) > 20 else member.name,
-                        member.phone[:15] if member.phone else '',
-                        f"TSh {pledge:,.0f}",
-                        f"TSh {paid:,.0f}",
-                        f"TSh {balance:,.0f}",
-                        status
-                    ]
-                    table_data.append(row)
-                except Exception:
-                    continue
-
-            # Create table with adjusted column widths to accommodate index
-            table = Table(table_data, colWidths=[0.4*inch, 1.3*inch, 1*inch, 1*inch, 1*inch, 1*inch, 0.8*inch])
-            table.setStyle(TableStyle([
-                # Header styling
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            summary_table = Table(summary_data, colWidths=[2*inch, 2*inch])
+            summary_table.setStyle(TableStyle([
                 ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-
-                # Data styling
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
                 ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ]))
 
-                # Alternating row colors
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
+            elements.append(summary_table)
+            elements.append(Spacer(1, 20))
 
-                # Currency column alignment
-                ('ALIGN', (3, 1), (5, -1), 'RIGHT'),
-                # Index column alignment
-                ('ALIGN', (0, 1), (0, -1), 'CENTER'),
-            ]))
+            # Members table
+            if members:
+                # Table headers with index number
+                headers = ['#', 'Name', 'Phone', 'Pledge', 'Paid', 'Exceed/Remain(-)', 'Status']
+
+                # Prepare data
+                table_data = [headers]
 
-            # With this:
-            if len(table_data) > 1:  # Only if there's data beyond headers
-                # For very large tables, you might want to split them
-                if len(table_data) > 36:  # Adjust this number based on your needs
-                    # Split large tables into chunks
-                    chunk_size = 200
-                    for i in range(0, len(table_data), chunk_size):
-                        if i == 0:
-                            chunk_data = table_data[0:chunk_size+1]  # Include header
+                for index, member in enumerate(members, 1):
+                    try:
+                        pledge = member.pledge if member.pledge is not None else Decimal('70000.00')
+                        paid = member.paid_total if member.paid_total is not None else Decimal('0.00')
+                        balance = paid - pledge
+
+                        if paid == 0:
+                            status = "Not Started"
+                        elif paid < pledge:
+                            status = "Incomplete"
+                        elif paid == pledge:
+                            status = "Complete"
                         else:
-                            chunk_data = [table_data[0]] + table_data[i:i+chunk_size]  # Header + data
-
-                        chunk_table = Table(chunk_data, colWidths=[0.4*inch, 1.3*inch, 1*inch, 1*inch, 1*inch, 1*inch, 0.8*inch])
-                        chunk_table.setStyle(TableStyle([
-                            # Header styling
-                            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
-                            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                            ('FONTSIZE', (0, 0), (-1, 0), 9),
-                            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                            ('FONTSIZE', (0, 1), (-1, -1), 8),
-                            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
-                            ('ALIGN', (3, 1), (5, -1), 'RIGHT'),
-                            ('ALIGN', (0, 1), (0, -1), 'CENTER'),
-                        ]))
-
-                        elements.append(chunk_table)
-                        if i + chunk_size < len(table_data) - 1:  # Not the last chunk
-                            elements.append(PageBreak())
-                else:
-                    # For smaller tables, just add normally
-                    elements.append(table)
-
-# Custom page template with organization logo and watermark
-        def add_logo_and_header(canvas, doc):
-            """Add organization logo, header, and watermark to each page"""
-            from django.conf import settings
-            import os
-            from reportlab.lib.utils import ImageReader
-            from PIL import Image
+                            status = "Exceeded"
+
+                        row = [
+                            str(index),  # Index number
+                            member.name[:20] + "..." if len(member.name) > 20 else member.name,
+                            member.phone[:15] if member.phone else '',
+                            f"TSh {pledge:,.0f}",
+                            f"TSh {paid:,.0f}",
+                            f"TSh {balance:,.0f}",
+                            status
+                        ]
+                        table_data.append(row)
+                    except Exception:
+                        continue
+
+                # Create table with adjusted column widths to accommodate index
+                table = Table(table_data, colWidths=[0.4*inch, 1.3*inch, 1*inch, 1*inch, 1*inch, 1*inch, 0.8*inch])
+                table.setStyle(TableStyle([
+                    # Header styling
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
+                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('FONTSIZE', (0, 0), (-1, 0), 9),
+
+                    # Data styling
+                    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+                    ('FONTSIZE', (0, 1), (-1, -1), 8),
+                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+
+                    # Alternating row colors
+                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
+
+                    # Currency column alignment
+                    ('ALIGN', (3, 1), (5, -1), 'RIGHT'),
+                    # Index column alignment
+                    ('ALIGN', (0, 1), (0, -1), 'CENTER'),
+                ]))
+
+                # With this:
+                if len(table_data) > 1:  # Only if there's data beyond headers
+                    # For very large tables, you might want to split them
+                    if len(table_data) > 36:  # Adjust this number based on your needs
+                        # Split large tables into chunks
+                        chunk_size = 200
+                        for i in range(0, len(table_data), chunk_size):
+                            if i == 0:
+                                chunk_data = table_data[0:chunk_size+1]  # Include header
+                            else:
+                                chunk_data = [table_data[0]] + table_data[i:i+chunk_size]  # Header + data
+
+                            chunk_table = Table(chunk_data, colWidths=[0.4*inch, 1.3*inch, 1*inch, 1*inch, 1*inch, 1*inch, 0.8*inch])
+                            chunk_table.setStyle(TableStyle([
+                                # Header styling
+                                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
+                                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                                ('FONTSIZE', (0, 0), (-1, 0), 9),
+                                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+                                ('FONTSIZE', (0, 1), (-1, -1), 8),
+                                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
+                                ('ALIGN', (3, 1), (5, -1), 'RIGHT'),
+                                ('ALIGN', (0, 1), (0, -1), 'CENTER'),
+                            ]))
+
+                            elements.append(chunk_table)
+                            if i + chunk_size < len(table_data) - 1:  # Not the last chunk
+                                elements.append(PageBreak())
+                    else:
+                        # For smaller tables, just add normally
+                        elements.append(table)
+
+    # Custom page template with organization logo and watermark
+            def add_logo_and_header(canvas, doc):
+                """Add organization logo, header, and watermark to each page"""
+                from django.conf import settings
+                import os
+                from reportlab.lib.utils import ImageReader
+                from PIL import Image
             
-            canvas.saveState()
+                canvas.saveState()
 
-            # Set white background for entire page
-            canvas.setFillColor(colors.white)
-            canvas.rect(0, 0, A4[0], A4[1], fill=1, stroke=0)
+                # Set white background for entire page
+                canvas.setFillColor(colors.white)
+                canvas.rect(0, 0, A4[0], A4[1], fill=1, stroke=0)
 
-            # Try to add organization logo first
-            logo_path = None
-            if tenant.theme and tenant.theme.logo:
-                try:
-                    logo_path = tenant.theme.logo.path
-                except:
-                    logo_path = None
+                # Try to add organization logo first
+                logo_path = None
+                if tenant.theme and tenant.theme.logo:
+                    try:
+                        logo_path = tenant.theme.logo.path
+                    except:
+                        logo_path = None
             
-            if logo_path and os.path.exists(logo_path):
-                try:
-                    # Open image with PIL to handle transparency
-                    pil_image = Image.open(logo_path)
-
-                    # Convert to RGB if it has transparency (RGBA) or is in other modes
-                    if pil_image.mode in ('RGBA', 'LA', 'P'):
-                        # Create white background
-                        background = Image.new('RGB', pil_image.size, (255, 255, 255))
-                        if pil_image.mode == 'P':
-                            pil_image = pil_image.convert('RGBA')
-                        background.paste(pil_image, mask=pil_image.split()[-1] if pil_image.mode in ('RGBA', 'LA') else None)
-                        pil_image = background
-                    elif pil_image.mode != 'RGB':
-                        pil_image = pil_image.convert('RGB')
-
-                    logo = ImageReader(pil_image)
-                    # Get original dimensions
-                    logo_width, logo_height = pil_image.size
-
-                    # Calculate scaled dimensions (max 100x50)
-                    max_width, max_height = 100, 50
-                    if logo_width > max_width or logo_height > max_height:
-                        ratio = min(max_width/logo_width, max_height/logo_height)
-                        logo_width *= ratio
-                        logo_height *= ratio
-
-                    # Position logo at top center
-                    x = (A4[0] - logo_width) / 2  # Center horizontally
-                    y = A4[1] - 80  # 80 points from top
-
-                    # Draw the organization logo
-                    canvas.drawImage(logo, x, y, width=logo_width, height=logo_height)
-                except Exception as e:
-                    # If logo fails, add text header instead
+                if logo_path and os.path.exists(logo_path):
+                    try:
+                        # Open image with PIL to handle transparency
+                        pil_image = Image.open(logo_path)
+
+                        # Convert to RGB if it has transparency (RGBA) or is in other modes
+                        if pil_image.mode in ('RGBA', 'LA', 'P'):
+                            # Create white background
+                            background = Image.new('RGB', pil_image.size, (255, 255, 255))
+                            if pil_image.mode == 'P':
+                                pil_image = pil_image.convert('RGBA')
+                            background.paste(pil_image, mask=pil_image.split()[-1] if pil_image.mode in ('RGBA', 'LA') else None)
+                            pil_image = background
+                        elif pil_image.mode != 'RGB':
+                            pil_image = pil_image.convert('RGB')
+
+                        logo = ImageReader(pil_image)
+                        # Get original dimensions
+                        logo_width, logo_height = pil_image.size
+
+                        # Calculate scaled dimensions (max 100x50)
+                        max_width, max_height = 100, 50
+                        if logo_width > max_width or logo_height > max_height:
+                            ratio = min(max_width/logo_width, max_height/logo_height)
+                            logo_width *= ratio
+                            logo_height *= ratio
+
+                        # Position logo at top center
+                        x = (A4[0] - logo_width) / 2  # Center horizontally
+                        y = A4[1] - 80  # 80 points from top
+
+                        # Draw the organization logo
+                        canvas.drawImage(logo, x, y, width=logo_width, height=logo_height)
+                    except Exception as e:
+                        # If logo fails, add text header instead
+                        canvas.setFont('Helvetica-Bold', 14)
+                        canvas.setFillColor(colors.HexColor('#2c3e50'))
+                        canvas.drawCentredString(A4[0]/2, A4[1] - 50, tenant.name.upper())
+                else:
+                    # No organization logo found, add organization name as header
                     canvas.setFont('Helvetica-Bold', 14)
                     canvas.setFillColor(colors.HexColor('#2c3e50'))
                     canvas.drawCentredString(A4[0]/2, A4[1] - 50, tenant.name.upper())
-            else:
-                # No organization logo found, add organization name as header
-                canvas.setFont('Helvetica-Bold', 14)
-                canvas.setFillColor(colors.HexColor('#2c3e50'))
-                canvas.drawCentredString(A4[0]/2, A4[1] - 50, tenant.name.upper())
             
-            # Add watermark (Bossin or custom watermark text)
-            watermark_text = tenant.theme.watermark_text if tenant.theme else 'Bossin'
-            try:
-                canvas.setFont('Helvetica', 60)
-                canvas.setFillAlpha(0.1)  # 10% opacity
-                canvas.setFillColor(colors.grey)
-                # Rotate and position watermark diagonally
-                canvas.rotate(45)
-                canvas.drawCentredString(A4[0]/2, A4[1]/2, watermark_text)
-                canvas.rotate(-45)
-                canvas.setFillAlpha(1.0)  # Reset opacity
-            except:
-                pass  # Watermark is optional
-
-            # Add page number
-            canvas.setFont('Helvetica', 9)
-            canvas.setFillColor(colors.black)
-            canvas.drawRightString(A4[0] - 72, 30, f"Page {doc.page}")
-
-            # Add generation date
-            canvas.drawString(72, 30, f"Generated: {date.today().strftime('%B %d, %Y')}")
+                # Add watermark (Bossin or custom watermark text)
+                watermark_text = tenant.theme.watermark_text if tenant.theme else 'Bossin'
+                try:
+                    canvas.setFont('Helvetica', 60)
+                    canvas.setFillAlpha(0.1)  # 10% opacity
+                    canvas.setFillColor(colors.grey)
+                    # Rotate and position watermark diagonally
+                    canvas.rotate(45)
+                    canvas.drawCentredString(A4[0]/2, A4[1]/2, watermark_text)
+                    canvas.rotate(-45)
+                    canvas.setFillAlpha(1.0)  # Reset opacity
+                except:
+                    pass  # Watermark is optional
 
-            canvas.restoreState()
+                # Add page number
+                canvas.setFont('Helvetica', 9)
+                canvas.setFillColor(colors.black)
+                canvas.drawRightString(A4[0] - 72, 30, f"Page {doc.page}")
 
+                # Add generation date
+                canvas.drawString(72, 30, f"Generated: {date.today().strftime('%B %d, %Y')}")
 
-        # Build PDF with custom page template
-        doc.build(elements, onFirstPage=add_logo_and_header, onLaterPages=add_logo_and_header)
+                canvas.restoreState()
 
-        # Create response
-        pdf_data = buffer.getvalue()
-        buffer.close()
 
-        response = HttpResponse(pdf_data, content_type='application/pdf')
+            # Build PDF with custom page template
+            doc.build(elements, onFirstPage=add_logo_and_header, onLaterPages=add_logo_and_header)
 
         # Dynamic filename based on filters - Include organization name
         org_name_slug = tenant.slug.replace('-', '_')
@@ -1230,9 +998,7 @@ def export_pdf(request, org_slug=None):
         filename_parts.append(date.today().strftime('%Y%m%d'))
 
         filename = f"{'_'.join(filename_parts)}.pdf"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-
-        return response
+        return artifact.response(request, build_pdf, filename, 'application/pdf')
 
     except Exception as e:
         messages.error(request, f"Error exporting PDF: {str(e)}")
@@ -1518,126 +1284,31 @@ def dashboard(request, org_slug=None):
         except:
             target_amount = Decimal('210000.00')
 
-        # Get members for THIS ORGANIZATION ONLY with individual error handling
-        members = []
-        try:
-            # Try to get members for this organization
-            all_members = Member.objects.filter(organization=tenant)
-            for member in all_members:
-                try:
-                    # Verify each member's decimal fields are valid
-                    if member.pledge is None or member.paid_total is None:
-                        # Fix invalid values
-                        if member.pledge is None:
-                            member.pledge = Decimal('70000.00')
-                        if member.paid_total is None:
-                            member.paid_total = Decimal('0.00')
-                        member.save()
-
-                    members.append(member)
-                except Exception as e:
-                    # Skip problematic members
-                    continue
-        except Exception as e:
-            # If bulk query fails, get members one by one
-            try:
-                member_ids = Member.objects.filter(organization=tenant).values_list('id', flat=True)
-                for member_id in member_ids:
-                    try:
-                        member = Member.objects.get(id=member_id, organization=tenant)
-                        # Fix any invalid decimal values
-                        if member.pledge is None:
-                            member.pledge = Decimal('70000.00')
-                        if member.paid_total is None:
-                            member.paid_total = Decimal('0.00')
-                        member.save()
-                        members.append(member)
-                    except:
-                        continue
-            except:
-                members = []
-
-        # Apply search filter
-        if search_query and members:
-            filtered_members = []
-            for member in members:
-                try:
-                    if (search_query.lower() in member.name.lower() or
-                        (member.phone and search_query in member.phone) or
-                        (member.email and search_query.lower() in member.email.lower())):
-                        filtered_members.append(member)
-                except:
-                    continue
-            members = filtered_members
-
-        # Apply status filter
-        if filter_status and members:
-            filtered_members = []
-            for member in members:
-                try:
-                    if filter_status == 'incomplete' and member.paid_total > 0 and member.paid_total < member.pledge:
-                        filtered_members.append(member)
-                    elif filter_status == 'complete' and member.paid_total >= member.pledge:
-                        filtered_members.append(member)
-                    elif filter_status == 'pledged' and member.pledge > 70000:
-                        filtered_members.append(member)
-                    elif filter_status == 'not_started' and member.paid_total == 0:
-                        filtered_members.append(member)
-                    elif filter_status == 'exceeded' and member.paid_total > member.pledge:
-                        filtered_members.append(member)
-                except:
-                    continue
-            members = filtered_members
-
-        # Calculate statistics safely
-        try:
-            # Manual calculation to avoid aggregation issues
-            total_collected = Decimal('0.00')
-            total_pledged = Decimal('0.00')
-            not_paid_count = 0
-            incomplete_count = 0
-            complete_count = 0
-            exceeded_count = 0
-
-            for member in members:
-                try:
-                    # Ensure we have valid decimal values
-                    pledge = member.pledge if member.pledge is not None else Decimal('70000.00')
-                    paid_total = member.paid_total if member.paid_total is not None else Decimal('0.00')
-
-                    total_pledged += pledge
-                    total_collected += paid_total
-
-                    # Count by status
-                    if paid_total == 0:
-                        not_paid_count += 1
-                    elif paid_total < pledge:
-                        incomplete_count += 1
-                    elif paid_total == pledge:
-                        complete_count += 1
-                    else:  # paid_total > pledge
-                        exceeded_count += 1
-                except:
-                    # Skip problematic members
-                    continue
+        # Members for THIS ORGANIZATION ONLY, searched and filtered in SQL
+        members_qs = member_queryset(tenant, search=search_query, status_filter=filter_status)
 
-        except Exception as e:
-            # If calculation fails, use default values
-            total_collected = Decimal('0.00')
-            total_pledged = Decimal('0.00')
-            not_paid_count = 0
-            incomplete_count = 0
-            complete_count = 0
-            exceeded_count = 0
+        # Statistics from a single aggregate query (cached when unfiltered)
+        stats = get_member_stats(tenant, search=search_query, status_filter=filter_status)
+        total_collected = stats['total_collected']
+        total_pledged = stats['total_pledged']
+        not_paid_count = stats['not_paid_count']
+        incomplete_count = stats['incomplete_count']
+        complete_count = stats['complete_count']
+        exceeded_count = stats['exceeded_count']
 
         # Calculate progress percentage
         progress_percentage = (total_collected / target_amount * 100) if target_amount > 0 else 0
 
+        paginator = Paginator(members_qs, 50)
+        page_obj = paginator.get_page(request.GET.get('page'))
+        members = page_obj.object_list
+
     except Exception as e:
         # If everything fails, use default values
         pass
 
     context = {
+        'page_obj': page_obj,
         'members': members,
         'search_query': search_query,
         'filter_status': filter_status,
@@ -1840,154 +1511,94 @@ def import_excel(request, org_slug=None):
             default_pledge = form.cleaned_data['default_pledge']
 
             try:
-                workbook = openpyxl.load_workbook(BytesIO(excel_file.read()))
-                sheet = workbook.active
+                # Large sheets are processed by the import worker, not this request
+                job = create_import_job(
+                    tenant, request.user, excel_file,
+                    update_existing=update_existing,
+                    default_pledge=default_pledge,
+                )
+                messages.info(request, "📥 Import started. Progress is shown below.")
+                return redirect('tracker:import_job_detail', org_slug=tenant.slug, job_id=job.id)
 
-                created_count = 0
-                updated_count = 0
-                transaction_count = 0
-                errors = []
+            except Exception as e:
+                messages.error(request, f"📄 Excel upload error: {str(e)}")
 
-                for idx, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-                    try:
-                        if not row[0]:
-                            continue  # Skip rows without a name
-
-                        name = str(row[0]).strip()
-                        pledge = row[1]
-                        paid = row[2] if len(row) > 2 else None
-                        phone = str(row[3]).strip() if len(row) > 3 and row[3] else ''
-                        email = str(row[4]).strip() if len(row) > 4 and row[4] else ''
-                        course = str(row[5]).strip() if len(row) > 5 and row[5] else ''
-                        year = str(row[6]).strip() if len(row) > 6 and row[6] else ''
-
-                        # Pledge
-                        try:
-                            pledge = Decimal(str(pledge)) if pledge else default_pledge
-                        except InvalidOperation:
-                            pledge = default_pledge
-                            errors.append(f"Row {idx}: Invalid pledge, using default for '{name}'")
+        else:
+            messages.error(request, "⚠️ Invalid form submission.")
+    else:
+        form = ExcelImportForm()
 
-                        # Paid
-                        try:
-                            paid = Decimal(str(paid)) if paid else Decimal('0.00')
-                        except InvalidOperation:
-                            paid = Decimal('0.00')
-                            errors.append(f"Row {idx}: Invalid paid value for '{name}', using 0.00")
-
-                        member_created = False
-                        if update_existing:
-                            member, member_created = Member.objects.update_or_create(
-                                organization=tenant,
-                                name=name,
-                                defaults={
-                                    'pledge': pledge,
-                                    'phone': phone or None,
-                                    'email': email or None,
-                                    'course': course or None,
-                                    'year': year or None,
-                                }
-                            )
-                        else:
-                            member = Member.objects.filter(organization=tenant, name=name).first()
-                            if not member:
-                                member = Member.objects.create(
-                                    organization=tenant,
-                                    name=name,
-                                    pledge=pledge,
-                                    phone=phone or None,
-                                    email=email or None,
-                                    course=course or None,
-                                    year=year or None,
-                                )
-                                member_created = True
-                            else:
-                                errors.append(f"Row {idx}: Member '{name}' already exists and update is off.")
-                                continue
+    return render(request, 'tracker/import_excel.html', {'form': form})
 
-                        if member_created:
-                            created_count += 1
-                        else:
-                            updated_count += 1
-
-                        # Transaction
-                        if paid > 0:
-                            existing_txn = Transaction.objects.filter(
-                                organization=tenant,
-                                member=member,
-                                date=date.today(),
-                                added_by=request.user,
-                                note__icontains="Imported via Excel"
-                            ).first()
-
-                            if existing_txn:
-                                # Update the amount if different
-                                if existing_txn.amount != paid:
-                                    existing_txn.amount = paid
-                                    existing_txn.note = f"Updated via Excel on {date.today().isoformat()}"
-                                    existing_txn.save()
-                                    transaction_count += 1
-                            else:
-                                # Create new transaction
-                                Transaction.objects.create(
-                                    organization=tenant,
-                                    member=member,
-                                    amount=paid,
-                                    date=date.today(),
-                                    added_by=request.user,
-                                    note=f"Imported via Excel on {date.today().isoformat()}"
-                                )
-                                transaction_count += 1
 
+def _get_import_job(request, job_id):
+    """Import job of the current organization, or 404"""
+    return get_object_or_404(ImportJob, id=job_id, organization=request.tenant)
 
-                    except Exception as e:
-                        errors.append(f"Row {idx}: Error processing member '{row[0]}' - {str(e)}")
 
-                if created_count:
-                    messages.success(request, f"✅ Created {created_count} new members.")
-                if updated_count:
-                    messages.info(request, f"🔄 Updated {updated_count} existing members.")
-                if transaction_count:
-                    messages.success(request, f"💰 Recorded {transaction_count} payments.")
+@org_member_required
+def import_job_detail(request, job_id, org_slug=None):
+    """Progress page for a background Excel import"""
+    job = _get_import_job(request, job_id)
+    return render(request, 'tracker/import_job.html', {
+        'job': job,
+        'progress': import_job_progress(job),
+        'errors_preview': job.errors[:20],
+    })
 
-                if errors:
-                    for err in errors[:5]:
-                        messages.warning(request, f"⚠️ {err}")
-                    if len(errors) > 5:
-                        messages.warning(request, f"...and {len(errors) - 5} more issues.")
 
-                return redirect_to_dashboard(request)
+@org_member_required
+def import_job_status(request, job_id, org_slug=None):
+    """JSON progress of a background Excel import (polled by the progress page)"""
+    job = _get_import_job(request, job_id)
+    data = import_job_progress(job)
+    data['errors_preview'] = job.errors[:20]
+    return JsonResponse({'success': True, 'job': data})
 
-            except Exception as e:
-                messages.error(request, f"📄 Excel reading error: {str(e)}")
 
-        else:
-            messages.error(request, "⚠️ Invalid form submission.")
-    else:
-        form = ExcelImportForm()
+@org_member_required
+def import_job_errors(request, job_id, org_slug=None):
+    """Download the full row error report of an import as a text file"""
+    job = _get_import_job(request, job_id)
+    report = "\n".join(job.errors) if job.errors else "No errors."
+    response = HttpResponse(report, content_type='text/plain; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="import_{job.id}_errors.txt"'
+    return response
 
-    return render(request, 'tracker/import_excel.html', {'form': form})
 
 
+ADMIN_LOG_PAGE_SIZE = 25
+# Both orderings are served by the (organization, date) and
+# (organization, created_at) indexes; id makes the keyset unique
+TRANSACTION_LOG_ORDERING = ('-date', '-id')
+MEMBER_EDIT_LOG_ORDERING = ('-created_at', '-id')
 
-@login_required
-def admin_log(request, org_slug=None):
-    """Admin log showing all transactions"""
-    # Get tenant from request for data isolation
-    tenant = getattr(request, 'tenant', None)
-    if not tenant:
-        messages.error(request, 'Organization not found')
-        return redirect('tracker:dashboard')
 
-    # Get transactions for THIS ORGANIZATION ONLY
-    transactions = Transaction.objects.select_related('member', 'added_by').filter(member__organization=tenant)
-    # Apply filters
-    boss_filter = request.GET.get('boss', '')
+def _staff_filter_ids(tenant, staff_filter):
+    """
+    User ids for the admin log staff filter: a user id from the staff
+    select, or (for old links) a username fragment matched against this
+    organization's staff only.
+    """
+    if staff_filter.isdigit():
+        return [int(staff_filter)]
+    return OrganizationUser.objects.filter(
+        organization=tenant, user__username__icontains=staff_filter,
+    ).values('user_id')
+
+
+def _filter_transaction_log(request, tenant):
+    """The organization's transactions filtered by the admin log parameters"""
+    transactions = Transaction.objects.select_related('member', 'added_by').filter(
+        organization=tenant,
+    ).order_by(*TRANSACTION_LOG_ORDERING)
+
+    staff_filter = request.GET.get('staff', '') or request.GET.get('boss', '')
     date_filter = request.GET.get('date', '')
     amount_filter = request.GET.get('amount', '')
 
-    if boss_filter:
-        transactions = transactions.filter(added_by__username__icontains=boss_filter)
+    if staff_filter:
+        transactions = transactions.filter(added_by_id__in=_staff_filter_ids(tenant, staff_filter))
     if date_filter:
         transactions = transactions.filter(date=date_filter)
     if amount_filter:
@@ -1996,45 +1607,86 @@ def admin_log(request, org_slug=None):
             transactions = transactions.filter(amount=amount)
         except:
             pass
+    return transactions
 
-    # Pagination
-    paginator = Paginator(transactions, 25)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+
+def _filter_member_edit_logs(request, tenant):
+    """The organization's member edit logs filtered by the admin log parameters"""
+    member_edit_logs = MemberEditLog.objects.select_related('member', 'edited_by').filter(
+        organization=tenant,
+    ).order_by(*MEMBER_EDIT_LOG_ORDERING)
+
+    edit_member_filter = request.GET.get('edit_member', '')
+    edit_field_filter = request.GET.get('edit_field', '')
+
+    if edit_member_filter:
+        # Resolve members through the search index instead of a name scan
+        members = filter_members(
+            Member.objects.filter(organization=tenant), search=edit_member_filter, organization=tenant,
+        )
+        member_edit_logs = member_edit_logs.filter(member_id__in=members.values('id'))
+    if edit_field_filter:
+        member_edit_logs = member_edit_logs.filter(field_changed=edit_field_filter)
+    return member_edit_logs
+
+
+def _keyset_page(queryset, ordering, after, before):
+    try:
+        return keyset_paginate(queryset, ordering, after=after, before=before, limit=ADMIN_LOG_PAGE_SIZE)
+    except InvalidCursor:
+        return keyset_paginate(queryset, ordering, limit=ADMIN_LOG_PAGE_SIZE)
+
+
+@login_required
+def admin_log(request, org_slug=None):
+    """Admin log showing all transactions"""
+    # Get tenant from request for data isolation
+    tenant = getattr(request, 'tenant', None)
+    if not tenant:
+        messages.error(request, 'Organization not found')
+        return redirect('tracker:dashboard')
+
+    # Transactions for THIS ORGANIZATION ONLY, one keyset page at a time
+    staff_filter = request.GET.get('staff', '') or request.GET.get('boss', '')
+    date_filter = request.GET.get('date', '')
+    amount_filter = request.GET.get('amount', '')
+    page_obj = _keyset_page(
+        _filter_transaction_log(request, tenant),
+        TRANSACTION_LOG_ORDERING,
+        request.GET.get('after'),
+        request.GET.get('before'),
+    )
+    staff_members = OrganizationUser.objects.filter(
+        organization=tenant,
+    ).select_related('user').order_by('user__username')
 
     # Get member edit logs (owner only)
     member_edit_logs = []
+    edit_member_filter = ''
+    edit_field_filter = ''
     is_owner = is_org_owner(request.user, tenant)
     if is_owner:
-        member_edit_logs = MemberEditLog.objects.select_related('member', 'edited_by').filter(
-            organization=tenant
-        ).order_by('-created_at')
-        
-        # Apply filters for member edit logs
         edit_member_filter = request.GET.get('edit_member', '')
         edit_field_filter = request.GET.get('edit_field', '')
-        
-        if edit_member_filter:
-            member_edit_logs = member_edit_logs.filter(member__name__icontains=edit_member_filter)
-        if edit_field_filter:
-            member_edit_logs = member_edit_logs.filter(field_changed=edit_field_filter)
-        
-        # Pagination for member edit logs
-        edit_paginator = Paginator(member_edit_logs, 25)
-        edit_page_number = request.GET.get('edit_page')
-        member_edit_logs = edit_paginator.get_page(edit_page_number)
+        member_edit_logs = _keyset_page(
+            _filter_member_edit_logs(request, tenant),
+            MEMBER_EDIT_LOG_ORDERING,
+            request.GET.get('edit_after'),
+            request.GET.get('edit_before'),
+        )
 
     context = {
         'page_obj': page_obj,
         'transactions': page_obj,
-        'boss_filter': boss_filter,
+        'staff_filter': staff_filter,
+        'staff_members': staff_members,
         'date_filter': date_filter,
         'amount_filter': amount_filter,
         'can_edit': request.user.is_staff,  # Simple check
         'member_edit_logs': member_edit_logs,
         'is_owner': is_owner,
-        'edit_member_filter': edit_member_filter if is_owner else '',
-        'edit_field_filter': edit_field_filter if is_owner else '',
+        'edit_member_filter': edit_member_filter,
+        'edit_field_filter': edit_field_filter,
     }
 
     return render(request, 'tracker/admin_log.html', context)
@@ -2157,6 +1809,32 @@ def update_transaction_note_ajax(request, org_slug=None):
 
 
 
+DAILY_COLLECTION_PAGE_SIZE = 20
+DAILY_COLLECTION_ORDERING = ('name', 'id')
+
+
+def _daily_collection_page(request, tenant):
+    """
+    One keyset page of the organization's members for the daily collection
+    screen, searched and filtered in SQL. Bad cursors fall back to page one.
+    """
+    members_qs = member_queryset(
+        tenant,
+        search=request.GET.get('search', ''),
+        status_filter=request.GET.get('filter', ''),
+    )
+    try:
+        return keyset_paginate(
+            members_qs,
+            DAILY_COLLECTION_ORDERING,
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+            limit=DAILY_COLLECTION_PAGE_SIZE,
+        )
+    except InvalidCursor:
+        return keyset_paginate(members_qs, DAILY_COLLECTION_ORDERING, limit=DAILY_COLLECTION_PAGE_SIZE)
+
+
 @org_admin_required
 def daily_collection(request, org_slug=None):
     """Daily collection page for recording payments"""
@@ -2169,12 +1847,12 @@ def daily_collection(request, org_slug=None):
     total_pledged = Decimal('0.00')
     target_amount = Decimal('210000.00')  # Default target
     progress_percentage = 0
+    member_count = 0
     not_paid_count = 0
     incomplete_count = 0
     complete_count = 0
     exceeded_count = 0
     page_obj = None
-    members = []
 
     try:
         # Get tenant from request for data isolation
@@ -2189,184 +1867,21 @@ def daily_collection(request, org_slug=None):
         except:
             target_amount = Decimal('210000.00')
 
-        # Get members for THIS ORGANIZATION ONLY with individual error handling
-        members = []
-        try:
-            # Try to get members for this organization
-            all_members = Member.objects.filter(organization=tenant)
-            for member in all_members:
-                try:
-                    # Verify each member's decimal fields are valid
-                    if member.pledge is None or member.paid_total is None:
-                        # Fix invalid values
-                        if member.pledge is None:
-                            member.pledge = Decimal('70000.00')
-                        if member.paid_total is None:
-                            member.paid_total = Decimal('0.00')
-                        member.save()
-
-                    members.append(member)
-                except Exception as e:
-                    # Skip problematic members
-                    continue
-        except Exception as e:
-            # If bulk query fails, get members one by one
-            try:
-                member_ids = Member.objects.filter(organization=tenant).values_list('id', flat=True)
-                for member_id in member_ids:
-                    try:
-                        member = Member.objects.get(id=member_id, organization=tenant)
-                        # Fix any invalid decimal values
-                        if member.pledge is None:
-                            member.pledge = Decimal('70000.00')
-                        if member.paid_total is None:
-                            member.paid_total = Decimal('0.00')
-                        member.save()
-                        members.append(member)
-                    except:
-                        continue
-            except:
-                members = []
-
-        # Apply search filter
-        if search_query and members:
-            filtered_members = []
-            for member in members:
-                try:
-                    if (search_query.lower() in member.name.lower() or
-                        (member.phone and search_query in member.phone) or
-                        (member.email and search_query.lower() in member.email.lower())):
-                        filtered_members.append(member)
-                except:
-                    continue
-            members = filtered_members
-
-        # Apply status filter
-        if filter_status and members:
-            filtered_members = []
-            for member in members:
-                try:
-                    if filter_status == 'incomplete' and member.paid_total > 0 and member.paid_total < member.pledge:
-                        filtered_members.append(member)
-                    elif filter_status == 'complete' and member.paid_total >= member.pledge:
-                        filtered_members.append(member)
-                    elif filter_status == 'pledged' and member.pledge > 70000:
-                        filtered_members.append(member)
-                    elif filter_status == 'not_started' and member.paid_total == 0:
-                        filtered_members.append(member)
-                    elif filter_status == 'exceeded' and member.paid_total > member.pledge:
-                        filtered_members.append(member)
-                except:
-                    continue
-            members = filtered_members
-
-        # Calculate statistics safely
-        try:
-            # Manual calculation to avoid aggregation issues
-            total_collected = Decimal('0.00')
-            total_pledged = Decimal('0.00')
-            not_paid_count = 0
-            incomplete_count = 0
-            complete_count = 0
-            exceeded_count = 0
-
-            for member in members:
-                try:
-                    # Ensure we have valid decimal values
-                    pledge = member.pledge if member.pledge is not None else Decimal('70000.00')
-                    paid_total = member.paid_total if member.paid_total is not None else Decimal('0.00')
-
-                    total_pledged += pledge
-                    total_collected += paid_total
-
-                    # Count by status
-                    if paid_total == 0:
-                        not_paid_count += 1
-                    elif paid_total < pledge:
-                        incomplete_count += 1
-                    elif paid_total == pledge:
-                        complete_count += 1
-                    else:  # paid_total > pledge
-                        exceeded_count += 1
-                except:
-                    # Skip problematic members
-                    continue
-
-        except Exception as e:
-            # If calculation fails, use default values
-            total_collected = Decimal('0.00')
-            total_pledged = Decimal('0.00')
-            not_paid_count = 0
-            incomplete_count = 0
-            complete_count = 0
-            exceeded_count = 0
+        # Statistics from a single aggregate query (cached when unfiltered)
+        stats = get_member_stats(tenant, search=search_query, status_filter=filter_status)
+        total_collected = stats['total_collected']
+        total_pledged = stats['total_pledged']
+        member_count = stats['member_count']
+        not_paid_count = stats['not_paid_count']
+        incomplete_count = stats['incomplete_count']
+        complete_count = stats['complete_count']
+        exceeded_count = stats['exceeded_count']
 
         # Calculate progress percentage
         progress_percentage = (total_collected / target_amount * 100) if target_amount > 0 else 0
 
-        # Pagination with error handling
-        try:
-            # Create a simple list-based pagination to avoid queryset issues
-            page_size = 20
-            page_number = request.GET.get('page', 1)
-            try:
-                page_number = int(page_number)
-            except:
-                page_number = 1
-
-            # Calculate pagination manually
-            total_members = len(members)
-            total_pages = (total_members + page_size - 1) // page_size
-
-            # Ensure page number is valid
-            if page_number < 1:
-                page_number = 1
-            elif page_number > total_pages and total_pages > 0:
-                page_number = total_pages
-
-            # Create a simple page object
-            class SimplePage:
-                def __init__(self, object_list, number, paginator):
-                    self.paginator = paginator
-                    self.number = number
-
-                    # Calculate the slice for this page
-                    start_index = (number - 1) * paginator.per_page
-                    end_index = start_index + paginator.per_page
-                    self.object_list = object_list[start_index:end_index]
-
-                def has_other_pages(self):
-                    return self.paginator.num_pages > 1
-
-                def has_previous(self):
-                    return self.number > 1
-
-                def has_next(self):
-                    return self.number < self.paginator.num_pages
-
-                def previous_page_number(self):
-                    return self.number - 1
-
-                def next_page_number(self):
-                    return self.number + 1
-
-            class SimplePaginator:
-                def __init__(self, object_list, per_page):
-                    self.object_list = object_list
-                    self.per_page = per_page
-                    self.count = len(object_list)
-                    self.num_pages = (self.count + per_page - 1) // per_page
-
-                def get_page(self, number):
-                    return SimplePage(self.object_list, number, self)
-
-            paginator = SimplePaginator(members, page_size)
-            page_obj = paginator.get_page(page_number)
-
-        except Exception as e:
-            # If pagination fails, create empty page
-            page_obj = None
-            members = []
+        # Members for THIS ORGANIZATION ONLY, one keyset page at a time
+        page_obj = _daily_collection_page(request, tenant)
 
     except Exception as e:
         # If everything fails, use default values
@@ -2375,6 +1890,7 @@ def daily_collection(request, org_slug=None):
     context = {
         'page_obj': page_obj,
         'members': page_obj.object_list if page_obj else [],
+        'member_count': member_count,
         'search_query': search_query,
         'filter_status': filter_status,
         'total_collected': total_collected,
@@ -2392,11 +1908,55 @@ def daily_collection(request, org_slug=None):
     return render(request, 'tracker/daily_collection.html', context)
 
 
+@org_admin_required
+def daily_collection_rows(request, org_slug=None):
+    """
+    JSON fragment of the daily collection table for live search and paging.
+    Reads one page of members and nothing else (no counts or totals).
+    """
+    page_obj = _daily_collection_page(request, request.tenant)
+    html = render_to_string(
+        'tracker/_daily_collection_rows.html',
+        {'members': page_obj.object_list, 'page_obj': page_obj},
+        request=request,
+    )
+    return JsonResponse({
+        'success': True,
+        'html': html,
+        'count': len(page_obj),
+        'next': page_obj.next_cursor,
+        'previous': page_obj.previous_cursor,
+    })
+
+
+DAILY_PAYMENT_REPLAY_LIMIT = 200
+
+
+def _payment_member_data(member):
+    return {
+        'id': member.id,
+        'name': member.name,
+        'pledge': float(member.pledge),
+        'paid_total': float(member.paid_total),
+        'remaining': float(member.remaining),
+        'is_complete': member.is_complete,
+        'is_incomplete': member.is_incomplete,
+        'not_started': member.not_started,
+        'has_exceeded': member.has_exceeded,
+        'status_display': member.status_display,
+    }
+
+
 @org_staff_required
 @require_POST
 @csrf_exempt
 def record_daily_payment_ajax(request, org_slug=None):
-    """AJAX endpoint for recording daily payments"""
+    """
+    AJAX endpoint for recording daily payments. The page sends an
+    idempotency key with each payment, so a retry after a timeout returns
+    the payment already recorded instead of adding it again.
+    """
+    tenant = request.tenant
     try:
         data = json.loads(request.body)
         member_id = data.get('member_id')
@@ -2406,8 +1966,8 @@ def record_daily_payment_ajax(request, org_slug=None):
         if not member_id or not payment_amount:
             return JsonResponse({'success': False, 'error': 'Member ID and payment amount are required'})
 
-        # Get member
-        member = get_object_or_404(Member, id=member_id)
+        # Filter by organization for data isolation
+        member = get_object_or_404(Member, id=member_id, organization=tenant)
 
         # Convert payment amount to decimal
         try:
@@ -2417,41 +1977,120 @@ def record_daily_payment_ajax(request, org_slug=None):
         except (ValueError, InvalidOperation):
             return JsonResponse({'success': False, 'error': 'Invalid payment amount'})
 
-        # Create transaction
-        transaction = Transaction.objects.create(
-            member=member,
-            amount=payment_amount,
-            date=timezone.now().date(),
-            added_by=request.user,
-            note=note
-        )
+        try:
+            idempotency_key = clean_idempotency_key(
+                data.get('idempotency_key') or request.headers.get('Idempotency-Key')
+            )
+            transaction, created = record_payment(
+                tenant, member, request.user, payment_amount,
+                date=timezone.now().date(),
+                note=note,
+                idempotency_key=idempotency_key,
+            )
+        except ValueError as e:
+            return JsonResponse({'success': False, 'error': str(e)})
 
-        # Update member's paid_total (this happens automatically via the model's save method)
+        # paid_total was updated by Transaction.save()
         member.refresh_from_db()
 
-        # Return updated member data
+        if created:
+            message = f'Payment of TZS {payment_amount:,.0f} recorded successfully!'
+        else:
+            message = f'Payment of TZS {payment_amount:,.0f} was already recorded.'
         return JsonResponse({
             'success': True,
             'transaction_id': transaction.id,
-            'member': {
-                'id': member.id,
-                'name': member.name,
-                'pledge': float(member.pledge),
-                'paid_total': float(member.paid_total),
-                'remaining': float(member.remaining),
-                'is_complete': member.is_complete,
-                'is_incomplete': member.is_incomplete,
-                'not_started': member.not_started,
-                'has_exceeded': member.has_exceeded,
-                'status_display': member.status_display,
-            },
-            'message': f'Payment of TZS {payment_amount:,.0f} recorded successfully!'
+            'duplicate': not created,
+            'member': _payment_member_data(member),
+            'message': message,
         })
 
+    except Http404:
+        return JsonResponse({'success': False, 'error': 'Member not found'})
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)})
 
 
+def _queued_payment(item):
+    """
+    A payment dict for record_bulk_payments from one queued offline payment.
+    Raises ValueError when it is malformed.
+    """
+    if not isinstance(item, dict):
+        raise ValueError('Invalid payment')
+    try:
+        member_id = int(item['member_id'])
+        payment_amount = Decimal(str(item['payment_amount']).replace(',', '').strip())
+        payment_date = parse_date(str(item['date'])) if item.get('date') else None
+    except (KeyError, TypeError, ValueError, InvalidOperation):
+        raise ValueError('Invalid payment')
+    if item.get('date') and payment_date is None:
+        raise ValueError('Invalid payment date')
+    idempotency_key = clean_idempotency_key(item.get('idempotency_key'))
+    if idempotency_key is None:
+        raise ValueError('Idempotency key is required')
+    return {
+        'member_id': member_id,
+        'payment_amount': payment_amount,
+        'note': str(item.get('note') or '')[:500],
+        'date': payment_date,
+        'idempotency_key': idempotency_key,
+    }
+
+
+@org_staff_required
+@require_POST
+@csrf_exempt
+def replay_daily_payments(request, org_slug=None):
+    """
+    Record the payments the daily collection page queued while offline, in
+    one request. Payments already recorded by an earlier, interrupted replay
+    are reported as duplicates rather than counted again.
+    """
+    tenant = request.tenant
+    try:
+        queued = json.loads(request.body).get('payments')
+    except (ValueError, AttributeError):
+        return JsonResponse({'success': False, 'error': 'Invalid request body'}, status=400)
+    if not isinstance(queued, list) or not queued:
+        return JsonResponse({'success': False, 'error': 'No payments to replay'}, status=400)
+    if len(queued) > DAILY_PAYMENT_REPLAY_LIMIT:
+        return JsonResponse({
+            'success': False,
+            'error': f'Replay at most {DAILY_PAYMENT_REPLAY_LIMIT} payments per request',
+        }, status=400)
+
+    payments = []
+    errors = []
+    for item in queued:
+        try:
+            payments.append(_queued_payment(item))
+        except ValueError as e:
+            errors.append({
+                'idempotency_key': item.get('idempotency_key') if isinstance(item, dict) else None,
+                'error': str(e),
+            })
+
+    recorded = []
+    if payments:
+        recorded, skipped = record_bulk_payments(tenant, request.user, payments)
+        errors.extend(skipped)
+
+    return JsonResponse({
+        'success': True,
+        'recorded': [
+            {
+                'idempotency_key': transaction.idempotency_key,
+                'transaction_id': transaction.id,
+                'duplicate': not created,
+                'member': _payment_member_data(member),
+            }
+            for transaction, member, created in recorded
+        ],
+        'errors': errors,
+    })
+
+
 # ============================================================================
 # ORGANIZATION ADMIN DASHBOARD VIEWS
 # ============================================================================
@@ -2927,107 +2566,15 @@ def onboarding_import(request, org_slug):
             default_pledge = form.cleaned_data['default_pledge']
 
             try:
-                workbook = openpyxl.load_workbook(BytesIO(excel_file.read()))
-                sheet = workbook.active
-
-                created_count = 0
-                updated_count = 0
-                transaction_count = 0
-                errors = []
-
-                for idx, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-                    try:
-                        if not row[0]:
-                            continue  # Skip rows without a name
-
-                        name = str(row[0]).strip()
-                        pledge = row[1]
-                        paid = row[2] if len(row) > 2 else None
-                        phone = str(row[3]).strip() if len(row) > 3 and row[3] else ''
-                        email = str(row[4]).strip() if len(row) > 4 and row[4] else ''
-                        course = str(row[5]).strip() if len(row) > 5 and row[5] else ''
-                        year = str(row[6]).strip() if len(row) > 6 and row[6] else ''
-
-                        # Pledge
-                        try:
-                            pledge = Decimal(str(pledge)) if pledge else default_pledge
-                        except InvalidOperation:
-                            pledge = default_pledge
-                            errors.append(f"Row {idx}: Invalid pledge, using default for '{name}'")
-
-                        # Paid
-                        try:
-                            paid = Decimal(str(paid)) if paid else Decimal('0.00')
-                        except InvalidOperation:
-                            paid = Decimal('0.00')
-                            errors.append(f"Row {idx}: Invalid paid value for '{name}', using 0.00")
-
-                        member_created = False
-                        if update_existing:
-                            member, member_created = Member.objects.update_or_create(
-                                organization=organization,
-                                name=name,
-                                defaults={
-                                    'pledge': pledge,
-                                    'phone': phone or None,
-                                    'email': email or None,
-                                    'course': course or None,
-                                    'year': year or None,
-                                }
-                            )
-                        else:
-                            member = Member.objects.filter(organization=organization, name=name).first()
-                            if not member:
-                                member = Member.objects.create(
-                                    organization=organization,
-                                    name=name,
-                                    pledge=pledge,
-                                    phone=phone or None,
-                                    email=email or None,
-                                    course=course or None,
-                                    year=year or None,
-                                )
-                                member_created = True
-                            else:
-                                errors.append(f"Row {idx}: Member '{name}' already exists and update is off.")
-                                continue
-
-                        if member_created:
-                            created_count += 1
-                        else:
-                            updated_count += 1
-
-                        # Transaction
-                        if paid > 0:
-                            existing_txn = Transaction.objects.filter(
-                                organization=organization,
-                                member=member,
-                                date=date.today(),
-                                added_by=request.user,
-                                note__icontains="Imported via Excel"
-                            ).first()
-
-                            if existing_txn:
-                                # Update the amount if different
-                                if existing_txn.amount != paid:
-                                    existing_txn.amount = paid
-                                    existing_txn.note = f"Updated via Excel on {date.today().isoformat()}"
-                                    existing_txn.save()
-                                    transaction_count += 1
-                            else:
-                                # Create new transaction
-                                Transaction.objects.create(
-                                    organization=organization,
-                                    member=member,
-                                    amount=paid,
-                                    date=date.today(),
-                                    added_by=request.user,
-                                    note=f"Imported via Excel on {date.today().isoformat()}"
-                                )
-                                transaction_count += 1
-
-                    except Exception as e:
-                        errors.append(f"Row {idx}: Error processing member '{row[0]}' - {str(e)}")
+                result = import_members_from_excel(
+                    excel_file, organization, request.user,
+                    update_existing=update_existing,
+                    default_pledge=default_pledge,
+                )
+                created_count = result.created_count
+                updated_count = result.updated_count
+                transaction_count = result.transaction_count
+                errors = result.errors
 
                 # Show success messages
                 if created_count:
@@ -3446,24 +2993,8 @@ def export_admin_log_excel(request, org_slug=None):
         messages.error(request, 'Organization not found')
         return redirect('tracker:dashboard')
 
-    # Get filtered transactions
-    transactions = Transaction.objects.select_related('member', 'added_by').filter(member__organization=tenant)
-
-    # Apply filters
-    boss_filter = request.GET.get('boss', '')
-    date_filter = request.GET.get('date', '')
-    amount_filter = request.GET.get('amount', '')
-
-    if boss_filter:
-        transactions = transactions.filter(added_by__username__icontains=boss_filter)
-    if date_filter:
-        transactions = transactions.filter(date=date_filter)
-    if amount_filter:
-        try:
-            amount = Decimal(amount_filter)
-            transactions = transactions.filter(amount=amount)
-        except:
-            pass
+    # Get filtered transactions (same filters as the admin log page)
+    transactions = _filter_transaction_log(request, tenant)
 
     # Create workbook
     wb = openpyxl.Workbook()
@@ -3509,24 +3040,8 @@ def export_admin_log_pdf(request, org_slug=None):
         messages.error(request, 'Organization not found')
         return redirect('tracker:dashboard')
 
-    # Get filtered transactions
-    transactions = Transaction.objects.select_related('member', 'added_by').filter(member__organization=tenant)
-
-    # Apply filters
-    boss_filter = request.GET.get('boss', '')
-    date_filter = request.GET.get('date', '')
-    amount_filter = request.GET.get('amount', '')
-
-    if boss_filter:
-        transactions = transactions.filter(added_by__username__icontains=boss_filter)
-    if date_filter:
-        transactions = transactions.filter(date=date_filter)
-    if amount_filter:
-        try:
-            amount = Decimal(amount_filter)
-            transactions = transactions.filter(amount=amount)
-        except:
-            pass
+    # Get filtered transactions (same filters as the admin log page)
+    transactions = _filter_transaction_log(request, tenant)
 
     # Create PDF
     buffer = BytesIO()
@@ -3602,19 +3117,8 @@ def export_member_edit_log_excel(request, org_slug=None):
         messages.error(request, 'Access denied. Owner privileges required.')
         return redirect('tracker:admin_log', org_slug=org_slug)
 
-    # Get filtered member edit logs
-    member_edit_logs = MemberEditLog.objects.select_related('member', 'edited_by').filter(
-        organization=tenant
-    ).order_by('-created_at')
-
-    # Apply filters
-    edit_member_filter = request.GET.get('edit_member', '')
-    edit_field_filter = request.GET.get('edit_field', '')
-
-    if edit_member_filter:
-        member_edit_logs = member_edit_logs.filter(member__name__icontains=edit_member_filter)
-    if edit_field_filter:
-        member_edit_logs = member_edit_logs.filter(field_changed=edit_field_filter)
+    # Get filtered member edit logs (same filters as the admin log page)
+    member_edit_logs = _filter_member_edit_logs(request, tenant)
 
     # Create workbook
     wb = openpyxl.Workbook()
@@ -3667,19 +3171,8 @@ def export_member_edit_log_pdf(request, org_slug=None):
         messages.error(request, 'Access denied. Owner privileges required.')
         return redirect('tracker:admin_log', org_slug=org_slug)
 
-    # Get filtered member edit logs
-    member_edit_logs = MemberEditLog.objects.select_related('member', 'edited_by').filter(
-        organization=tenant
-    ).order_by('-created_at')
-
-    # Apply filters
-    edit_member_filter = request.GET.get('edit_member', '')
-    edit_field_filter = request.GET.get('edit_field', '')
-
-    if edit_member_filter:
-        member_edit_logs = member_edit_logs.filter(member__name__icontains=edit_member_filter)
-    if edit_field_filter:
-        member_edit_logs = member_edit_logs.filter(field_changed=edit_field_filter)
+    # Get filtered member edit logs (same filters as the admin log page)
+    member_edit_logs = _filter_member_edit_logs(request, tenant)
 
     # Create PDF
     buffer = BytesIO()
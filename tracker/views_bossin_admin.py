@@ -7,7 +7,7 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST
-from django.db.models import Count, Q, Sum, Avg
+from django.db.models import Count, Q, Sum, Avg, Exists, OuterRef, Prefetch
 from django.utils import timezone
 from django.core.paginator import Paginator
 import json
@@ -18,6 +18,8 @@ import os
 
 from .models import Organization, PaymentRequest, OrganizationUser, User, SystemSettings, Transaction, Member
 from .permissions import bossin_admin_required
+from .instrumentation import registry
+from .platform_metrics import get_platform_metrics, revenue_series
 
 
 # ============================================================================
@@ -28,92 +30,48 @@ from .permissions import bossin_admin_required
 def bossin_dashboard(request):
     """Main Bossin Admin Portal dashboard with analytics."""
     
-    # Get pending requests count for navbar
-    pending_requests_count = PaymentRequest.objects.filter(status='pending').count()
-    
-    # Organizations Stats
-    total_orgs = Organization.objects.count()
-    active_orgs = Organization.objects.filter(is_active=True).count()
-    trial_orgs = Organization.objects.filter(subscription_status='FREE_TRIAL').count()
-    subscribed_orgs = Organization.objects.filter(subscription_status='SUBSCRIBED').count()
-    expired_orgs = Organization.objects.filter(subscription_status='NOT_SUBSCRIBED').count()
-    
-    # Subscription Stats
-    pending_requests = PaymentRequest.objects.filter(status='pending').count()
-    approved_today = PaymentRequest.objects.filter(
-        status='approved',
-        updated_at__date=timezone.now().date()
-    ).count()
-    
-    # Revenue Calculation (from approved payment requests)
-    total_revenue = PaymentRequest.objects.filter(
-        status='approved'
-    ).aggregate(total=Sum('amount_tzs'))['total'] or Decimal('0.00')
-    
-    monthly_revenue = PaymentRequest.objects.filter(
-        status='approved',
-        updated_at__month=timezone.now().month,
-        updated_at__year=timezone.now().year
-    ).aggregate(total=Sum('amount_tzs'))['total'] or Decimal('0.00')
-    
-    # Backup Health
-    backup_dir = Path('backups')
-    backup_files = list(backup_dir.glob('db_backup_*.gz')) if backup_dir.exists() else []
-    latest_backup = max(backup_files, key=lambda p: p.stat().st_mtime) if backup_files else None
-    backup_health = 'healthy' if latest_backup and (timezone.now() - timezone.datetime.fromtimestamp(latest_backup.stat().st_mtime, tz=timezone.get_current_timezone())).days < 2 else 'warning'
+    # Counters come from the precomputed snapshot (tracker/platform_metrics.py)
+    metrics = get_platform_metrics()
+    today = timezone.localdate()
     
     # Recent Activity
     recent_requests = PaymentRequest.objects.select_related('organization', 'submitted_by').order_by('-created_at')[:10]
     recent_orgs = Organization.objects.order_by('-created_at')[:5]
     
     # Category Distribution
-    category_dist = Organization.objects.values('category').annotate(count=Count('id')).order_by('-count')
+    category_dist = sorted(
+        ({'category': category, 'count': count} for category, count in metrics.category_counts.items()),
+        key=lambda item: item['count'],
+        reverse=True,
+    )
+    
+    # Backup Health
+    backup_health = 'healthy' if metrics.latest_backup_at and (timezone.now() - metrics.latest_backup_at).days < 2 else 'warning'
     
     # Revenue by month (last 6 months)
-    from datetime import date, timedelta
-    first_of_this_month = timezone.now().date().replace(day=1)
-    # Build 6 month starts
-    month_starts = []
-    cursor = first_of_this_month
-    for _ in range(6):
-        month_starts.append(cursor)
-        # move back approx 1 month by going to previous month's last day then replace to first
-        prev = (cursor - timedelta(days=1)).replace(day=1)
-        cursor = prev
-    month_starts = list(reversed(month_starts))
-    revenue_labels = [ms.strftime('%b') for ms in month_starts]
-    revenue_values = []
-    for i, ms in enumerate(month_starts):
-        if i < len(month_starts) - 1:
-            me = month_starts[i + 1]
-        else:
-            # next month start ~ add 31 days and clamp to first
-            me = (ms + timedelta(days=31)).replace(day=1)
-        total_month = PaymentRequest.objects.filter(
-            status='approved', created_at__gte=ms, created_at__lt=me
-        ).aggregate(total=Sum('amount_tzs'))['total'] or 0
-        revenue_values.append(int(total_month))
-    revenue_labels_json = json.dumps(revenue_labels)
-    revenue_values_json = json.dumps(revenue_values)
+    revenue_labels, revenue_values = revenue_series(metrics, months=6)
     
     context = {
-        'total_orgs': total_orgs,
-        'active_orgs': active_orgs,
-        'trial_orgs': trial_orgs,
-        'subscribed_orgs': subscribed_orgs,
-        'expired_orgs': expired_orgs,
-        'pending_requests': pending_requests,
-        'pending_requests_count': pending_requests_count,
-        'approved_today': approved_today,
-        'total_revenue': total_revenue,
-        'monthly_revenue': monthly_revenue,
+        'total_orgs': metrics.total_orgs,
+        'active_orgs': metrics.active_orgs,
+        'trial_orgs': metrics.trial_orgs,
+        'subscribed_orgs': metrics.subscribed_orgs,
+        'expired_orgs': metrics.expired_orgs,
+        'pending_requests': metrics.pending_requests,
+        'pending_requests_count': metrics.pending_requests,
+        'approved_today': metrics.approved_by_day.get(today.isoformat(), 0),
+        'total_revenue': metrics.total_revenue,
+        # Revenue approved this month, like the chart's series but by approval date
+        'monthly_revenue': Decimal(metrics.approved_revenue_by_month.get(today.strftime('%Y-%m'), '0')),
         'backup_health': backup_health,
-        'latest_backup': latest_backup,
+        'latest_backup': metrics.latest_backup_at,
+        'latest_backup_size': metrics.latest_backup_size,
         'recent_requests': recent_requests,
         'recent_orgs': recent_orgs,
         'category_dist': category_dist,
-        'revenue_labels_json': revenue_labels_json,
-        'revenue_values_json': revenue_values_json,
+        'revenue_labels_json': json.dumps(revenue_labels),
+        'revenue_values_json': json.dumps(revenue_values),
+        'metrics_refreshed_at': metrics.payments_refreshed_at,
     }
     
     return render(request, 'bossin_admin/dashboard.html', context)
@@ -493,7 +451,20 @@ def bossin_users(request):
     search = request.GET.get('search', '')
     role_filter = request.GET.get('role', '')
     
-    users = User.objects.all()
+    # Membership count and owner flag are computed in the same query as the
+    # user rows; organization names come from one prefetch for the page.
+    users = User.objects.annotate(
+        org_count=Count('org_memberships', distinct=True),
+        is_org_owner=Exists(
+            OrganizationUser.objects.filter(user=OuterRef('pk'), role='owner')
+        ),
+    ).prefetch_related(
+        Prefetch(
+            'org_memberships',
+            queryset=OrganizationUser.objects.select_related('organization').order_by('joined_at', 'id'),
+            to_attr='page_memberships',
+        )
+    )
     
     if search:
         users = users.filter(
@@ -502,20 +473,23 @@ def bossin_users(request):
             Q(first_name__icontains=search) |
             Q(last_name__icontains=search)
         )
+
+    if role_filter in dict(OrganizationUser.ROLE_CHOICES):
+        users = users.filter(
+            Exists(OrganizationUser.objects.filter(user=OuterRef('pk'), role=role_filter))
+        )
     
     # Pagination
-    paginator = Paginator(users.order_by('-date_joined'), 25)
+    paginator = Paginator(users.order_by('-date_joined', '-id'), 25)
     page = request.GET.get('page', 1)
     users_page = paginator.get_page(page)
     
-    # Get organization memberships for each user
+    # Summarize organization names from the prefetched memberships
     for user in users_page:
-        org_memberships = OrganizationUser.objects.filter(user=user).select_related('organization')
-        user.org_count = org_memberships.count()
-        user.org_names = ', '.join([om.organization.name for om in org_memberships[:3]])
-        if org_memberships.count() > 3:
-            user.org_names += f' (+{org_memberships.count() - 3} more)'
-        user.is_org_owner = OrganizationUser.objects.filter(user=user, role='owner').exists()
+        names = [om.organization.name for om in user.page_memberships[:3]]
+        user.org_names = ', '.join(names)
+        if user.org_count > 3:
+            user.org_names += f' (+{user.org_count - 3} more)'
     
     context = {
         'users': users_page,
@@ -556,3 +530,62 @@ def bossin_settings(request):
     
     return render(request, 'bossin_admin/settings/edit.html', context)
 
+
+
+# ============================================================================
+# REQUEST METRICS
+# ============================================================================
+
+METRICS_ORDERINGS = {
+    'time': 'total_ms',
+    'queries': 'queries',
+    'db': 'db_ms',
+    'requests': 'requests',
+    'over_budget': 'over_budget',
+}
+
+
+@bossin_admin_required
+def bossin_metrics(request):
+    """Per-view query counts and latency recorded by RequestMetricsMiddleware in every worker."""
+    ordering = request.GET.get('sort', 'time')
+    snapshot = registry.snapshot(METRICS_ORDERINGS.get(ordering, 'total_ms'))
+
+    view_filter = request.GET.get('view', '').strip()
+    if view_filter:
+        snapshot['views'] = [row for row in snapshot['views'] if view_filter in row['view']]
+
+    tz = timezone.get_current_timezone()
+    slow_requests = [
+        dict(sample, seen_at=timezone.datetime.fromtimestamp(sample['timestamp'], tz=tz))
+        for sample in snapshot['slow_requests']
+    ]
+
+    context = {
+        'views': snapshot['views'],
+        'slow_requests': slow_requests,
+        'process_id': snapshot['process_id'],
+        'processes': snapshot['processes'],
+        'shared_cache': snapshot['shared_cache'],
+        'since': timezone.datetime.fromtimestamp(snapshot['since'], tz=tz),
+        'sort': ordering,
+        'view_filter': view_filter,
+        'metrics_enabled': getattr(settings, 'REQUEST_METRICS_ENABLED', True),
+    }
+    return render(request, 'bossin_admin/metrics/list.html', context)
+
+
+@bossin_admin_required
+def bossin_metrics_json(request):
+    """JSON version of the request metrics for scripts and dashboards."""
+    ordering = request.GET.get('sort', 'time')
+    return JsonResponse(registry.snapshot(METRICS_ORDERINGS.get(ordering, 'total_ms')))
+
+
+@bossin_admin_required
+@require_POST
+def bossin_metrics_reset(request):
+    """Clear the recorded metrics of every process."""
+    registry.reset_all()
+    messages.success(request, 'Request metrics cleared.')
+    return redirect('bossin_admin:metrics')